@@ -314,7 +314,7 @@ STOCK: {symbol}
 # COMPARISON INTENT DETECTION
 # =============================================================================
 
-def detect_comparison_intent(query: str) -> tuple:
+def detect_comparison_intent(query: str, q_lower: Optional[str] = None) -> tuple:
     """
     Detect if query is asking for a comparison between multiple stocks.
     Returns: (is_comparison: bool, comparison_type: str)
@@ -324,7 +324,8 @@ def detect_comparison_intent(query: str) -> tuple:
     - "TCS and Infosys comparison" -> (True, "comparison")
     - "Which is better: TCS or Wipro?" -> (True, "which_better")
     """
-    q_lower = query.lower()
+    if q_lower is None:
+        q_lower = query.lower()
     
     # Comparison patterns
     patterns = {
@@ -350,12 +351,13 @@ def detect_comparison_intent(query: str) -> tuple:
 # QUERY DECOMPOSITION
 # =============================================================================
 
-def decompose_query(query: str, symbol: str) -> List[str]:
+def decompose_query(query: str, symbol: str, q_lower: Optional[str] = None) -> List[str]:
     """
     Break a high-level query into analytical sub-questions.
     This enables multi-hop reasoning over different data sources.
     """
-    q_lower = query.lower()
+    if q_lower is None:
+        q_lower = query.lower()
     sub_questions = []
     
     # Always include valuation context
@@ -960,6 +962,8 @@ Keep response under 400 words. Be specific with numbers. Use ✓ to mark better
         Yields progress updates for research trace and final synthesized response chunks.
         """
         self._log_activity(f"[V2] Processing: {query}")
+        # Lowercase once; intent detectors below reuse it
+        query_lower = query.lower()
         
         # 1. Extract tickers
         tickers = self._extract_tickers(query)
@@ -968,7 +972,7 @@ Keep response under 400 words. Be specific with numbers. Use ✓ to mark better
         self._log_activity(f"[V2] Extracted: {tickers}")
         
         # 2. Check for comparison intent (NEW)
-        is_comparison, comp_type = detect_comparison_intent(query)
+        is_comparison, comp_type = detect_comparison_intent(query, query_lower)
         if is_comparison and len(tickers) >= 2:
             self._log_activity(f"[V2] Comparison detected: {comp_type} with {tickers}")
             yield {"status": "thinking", "message": f"Comparing {', '.join(tickers)}..."}
@@ -981,7 +985,7 @@ Keep response under 400 words. Be specific with numbers. Use ✓ to mark better
         yield {"status": "thinking", "message": f"Identifying signals for {symbol}..."}
         
         # 3. Decompose query (for single-stock analysis)
-        sub_questions = decompose_query(query, symbol)
+        sub_questions = decompose_query(query, symbol, query_lower)
         self._log_activity(f"[V2] Decomposed into {len(sub_questions)} sub-questions")
         
         # 4. Parallel agent execution (Checklist Trigger)
@@ -1121,7 +1125,8 @@ Keep response under 400 words. Be specific with numbers. Use ✓ to mark better
                     query=query,
                     market_data=market_data,
                     filings_data=filings_data,
-                    symbol=symbol
+                    symbol=symbol,
+                    query_lower=query_lower
                 )
                 if chart_data:
                     self._log_activity(f"[V2] Generated {chart_data.get('type')} chart")
@@ -9,14 +9,27 @@ import os
 import base64
 import logging
 from io import BytesIO
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Callable
 from datetime import datetime
 
 import fitz  # PyMuPDF
-import plotly.graph_objects as go
-import plotly.express as px
+import numpy as np
+import plotly.io as pio
 from PIL import Image
 
+from . import svg_templates
+
+# orjson serialises the figure JSON handed to kaleido several times faster than stdlib json
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
+
+# go.Figure applies the active template on construction; raw dict figures need it attached explicitly
+_DEFAULT_TEMPLATE = pio.templates[pio.templates.default].to_plotly_json()
+
 logger = logging.getLogger("VisualRAG")
 
 # =============================================================================
@@ -55,6 +68,12 @@ CHART_STYLE = {
     "watermark": "Powered by Inwezt",
 }
 
+# Media types for raw chart bytes (ChartGenerator(encode_base64=False))
+IMAGE_CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
 
 class FigureExtractor:
     """
@@ -181,15 +200,27 @@ class ChartGenerator:
     Dark theme, clean typography, branded footer with CAGR.
     """
     
-    def __init__(self):
+    def __init__(self, output_format: str = None, encode_base64: bool = True):
+        """
+        Args:
+            output_format: "png" (Plotly + kaleido) or "svg" (pre-rendered templates,
+                no Chromium). Defaults to the CHART_OUTPUT_FORMAT env var, else "png".
+            encode_base64: If False, charts carry raw "image_bytes" + "content_type"
+                instead of a "base64" string, for consumers that stream the bytes.
+        """
         self.style = CHART_STYLE
+        self.output_format = (output_format or os.getenv("CHART_OUTPUT_FORMAT", "png")).lower()
+        self.encode_base64 = encode_base64
     
-    def _apply_fiscal_style(self, fig: go.Figure, title: str, 
+    def _apply_fiscal_style(self, fig: Dict, title: str, 
                             subtitle: str = None,
-                            footer_left: str = None) -> go.Figure:
+                            footer_left: str = None) -> Dict:
         """
         Apply pixel-perfect fiscal.ai styling.
         
+        Figures are plain {"data": [...], "layout": {...}} dicts so that export
+        can skip Plotly's graph_objects validation.
+        
         Key fixes:
         - Horizontal x-axis labels (no rotation)
         - Precise margins for alignment
@@ -202,7 +233,7 @@ class ChartGenerator:
         if subtitle:
             full_title += f"<br><span style='font-size:11px;color:{self.style['subtitle_color']}'>{subtitle}</span>"
         
-        fig.update_layout(
+        fig["layout"].update(
             title={
                 "text": full_title,
                 "font": {"size": 15, "color": self.style["text_color"], "family": self.style["font_family"]},
@@ -273,19 +304,42 @@ class ChartGenerator:
             yanchor="top"
         ))
         
-        fig.update_layout(annotations=annotations)
+        fig["layout"]["annotations"] = annotations
         
         return fig
     
-    def _to_base64(self, fig: go.Figure) -> str:
-        """Convert Plotly figure to base64 PNG."""
-        img_bytes = fig.to_image(
+    def _to_png_bytes(self, fig: Dict) -> bytes:
+        """Render a raw Plotly figure dict to PNG bytes (validation skipped)."""
+        fig["layout"].setdefault("template", _DEFAULT_TEMPLATE)
+        return pio.to_image(
+            fig,
             format="png",
             width=self.style["chart_width"],
             height=self.style["chart_height"],
-            scale=2  # Retina quality
+            scale=2,  # Retina quality
+            validate=False
         )
-        return base64.b64encode(img_bytes).decode('utf-8')
+    
+    def _to_base64(self, fig: Dict) -> str:
+        """Convert a raw Plotly figure dict to base64 PNG."""
+        return base64.b64encode(self._to_png_bytes(fig)).decode('utf-8')
+    
+    def _render(self, fig: Dict, render_svg: Optional[Callable[[], str]] = None) -> bytes:
+        """Render via the SVG template when output_format is "svg" (and one exists), else Plotly PNG."""
+        if render_svg is not None and self.output_format == "svg":
+            return render_svg().encode('utf-8')
+        return self._to_png_bytes(fig)
+    
+    def _image(self, fig: Dict, render_svg: Optional[Callable[[], str]] = None) -> Dict:
+        """
+        Image fields of a chart dict: base64 by default, raw bytes if encode_base64 is off.
+        "format" is the format actually rendered (charts without an SVG template are PNG).
+        """
+        image = self._render(fig, render_svg)
+        image_format = "svg" if render_svg is not None and self.output_format == "svg" else "png"
+        if not self.encode_base64:
+            return {"image_bytes": image, "content_type": IMAGE_CONTENT_TYPES[image_format], "format": image_format}
+        return {"base64": base64.b64encode(image).decode('utf-8'), "format": image_format}
     
     def _calculate_cagr(self, values: List[float], periods: int) -> float:
         """Calculate Compound Annual Growth Rate."""
@@ -330,10 +384,12 @@ class ChartGenerator:
                       symbol: str,
                       company_name: str = None,
                       color: str = "primary",
-                      title_prefix: str = "") -> Dict:
+                      title_prefix: str = "",
+                      presorted: bool = False) -> Dict:
         """
         Generate fiscal.ai-style revenue bar chart.
         Data labels inside bars, short x-axis labels.
+        Pass presorted=True if data is already in chronological order.
         """
         if not data:
             return {"error": "No data provided"}
@@ -378,7 +434,8 @@ class ChartGenerator:
             except: pass
             return (0, 0)
             
-        data.sort(key=sort_key)
+        if not presorted:
+            data.sort(key=sort_key)
         labels = [f"{d.get('quarter', d.get('period', ''))}" for d in data]
         values = [d.get('value', d.get('revenue_cr', d.get('net_margin', 0))) for d in data]
         
@@ -389,21 +446,23 @@ class ChartGenerator:
         gradient_colors = self._get_gradient_colors(base_color, len(values), reverse=False)
         
         # Create chart with polished styling
-        fig = go.Figure(data=[
-            go.Bar(
-                x=labels,
-                y=values,
-                marker=dict(
-                    color=gradient_colors,
-                    line={"width": 0.5, "color": "rgba(255,255,255,0.15)"},  # Subtle white border
-                ),
-                text=[f"{v:,.0f}" if v >= 100 else f"{v:.1f}" for v in values],
-                textposition="outside",
-                textfont={"size": 8, "color": self.style["text_color"], "family": self.style["font_family"]},
-                width=0.65,
-                cliponaxis=False
-            )
-        ])
+        fig = {
+            "data": [{
+                "type": "bar",
+                "x": labels,
+                "y": values,
+                "marker": {
+                    "color": gradient_colors,
+                    "line": {"width": 0.5, "color": "rgba(255,255,255,0.15)"},  # Subtle white border
+                },
+                "text": [f"{v:,.0f}" if v >= 100 else f"{v:.1f}" for v in values],
+                "textposition": "outside",
+                "textfont": {"size": 8, "color": self.style["text_color"], "family": self.style["font_family"]},
+                "width": 0.65,
+                "cliponaxis": False
+            }],
+            "layout": {}
+        }
         
         # Calculate metrics for footer
         total_change = ((values[-1] - values[0]) / values[0] * 100) if values[0] != 0 else 0
@@ -414,15 +473,21 @@ class ChartGenerator:
         
         # Apply fiscal.ai styling
         title_suffix = f"{title_prefix} Revenue" if title_prefix else "Revenue"
+        chart_title = f"{title_text} - {title_suffix}"
+        footer = f"● Total Change: {total_change:+.0f}% | CAGR: {cagr:.1f}%"
         fig = self._apply_fiscal_style(
             fig,
-            title=f"{title_text} - {title_suffix}",
+            title=chart_title,
             subtitle="(in ₹ Crores)",
-            footer_left=f"● Total Change: {total_change:+.0f}% | CAGR: {cagr:.1f}%"
+            footer_left=footer
         )
         
         return {
-            "base64": self._to_base64(fig),
+            **self._image(fig, lambda: svg_templates.bar_chart_svg(
+                labels, values, gradient_colors, chart_title, self.style,
+                self.style["chart_width"], self.style["chart_height"],
+                subtitle="(in ₹ Crores)", footer_left=footer
+            )),
             "type": "revenue_trend",
             "title": f"{symbol} {'Annual ' if title_prefix == 'Annual' else 'Quarterly ' if title_prefix == 'Quarterly' else ''}Revenue Trend",
             "symbol": symbol,
@@ -440,9 +505,11 @@ class ChartGenerator:
                      data: List[Dict], 
                      symbol: str,
                      metric: str = "net_margin",
-                     title_prefix: str = "") -> Dict:
+                     title_prefix: str = "",
+                     presorted: bool = False) -> Dict:
         """
         Generate fiscal.ai-style margin trend bar chart.
+        Pass presorted=True if data is already in chronological order.
         """
         if not data:
             return {"error": "No data provided"}
@@ -477,24 +544,27 @@ class ChartGenerator:
             except: pass
             return (0, 0)
             
-        data.sort(key=sort_key)
+        if not presorted:
+            data.sort(key=sort_key)
         labels = [f"{d.get('quarter', d.get('period', ''))}" for d in data]
         values = [d.get('value', d.get(metric, 0)) for d in data]
         
         # Create gradient effect with color based on value
         colors = [self.style["secondary_bar"] for _ in values]
         
-        fig = go.Figure(data=[
-            go.Bar(
-                x=labels,
-                y=values,
-                marker_color=colors,
-                text=[f"{v:.1f}%" for v in values],
-                textposition="outside",
-                textfont={"size": 10, "color": self.style["text_color"]},
-                width=0.6
-            )
-        ])
+        fig = {
+            "data": [{
+                "type": "bar",
+                "x": labels,
+                "y": values,
+                "marker": {"color": colors},
+                "text": [f"{v:.1f}%" for v in values],
+                "textposition": "outside",
+                "textfont": {"size": 10, "color": self.style["text_color"]},
+                "width": 0.6
+            }],
+            "layout": {}
+        }
         
         # Calculate metrics
         if len(values) >= 2 and values[0] != 0:
@@ -504,17 +574,24 @@ class ChartGenerator:
         
         # Apply styling
         title_suffix = f"{title_prefix} Net Margin Trend" if title_prefix else "Net Margin Trend"
+        chart_title = f"{symbol} - {title_suffix}"
+        footer = f"● Change: {total_change:+.1f}pp over period"
         fig = self._apply_fiscal_style(
             fig,
-            title=f"{symbol} - {title_suffix}",
+            title=chart_title,
             subtitle="(%)",
-            footer_left=f"● Change: {total_change:+.1f}pp over period"
+            footer_left=footer
         )
         
-        fig.update_yaxes(ticksuffix="%")
+        fig["layout"]["yaxis"]["ticksuffix"] = "%"
         
         return {
-            "base64": self._to_base64(fig),
+            **self._image(fig, lambda: svg_templates.bar_chart_svg(
+                labels, values, colors, chart_title, self.style,
+                self.style["chart_width"], self.style["chart_height"],
+                subtitle="(%)", footer_left=footer,
+                value_labels=[f"{v:.1f}%" for v in values], tick_suffix="%"
+            )),
             "type": "margin_trend",
             "title": f"{symbol} {'Annual ' if title_prefix == 'Annual' else 'Quarterly ' if title_prefix == 'Quarterly' else ''}Net Margin Trend",
             "symbol": symbol,
@@ -548,18 +625,20 @@ class ChartGenerator:
             for s in symbols
         ]
         
-        fig = go.Figure(data=[
-            go.Bar(
-                x=values,
-                y=symbols,
-                orientation='h',
-                marker_color=colors,
-                text=[f"{v:.1f}x" for v in values],
-                textposition="outside",
-                textfont={"size": 10, "color": self.style["text_color"]},
-                width=0.6
-            )
-        ])
+        fig = {
+            "data": [{
+                "type": "bar",
+                "x": values,
+                "y": symbols,
+                "orientation": "h",
+                "marker": {"color": colors},
+                "text": [f"{v:.1f}x" for v in values],
+                "textposition": "outside",
+                "textfont": {"size": 10, "color": self.style["text_color"]},
+                "width": 0.6
+            }],
+            "layout": {}
+        }
         
         metric_labels = {
             "pe_ratio": "P/E Ratio",
@@ -570,10 +649,10 @@ class ChartGenerator:
         
         title = f"Peer Comparison - {metric_labels.get(metric, metric)}"
         fig = self._apply_fiscal_style(fig, title, footer_left=f"● {highlight_symbol} highlighted")
-        fig.update_xaxes(tickfont={"size": 10, "color": self.style["subtitle_color"]})
+        fig["layout"]["xaxis"]["tickfont"].update({"size": 10, "color": self.style["subtitle_color"]})
         
         return {
-            "base64": self._to_base64(fig),
+            **self._image(fig),
             "type": "peer_comparison",
             "title": title,
             "metric": metric,
@@ -608,35 +687,41 @@ class ChartGenerator:
         else:
              bar_color = self.style["neutral_color"]   # Fair
              
-        fig = go.Figure(go.Indicator(
-            mode = "gauge+number+delta",
-            value = current_pe,
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': "P/E Ratio vs Sector", 'font': {'size': 14, 'color': self.style["subtitle_color"]}},
-            delta = {'reference': sector_pe, 'increasing': {'color': self.style["negative_color"]}, 'decreasing': {'color': self.style["positive_color"]}},
-            gauge = {
-                'axis': {'range': [historical_low * 0.8, historical_high * 1.2], 'tickwidth': 1, 'tickcolor': self.style["grid_color"]},
-                'bar': {'color': bar_color},
-                'bgcolor': "rgba(0,0,0,0)",
-                'borderwidth': 2,
-                'bordercolor': self.style["grid_color"],
-                'steps': [
-                    {'range': [historical_low * 0.8, sector_pe], 'color': "rgba(34, 197, 94, 0.1)"},
-                    {'range': [sector_pe, historical_high * 1.2], 'color': "rgba(239, 68, 68, 0.1)"}],
-                'threshold': {
-                    'line': {'color': "white", 'width': 4},
-                    'thickness': 0.75,
-                    'value': sector_pe}}))
-
-        fig.update_layout(
-            font={"family": self.style["font_family"]},
-            paper_bgcolor=self.style["background_color"],
-            height=300,
-            margin=dict(l=30, r=30, t=50, b=30)
-        )
+        fig = {
+            "data": [{
+                "type": "indicator",
+                "mode": "gauge+number+delta",
+                "value": current_pe,
+                "domain": {'x': [0, 1], 'y': [0, 1]},
+                "title": {'text': "P/E Ratio vs Sector", 'font': {'size': 14, 'color': self.style["subtitle_color"]}},
+                "delta": {'reference': sector_pe, 'increasing': {'color': self.style["negative_color"]}, 'decreasing': {'color': self.style["positive_color"]}},
+                "gauge": {
+                    'axis': {'range': [historical_low * 0.8, historical_high * 1.2], 'tickwidth': 1, 'tickcolor': self.style["grid_color"]},
+                    'bar': {'color': bar_color},
+                    'bgcolor': "rgba(0,0,0,0)",
+                    'borderwidth': 2,
+                    'bordercolor': self.style["grid_color"],
+                    'steps': [
+                        {'range': [historical_low * 0.8, sector_pe], 'color': "rgba(34, 197, 94, 0.1)"},
+                        {'range': [sector_pe, historical_high * 1.2], 'color': "rgba(239, 68, 68, 0.1)"}],
+                    'threshold': {
+                        'line': {'color': "white", 'width': 4},
+                        'thickness': 0.75,
+                        'value': sector_pe}}
+            }],
+            "layout": {
+                "font": {"family": self.style["font_family"]},
+                "paper_bgcolor": self.style["background_color"],
+                "height": 300,
+                "margin": dict(l=30, r=30, t=50, b=30)
+            }
+        }
         
         return {
-            "base64": self._to_base64(fig),
+            **self._image(fig, lambda: svg_templates.valuation_gauge_svg(
+                current_pe, sector_pe, historical_low * 0.8, historical_high * 1.2, bar_color,
+                self.style, self.style["chart_width"], self.style["chart_height"]
+            )),
             "type": "valuation_gauge",
             "title": f"{symbol} Valuation Gauge",
             "symbol": symbol,
@@ -651,22 +736,24 @@ class ChartGenerator:
 
     def combined_financials(self, 
                             datasets: Dict[str, List[Dict]],
-                            symbol: str) -> Dict:
+                            symbol: str,
+                            presorted: bool = False) -> Dict:
         """
         Generate a multi-view payload for dynamic frontend switching.
         Args:
             datasets: Dict with 'annual_revenue', 'annual_margins', etc.
+            presorted: Datasets are already in chronological order.
         """
         # 1. Generate individual charts to get processed data points
         revenue_view = []
         if datasets.get("annual_revenue"):
-             rev_chart = self.revenue_trend(datasets["annual_revenue"], symbol, title_prefix="Annual")
+             rev_chart = self.revenue_trend(datasets["annual_revenue"], symbol, title_prefix="Annual", presorted=presorted)
              if "error" not in rev_chart:
                  revenue_view = rev_chart.get("dataPoints", [])
 
         margin_view = []
         if datasets.get("annual_margins"):
-             margin_chart = self.margin_trend(datasets["annual_margins"], symbol, title_prefix="Annual")
+             margin_chart = self.margin_trend(datasets["annual_margins"], symbol, title_prefix="Annual", presorted=presorted)
              if "error" not in margin_chart:
                  margin_view = margin_chart.get("dataPoints", [])
         
@@ -683,71 +770,6 @@ class ChartGenerator:
              "options": ["Revenue", "Margins"], # Tab labels
              "chartTypes": ["bar", "line"] # Allowed visualizations
         }
-
-        premium = ((current_pe - sector_pe) / sector_pe * 100) if sector_pe != 0 else 0
-        
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=current_pe,
-            delta={"reference": sector_pe, "suffix": "x", "valueformat": ".1f"},
-            title={"text": f"<b>{symbol} P/E Valuation</b>", "font": {"size": 18, "color": self.style["text_color"]}},
-            number={"font": {"size": 48, "color": self.style["text_color"]}, "suffix": "x"},
-            gauge={
-                "axis": {
-                    "range": [historical_low * 0.8, historical_high * 1.2],
-                    "tickcolor": self.style["subtitle_color"],
-                    "tickfont": {"color": self.style["subtitle_color"]}
-                },
-                "bar": {"color": self.style["secondary_bar"]},
-                "bgcolor": self.style["grid_color"],
-                "steps": [
-                    {"range": [historical_low * 0.8, sector_pe * 0.8], 
-                     "color": self.style["positive_color"]},
-                    {"range": [sector_pe * 0.8, sector_pe * 1.2], 
-                     "color": self.style["neutral_color"]},
-                    {"range": [sector_pe * 1.2, historical_high * 1.2], 
-                     "color": self.style["negative_color"]}
-                ],
-                "threshold": {
-                    "line": {"color": self.style["text_color"], "width": 2},
-                    "thickness": 0.75,
-                    "value": sector_pe
-                }
-            }
-        ))
-        
-        fig.update_layout(
-            font={"family": self.style["font_family"], "color": self.style["text_color"]},
-            paper_bgcolor=self.style["background_color"],
-            plot_bgcolor=self.style["background_color"],
-            height=400,
-            margin=dict(l=40, r=40, t=80, b=60),
-            annotations=[
-                dict(
-                    text=f"▲ {premium:+.0f}% vs sector" if premium > 0 else f"▼ {premium:.0f}% vs sector",
-                    x=0.5, y=0.25,
-                    xref="paper", yref="paper",
-                    showarrow=False,
-                    font={"size": 14, "color": self.style["positive_color"] if premium < 0 else self.style["negative_color"]}
-                ),
-                dict(
-                    text=self.style["watermark"],
-                    x=0.98, y=0.02,
-                    xref="paper", yref="paper",
-                    showarrow=False,
-                    font={"size": 9, "color": self.style["subtitle_color"]},
-                    xanchor="right"
-                )
-            ]
-        )
-        
-        return {
-            "base64": self._to_base64(fig),
-            "type": "valuation_gauge",
-            "title": f"{symbol} Valuation",
-            "symbol": symbol,
-            "insight": f"Current PE is {current_pe:.1f}x vs Sector PE {sector_pe:.1f}x. The stock is trading at a {((current_pe-sector_pe)/sector_pe)*100:+.0f}% premium/discount to sector."
-        }
     
     def segment_breakdown(self, 
                           segments: List[Dict], 
@@ -780,38 +802,41 @@ class ChartGenerator:
         if "Q1" in segments[0] or "periods" in segments[0]:
             # Multi-period stacked bar
             periods = ["Q1", "Q2", "Q3", "Q4"]
-            fig = go.Figure()
+            fig = {"data": [], "layout": {}}
             
             for i, seg in enumerate(segments):
                 values = [seg.get(p, 0) for p in periods]
-                fig.add_trace(go.Bar(
-                    name=seg.get("name", f"Segment {i+1}"),
-                    x=periods,
-                    y=values,
-                    marker_color=segment_colors[i % len(segment_colors)],
-                    text=[f"₹{v/1000:.0f}K" if v >= 1000 else f"₹{v:.0f}" for v in values],
-                    textposition="inside",
-                    textfont={"size": 8, "color": "#FFFFFF"},
-                ))
+                fig["data"].append({
+                    "type": "bar",
+                    "name": seg.get("name", f"Segment {i+1}"),
+                    "x": periods,
+                    "y": values,
+                    "marker": {"color": segment_colors[i % len(segment_colors)]},
+                    "text": [f"₹{v/1000:.0f}K" if v >= 1000 else f"₹{v:.0f}" for v in values],
+                    "textposition": "inside",
+                    "textfont": {"size": 8, "color": "#FFFFFF"},
+                })
             
-            fig.update_layout(barmode="stack" if chart_type == "stacked" else "group")
+            fig["layout"]["barmode"] = "stack" if chart_type == "stacked" else "group"
         else:
             # Single period - horizontal bars or pie
             names = [s.get("name", "?") for s in segments]
             values = [s.get("value", 0) for s in segments]
             colors = [segment_colors[i % len(segment_colors)] for i in range(len(segments))]
             
-            fig = go.Figure(data=[
-                go.Bar(
-                    x=values,
-                    y=names,
-                    orientation='h',
-                    marker_color=colors,
-                    text=[f"₹{v:,.0f} Cr" for v in values],
-                    textposition="outside",
-                    textfont={"size": 9, "color": self.style["text_color"]},
-                )
-            ])
+            fig = {
+                "data": [{
+                    "type": "bar",
+                    "x": values,
+                    "y": names,
+                    "orientation": "h",
+                    "marker": {"color": colors},
+                    "text": [f"₹{v:,.0f} Cr" for v in values],
+                    "textposition": "outside",
+                    "textfont": {"size": 9, "color": self.style["text_color"]},
+                }],
+                "layout": {}
+            }
         
         # Calculate total for footer
         if "Q1" in segments[0]:
@@ -828,7 +853,7 @@ class ChartGenerator:
         
         # Only show legend for multi-period charts (stacked/grouped)
         if "Q1" in segments[0] or "periods" in segments[0]:
-            fig.update_layout(
+            fig["layout"].update(
                 showlegend=True,
                 legend=dict(
                     orientation="h",
@@ -841,7 +866,7 @@ class ChartGenerator:
             )
         else:
             # Hide legend for single-period horizontal bars
-            fig.update_layout(showlegend=False)
+            fig["layout"]["showlegend"] = False
         
         # Prepare dataPoints from segments
         if "Q1" in segments[0] or "periods" in segments[0]:
@@ -858,7 +883,7 @@ class ChartGenerator:
             ]
         
         return {
-            "base64": self._to_base64(fig),
+            **self._image(fig),
             "type": "segment_breakdown",
             "title": f"{symbol} Segment Breakdown",
             "symbol": symbol,
@@ -896,36 +921,38 @@ class ChartGenerator:
             prev_q.get("pat_cr", 0)
         ]
         
-        current_label = f"Q{current_q.get('quarter', '?')} FY{str(current_q.get('fiscal_year', ''))[-2:]}"
-        prev_label = f"Q{prev_q.get('quarter', '?')} FY{str(prev_q.get('fiscal_year', ''))[-2:]}"
-        
-        fig = go.Figure()
-        
-        # Previous quarter
-        fig.add_trace(go.Bar(
-            name=prev_label,
-            x=metrics,
-            y=prev_vals,
-            marker_color=self.style["secondary_bar"],
-            text=[f"{v:,.0f}" for v in prev_vals],
-            textposition="outside",
-            textfont={"size": 8, "color": self.style["subtitle_color"]},
-            width=0.35
-        ))
-        
-        # Current quarter
-        fig.add_trace(go.Bar(
-            name=current_label,
-            x=metrics,
-            y=current_vals,
-            marker_color=self.style["primary_bar"],
-            text=[f"{v:,.0f}" for v in current_vals],
-            textposition="outside",
-            textfont={"size": 8, "color": self.style["text_color"]},
-            width=0.35
-        ))
-        
-        fig.update_layout(barmode="group")
+        current_label = f"Q{current_q.get('quarter', '?')} FY{_fy_short(current_q.get('fiscal_year'))}"
+        prev_label = f"Q{prev_q.get('quarter', '?')} FY{_fy_short(prev_q.get('fiscal_year'))}"
+        
+        fig = {
+            "data": [
+                # Previous quarter
+                {
+                    "type": "bar",
+                    "name": prev_label,
+                    "x": metrics,
+                    "y": prev_vals,
+                    "marker": {"color": self.style["secondary_bar"]},
+                    "text": [f"{v:,.0f}" for v in prev_vals],
+                    "textposition": "outside",
+                    "textfont": {"size": 8, "color": self.style["subtitle_color"]},
+                    "width": 0.35
+                },
+                # Current quarter
+                {
+                    "type": "bar",
+                    "name": current_label,
+                    "x": metrics,
+                    "y": current_vals,
+                    "marker": {"color": self.style["primary_bar"]},
+                    "text": [f"{v:,.0f}" for v in current_vals],
+                    "textposition": "outside",
+                    "textfont": {"size": 8, "color": self.style["text_color"]},
+                    "width": 0.35
+                },
+            ],
+            "layout": {"barmode": "group"}
+        }
         
         # Calculate revenue growth for footer
         if prev_vals[0] > 0:
@@ -940,7 +967,7 @@ class ChartGenerator:
             footer_left=f"● Revenue Growth: {growth:+.1f}% QoQ"
         )
         
-        fig.update_layout(
+        fig["layout"].update(
             showlegend=True,
             legend=dict(
                 orientation="h",
@@ -953,7 +980,7 @@ class ChartGenerator:
         )
         
         return {
-            "base64": self._to_base64(fig),
+            **self._image(fig),
             "type": "quarterly_comparison",
             "title": f"{symbol} Quarterly Comparison",
             "symbol": symbol,
@@ -985,25 +1012,30 @@ class ChartGenerator:
             color = self.style["primary_color"]
             delta_text = ""
         
-        fig = go.Figure(go.Indicator(
-            mode="number+delta" if change is not None else "number",
-            value=value,
-            delta={"reference": value / (1 + change/100) if change else None, 
-                   "relative": True, "valueformat": ".1%"} if change else None,
-            title={"text": label},
-            number={"font": {"size": 48, "color": color}},
-        ))
-        
-        fig.update_layout(
-            font={"family": self.style["font_family"]},
-            paper_bgcolor=self.style["background_color"],
-            height=200,
-            width=300,
-            margin=dict(l=20, r=20, t=60, b=20)
-        )
+        indicator = {
+            "type": "indicator",
+            "mode": "number+delta" if change is not None else "number",
+            "value": value,
+            "title": {"text": label},
+            "number": {"font": {"size": 48, "color": color}},
+        }
+        if change:
+            indicator["delta"] = {"reference": value / (1 + change/100),
+                                  "relative": True, "valueformat": ".1%"}
+        
+        fig = {
+            "data": [indicator],
+            "layout": {
+                "font": {"family": self.style["font_family"]},
+                "paper_bgcolor": self.style["background_color"],
+                "height": 200,
+                "width": 300,
+                "margin": dict(l=20, r=20, t=60, b=20)
+            }
+        }
         
         return {
-            "base64": self._to_base64(fig),
+            **self._image(fig),
             "type": "metric_card",
             "label": label,
             "value": value
@@ -1014,76 +1046,204 @@ class ChartGenerator:
 # HELPER FUNCTIONS FOR ORCHESTRATOR INTEGRATION
 # =============================================================================
 
-def detect_chart_intent(query: str) -> Optional[str]:
+# Ordered by priority: the first chart type with a matching trigger wins
+CHART_TRIGGERS = {
+    # Segment/breakdown charts
+    "segment_breakdown": [
+        "segment", "breakdown", "division", "by business", "by segment",
+        "revenue mix", "business mix", "contribution", "o2c", "retail",
+        "jio", "digital", "oil and gas", "refining"
+    ],
+
+    # Quarterly comparison
+    "quarterly_comparison": [
+        "quarter", "qoq", "q-o-q", "quarterly", "q1", "q2", "q3", "q4",
+        "this quarter", "last quarter", "sequential"
+    ],
+
+    # Revenue trend
+    "revenue_trend": [
+        "revenue trend", "revenue growth", "revenue over",
+        "sales trend", "sales growth", "topline"
+    ],
+
+    # Margin trend
+    "margin_trend": [
+        "margin trend", "margin over time", "margin history", 
+        "margin guidance", "margins changing", "profitability"
+    ],
+
+    # Peer comparison
+    "peer_comparison": [
+        "compare", "vs", "versus", "peers", "competitors",
+        "relative to", "better than", "worse than", "industry"
+    ],
+
+    # Valuation
+    "valuation_gauge": [
+        "valuation", "expensive", "cheap", "undervalued", "overvalued",
+        "pe ratio", "trading at", "fairly valued"
+    ]
+}
+
+_CHART_TYPES = tuple(CHART_TRIGGERS)
+
+# Inverted index: trigger -> priority of the chart type it selects
+TRIGGER_TO_CHART: Dict[str, int] = {}
+for _priority, _triggers in enumerate(CHART_TRIGGERS.values()):
+    for _trigger in _triggers:
+        TRIGGER_TO_CHART.setdefault(_trigger, _priority)
+
+
+def detect_chart_intent(query: str, query_lower: Optional[str] = None) -> Optional[str]:
     """
     Smart chart selection based on query keywords.
     Returns the most appropriate chart type for the query.
+    Pass query_lower if the caller has already lowercased the query.
     """
-    q = query.lower()
+    q = query_lower if query_lower is not None else query.lower()
     
-    CHART_TRIGGERS = {
-        # Segment/breakdown charts
-        "segment_breakdown": [
-            "segment", "breakdown", "division", "by business", "by segment",
-            "revenue mix", "business mix", "contribution", "o2c", "retail",
-            "jio", "digital", "oil and gas", "refining"
-        ],
-        
-        # Quarterly comparison
-        "quarterly_comparison": [
-            "quarter", "qoq", "q-o-q", "quarterly", "q1", "q2", "q3", "q4",
-            "this quarter", "last quarter", "sequential"
-        ],
-        
-        # Revenue trend
-        "revenue_trend": [
-            "revenue trend", "revenue growth", "revenue over",
-            "sales trend", "sales growth", "topline"
-        ],
-        
-        # Margin trend
-        "margin_trend": [
-            "margin trend", "margin over time", "margin history", 
-            "margin guidance", "margins changing", "profitability"
-        ],
-        
-        # Peer comparison
-        "peer_comparison": [
-            "compare", "vs", "versus", "peers", "competitors",
-            "relative to", "better than", "worse than", "industry"
-        ],
-        
-        # Valuation
-        "valuation_gauge": [
-            "valuation", "expensive", "cheap", "undervalued", "overvalued",
-            "pe ratio", "trading at", "fairly valued"
-        ]
-    }
+    # Whole-word hits resolve through the index in O(#tokens)
+    best = len(_CHART_TYPES)
+    for token in q.split():
+        best = min(best, TRIGGER_TO_CHART.get(token, best))
     
-    for chart_type, triggers in CHART_TRIGGERS.items():
-        if any(t in q for t in triggers):
+    # Substring scan only for chart types that outrank the token hit
+    for chart_type in _CHART_TYPES[:best]:
+        if any(t in q for t in CHART_TRIGGERS[chart_type]):
             return chart_type
     
-    return None
+    return _CHART_TYPES[best] if best < len(_CHART_TYPES) else None
+
+
+def _num(value: Any) -> float:
+    """Coerce DB/JSON scalars (None, Decimal, "2024") to float, 0.0 when unusable."""
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _period_key(value: Any) -> int:
+    """Numeric ordering key for fiscal_year / quarter values like 2024, "2024", "FY24" or "Q3"."""
+    digits = "".join(ch for ch in str(value) if ch.isdigit()) if value is not None else ""
+    return int(digits) if digits else 0
+
+
+def _fy_short(value: Any) -> str:
+    """Two-digit fiscal year suffix for labels: 2024 / "2024" -> "24", None -> ""."""
+    if value is None:
+        return ""
+    if type(value) is int and value >= 10:
+        return f"{value % 100:02d}"
+    return str(value)[-2:]
+
+
+# Numeric fields of annual/quarterly result rows used by the charts
+RESULT_VALUE_FIELDS = ("revenue_cr", "net_profit_cr", "net_margin", "ebitda_cr", "pat_cr")
+RESULT_PERIOD_FIELDS = ("fiscal_year", "quarter")
+
+
+def _as_soa(rows: Any) -> Dict[str, np.ndarray]:
+    """
+    Transpose result rows (list of dicts) into columns (dict of arrays) once.
+    
+    Input that is already columnar ({"revenue_cr": [...], ...}) is accepted as-is,
+    so upstream producers can hand over columns directly. Value fields become
+    float64 arrays; fiscal_year / quarter stay raw (object) for labels, with
+    int64 "<field>_key" companions for ordering.
+    """
+    if isinstance(rows, dict):
+        n = len(next(iter(rows.values()), ()))
+        def get(key): return rows.get(key, [None] * n)
+    else:
+        n = len(rows)
+        def get(key): return [r.get(key) for r in rows]
+    
+    soa = {
+        key: np.fromiter((_num(v) for v in get(key)), dtype=np.float64, count=n)
+        for key in RESULT_VALUE_FIELDS
+    }
+    for key in RESULT_PERIOD_FIELDS:
+        raw = np.empty(n, dtype=object)
+        raw[:] = list(get(key))
+        soa[key] = raw
+        soa[f"{key}_key"] = np.fromiter((_period_key(v) for v in raw), dtype=np.int64, count=n)
+    return soa
+
+
+def _soa_take(soa: Dict[str, np.ndarray], index: np.ndarray) -> Dict[str, np.ndarray]:
+    """Reorder / filter every column of a SoA by the same index."""
+    return {key: col[index] for key, col in soa.items()}
+
+
+def _soa_row(soa: Dict[str, np.ndarray], i: int) -> Dict:
+    """Materialise a single row back into a plain dict (missing periods omitted)."""
+    row = {key: float(soa[key][i]) for key in RESULT_VALUE_FIELDS}
+    row.update({key: soa[key][i] for key in RESULT_PERIOD_FIELDS if soa[key][i] is not None})
+    return row
+
+
+def _net_margin(net_margin: np.ndarray, revenue: np.ndarray, profit: np.ndarray) -> np.ndarray:
+    """Reported net margin, falling back to profit / revenue where it is missing."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        computed = np.where((revenue != 0) & (profit != 0), profit / revenue * 100.0, 0.0)
+    return np.where(net_margin != 0, net_margin, computed)
+
+
+# Shared generators (stateless once built), keyed by encode_base64
+_CHART_GENERATORS: Dict[bool, ChartGenerator] = {}
+
+
+def _get_generator(encode_base64: bool = True) -> ChartGenerator:
+    """Lazily build and reuse one ChartGenerator per output encoding."""
+    generator = _CHART_GENERATORS.get(encode_base64)
+    if generator is None:
+        generator = _CHART_GENERATORS[encode_base64] = ChartGenerator(encode_base64=encode_base64)
+    return generator
 
 
 def generate_relevant_chart(
     query: str, 
     market_data: Dict, 
     filings_data: Dict,
-    symbol: str
+    symbol: str,
+    query_lower: Optional[str] = None,
+    encode_base64: bool = True
 ) -> Optional[Dict]:
     """
     Smart chart generation based on query intent.
     Automatically selects and generates the most relevant chart.
     
     Returns:
-        Chart dict with base64 image and metadata, or None
+        Chart dict with base64 image and metadata, or None. With
+        encode_base64=False the image is raw "image_bytes" + "content_type",
+        ready for Response(chart["image_bytes"], media_type=chart["content_type"]).
     """
-    chart_type = detect_chart_intent(query)
-    generator = ChartGenerator()
+    chart_type = detect_chart_intent(query, query_lower)
+    generator = _get_generator(encode_base64)
     
     try:
+        # AoS -> SoA transpose once, up front; every branch below works on columns
+        annual = _as_soa(filings_data.get("annual_results", []))
+        quarterly = _as_soa(filings_data.get("quarterly_results", []))
+        
+        # Sort both series once here; chart methods are told not to re-sort
+        annual = _soa_take(annual, np.argsort(annual["fiscal_year_key"], kind="stable"))
+        a_rev = annual["revenue_cr"]
+        a_margin = _net_margin(annual["net_margin"], a_rev, annual["net_profit_cr"])
+        a_periods = ["FY" + _fy_short(fy) for fy in annual["fiscal_year"]]
+        
+        # Chronological order of quarters (fiscal year, then quarter)
+        quarterly = _soa_take(quarterly, np.lexsort((quarterly["quarter_key"], quarterly["fiscal_year_key"])))
+        q_rev = quarterly["revenue_cr"]
+        q_margin = _net_margin(quarterly["net_margin"], q_rev, quarterly["net_profit_cr"])
+        q_periods = [
+            f"Q{q if q is not None else '?'} FY{_fy_short(fy)}"
+            for q, fy in zip(quarterly["quarter"], quarterly["fiscal_year"])
+        ]
+        n_annual, n_quarterly = len(a_rev), len(q_rev)
+        
         # === SEGMENT BREAKDOWN ===
         if chart_type == "segment_breakdown":
             segments = filings_data.get("segments", [])
@@ -1098,69 +1258,35 @@ def generate_relevant_chart(
         
         # === QUARTERLY COMPARISON ===
         if chart_type == "quarterly_comparison":
-            quarterly = filings_data.get("quarterly_results", [])
-            if quarterly and len(quarterly) >= 2:
-                # Sort by date and get last two quarters
-                sorted_q = sorted(quarterly, 
-                    key=lambda x: (x.get("fiscal_year", 0), x.get("quarter", 0)))
-                if len(sorted_q) >= 2:
-                    return generator.quarterly_comparison(
-                        sorted_q[-1], sorted_q[-2], symbol
-                    )
+            if n_quarterly >= 2:
+                # Last two quarters in chronological order
+                return generator.quarterly_comparison(
+                    _soa_row(quarterly, -1), _soa_row(quarterly, -2), symbol
+                )
         
         # === REVENUE TREND ===
         if chart_type == "revenue_trend":
-            annual = filings_data.get("annual_results", [])
-            quarterly = sorted(filings_data.get("quarterly_results", []), 
-                              key=lambda x: (x.get("fiscal_year", 0), x.get("quarter", 0)))
-            
-            if len(annual) >= 3:
-                data = [{"period": f"FY{str(a.get('fiscal_year', ''))[-2:]}", 
-                         "value": a.get("revenue_cr", 0)} for a in annual]
-                if any(d["value"] > 0 for d in data):
-                    return generator.revenue_trend(data, symbol, title_prefix="Annual")
+            if n_annual >= 3 and (a_rev > 0).any():
+                data = [{"period": p, "value": v} for p, v in zip(a_periods, a_rev.tolist())]
+                return generator.revenue_trend(data, symbol, title_prefix="Annual", presorted=True)
             
-            if quarterly:
-                data = [{"period": f"Q{q.get('quarter', '?')} FY{str(q.get('fiscal_year', ''))[-2:]}", 
-                         "value": q.get("revenue_cr", 0)} for q in quarterly]
-                data = [d for d in data if d["value"] > 0]
-                if len(data) >= 2:
-                    return generator.revenue_trend(data, symbol, title_prefix="Quarterly")
+            if n_quarterly:
+                keep = np.flatnonzero(q_rev > 0)
+                if len(keep) >= 2:
+                    data = [{"period": q_periods[i], "value": v} for i, v in zip(keep, q_rev[keep].tolist())]
+                    return generator.revenue_trend(data, symbol, title_prefix="Quarterly", presorted=True)
         
         # === MARGIN TREND ===
         if chart_type == "margin_trend":
-            annual = filings_data.get("annual_results", [])
-            quarterly = sorted(filings_data.get("quarterly_results", []), 
-                              key=lambda x: (x.get("fiscal_year", 0), x.get("quarter", 0)))
-            
-            if len(annual) >= 3:
-                data = [{"period": f"FY{str(a.get('fiscal_year', ''))[-2:]}", 
-                         "value": a.get("net_margin", 0)} for a in annual]
-                for d, a in zip(data, annual):
-                    if d["value"] == 0:
-                        rev = a.get("revenue_cr", 0)
-                        prof = a.get("net_profit_cr", 0)
-                        if rev and prof:
-                            d["value"] = (prof / rev) * 100
-                
-                if any(d["value"] != 0 for d in data):
-                    return generator.margin_trend(data, symbol, title_prefix="Annual")
+            if n_annual >= 3 and (a_margin != 0).any():
+                data = [{"period": p, "value": v} for p, v in zip(a_periods, a_margin.tolist())]
+                return generator.margin_trend(data, symbol, title_prefix="Annual", presorted=True)
 
-            if quarterly:
-                data = []
-                for q in quarterly:
-                    margin = q.get("net_margin", 0)
-                    if not margin:
-                        rev = q.get("revenue_cr", 0)
-                        prof = q.get("net_profit_cr", 0)
-                        if rev and prof:
-                            margin = (prof / rev) * 100
-                    if margin:
-                        data.append({"period": f"Q{q.get('quarter', '?')} FY{str(q.get('fiscal_year', ''))[-2:]}", 
-                                     "value": margin})
-                
-                if len(data) >= 2:
-                    return generator.margin_trend(data, symbol, title_prefix="Quarterly")
+            if n_quarterly:
+                keep = np.flatnonzero(q_margin != 0)
+                if len(keep) >= 2:
+                    data = [{"period": q_periods[i], "value": v} for i, v in zip(keep, q_margin[keep].tolist())]
+                    return generator.margin_trend(data, symbol, title_prefix="Quarterly", presorted=True)
         
         # === PEER COMPARISON ===
         if chart_type == "peer_comparison":
@@ -1184,26 +1310,18 @@ def generate_relevant_chart(
         # === DEFAULT FALLBACK: MULTI-VIEW CHART ===
         # If no specific intent, try to generate a comprehensive multi-view chart
         
-        annual = filings_data.get("annual_results", [])
-        if len(annual) >= 1: # Relaxed from 3 to 1 to ensure coverage
+        if n_annual >= 1: # Relaxed from 3 to 1 to ensure coverage
              # Prepare datasets
-             rev_data = [{"period": f"FY{str(a.get('fiscal_year', ''))[-2:]}", "value": a.get("revenue_cr", 0)} for a in annual]
-             
-             margin_data = []
-             for a in annual:
-                 margin = a.get("net_margin", 0)
-                 if not margin:
-                      rev = a.get("revenue_cr", 0)
-                      prof = a.get("net_profit_cr", 0)
-                      if rev and prof: margin = (prof/rev)*100
-                 margin_data.append({"period": f"FY{str(a.get('fiscal_year', ''))[-2:]}", "value": margin})
+             rev_data = [{"period": p, "value": v} for p, v in zip(a_periods, a_rev.tolist())]
+             margin_data = [{"period": p, "value": v} for p, v in zip(a_periods, a_margin.tolist())]
 
              return generator.combined_financials(
                  datasets={
                      "annual_revenue": rev_data,
                      "annual_margins": margin_data
                  },
-                 symbol=symbol
+                 symbol=symbol,
+                 presorted=True
              )
 
         # Fallback to PE Gauge if financials missing
@@ -1246,15 +1364,23 @@ def get_hybrid_visuals(
         "symbol": symbol
     }
     
-    # 1. Extract charts from annual report if path provided
-    if annual_report_path and os.path.exists(annual_report_path):
-        extractor = FigureExtractor()
-        extracted = extractor.extract_from_annual_report(annual_report_path)
-        result["extracted"] = extracted
-        logger.info(f"Extracted {len(extracted)} charts from annual report")
+    # PDF extraction (IO-bound) and chart generation are independent: run them
+    # side by side so latency is the slower of the two, not the sum
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # 1. Extract charts from annual report if path provided
+        extract_future = None
+        if annual_report_path and os.path.exists(annual_report_path):
+            extract_future = executor.submit(FigureExtractor().extract_from_annual_report, annual_report_path)
+        
+        # 2. Generate data-driven chart
+        generate_future = executor.submit(generate_relevant_chart, query, market_data, filings_data, symbol)
+        
+        if extract_future is not None:
+            extracted = extract_future.result()
+            result["extracted"] = extracted
+            logger.info(f"Extracted {len(extracted)} charts from annual report")
+        generated = generate_future.result()
     
-    # 2. Generate data-driven chart
-    generated = generate_relevant_chart(query, market_data, filings_data, symbol)
     if generated:
         generated["source"] = "data_generated"
         result["generated"] = generated
@@ -1262,6 +1388,20 @@ def get_hybrid_visuals(
     return result
 
 
+# Base64 characters decoded per write in save_chart_image (a multiple of 4, so chunks decode independently)
+B64_DECODE_CHUNK = 64 * 1024
+
+
+def save_chart_image(chart_base64: str, path: str) -> None:
+    """
+    Write a chart's base64 image (as returned in chart["base64"]) to path.
+    Decodes a chunk at a time so the full decoded image is never held in memory.
+    """
+    with open(path, "wb") as f:
+        for start in range(0, len(chart_base64), B64_DECODE_CHUNK):
+            f.write(base64.b64decode(chart_base64[start:start + B64_DECODE_CHUNK]))
+
+
 # Test function
 if __name__ == "__main__":
     # Quick test of chart generation
@@ -1290,7 +1430,5 @@ if __name__ == "__main__":
     print(f"Base64 length: {len(gauge['base64'])} chars")
     
     # Save for viewing
-    import base64 as b64
-    with open("test_gauge_chart.png", "wb") as f:
-        f.write(b64.b64decode(gauge["base64"]))
+    save_chart_image(gauge["base64"], "test_gauge_chart.png")
     print("Saved to test_gauge_chart.png")
@@ -0,0 +1,196 @@
+"""
+SVG Chart Templates
+
+Hand-authored SVG templates for the recurring chart types (valuation gauge,
+bar trends). Geometry is computed with NumPy and substituted into f-string
+templates, so rendering needs neither Plotly nor a kaleido/Chromium process.
+Styling mirrors CHART_STYLE in generator.py.
+"""
+
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+
+# =============================================================================
+# TEMPLATES
+# =============================================================================
+
+SVG_DOCUMENT = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+    'viewBox="0 0 {width} {height}" font-family="{font_family}">'
+    '<rect width="100%" height="100%" fill="{background}"/>'
+    '{body}'
+    '</svg>'
+)
+
+SVG_TEXT = (
+    '<text x="{x:.1f}" y="{y:.1f}" font-size="{size}" fill="{color}" '
+    'text-anchor="{anchor}"{weight}>{text}</text>'
+)
+
+SVG_ARC = (
+    '<path d="M {x0:.2f} {y0:.2f} A {r:.2f} {r:.2f} 0 0 1 {x1:.2f} {y1:.2f}" '
+    'fill="none" stroke="{color}" stroke-opacity="{opacity}" stroke-width="{width}"/>'
+)
+
+SVG_LINE = (
+    '<line x1="{x0:.1f}" y1="{y0:.1f}" x2="{x1:.1f}" y2="{y1:.1f}" '
+    'stroke="{color}" stroke-width="{width}"{dash}/>'
+)
+
+SVG_BAR = (
+    '<rect x="{x:.1f}" y="{y:.1f}" width="{w:.1f}" height="{h:.1f}" fill="{color}" '
+    'stroke="#FFFFFF" stroke-opacity="0.15" stroke-width="0.5"/>'
+)
+
+
+def _text(x: float, y: float, text: str, size: int, color: str,
+          anchor: str = "start", bold: bool = False) -> str:
+    return SVG_TEXT.format(
+        x=x, y=y, size=size, color=color, anchor=anchor,
+        weight=' font-weight="bold"' if bold else "", text=escape(str(text))
+    )
+
+
+def _document(body: List[str], style: Dict, width: int, height: int) -> str:
+    return SVG_DOCUMENT.format(
+        width=width, height=height,
+        font_family=escape(style["font_family"], {'"': "&quot;"}),
+        background=style["background_color"],
+        body="".join(body)
+    )
+
+
+def _nice_ticks(lo: float, hi: float, n: int = 5) -> np.ndarray:
+    """Round tick positions covering [lo, hi] with roughly n intervals."""
+    span = hi - lo if hi > lo else 1.0
+    raw_step = span / n
+    magnitude = 10 ** np.floor(np.log10(raw_step))
+    step = magnitude * next(m for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    return np.arange(np.floor(lo / step) * step, np.ceil(hi / step) * step + step * 0.5, step)
+
+
+# =============================================================================
+# CHARTS
+# =============================================================================
+
+def valuation_gauge_svg(current_pe: float,
+                        sector_pe: float,
+                        axis_min: float,
+                        axis_max: float,
+                        bar_color: str,
+                        style: Dict,
+                        width: int,
+                        height: int) -> str:
+    """Semi-circular P/E gauge with sector threshold marker."""
+    cx, cy = width / 2, height * 0.68
+    radius = min(width, height) * 0.42
+    span = (axis_max - axis_min) or 1.0
+
+    def angle(v):
+        # Map value onto [pi, 0] (left to right across the top)
+        return np.pi * (1.0 - np.clip((np.asarray(v, dtype=np.float64) - axis_min) / span, 0.0, 1.0))
+
+    def arc(v0, v1, color, stroke, opacity=1.0):
+        (t0, t1) = angle([v0, v1])
+        return SVG_ARC.format(
+            x0=cx + radius * np.cos(t0), y0=cy - radius * np.sin(t0),
+            x1=cx + radius * np.cos(t1), y1=cy - radius * np.sin(t1),
+            r=radius, color=color, opacity=opacity, width=stroke
+        )
+
+    body = [
+        arc(axis_min, axis_max, style["grid_color"], 48),
+        arc(axis_min, axis_max, style["background_color"], 44),
+        arc(axis_min, sector_pe, style["positive_color"], 44, opacity=0.1),
+        arc(sector_pe, axis_max, style["negative_color"], 44, opacity=0.1),
+        arc(axis_min, current_pe, bar_color, 22),
+    ]
+
+    # Sector threshold tick
+    t = angle(sector_pe)
+    r_in, r_out = radius - 26, radius + 26
+    body.append(SVG_LINE.format(
+        x0=cx + r_in * np.cos(t), y0=cy - r_in * np.sin(t),
+        x1=cx + r_out * np.cos(t), y1=cy - r_out * np.sin(t),
+        color="white", width=4, dash=""
+    ))
+
+    # Axis ticks
+    for tick in _nice_ticks(axis_min, axis_max):
+        if tick < axis_min or tick > axis_max:
+            continue
+        ta = angle(tick)
+        r_label = radius + 40
+        body.append(_text(cx + r_label * np.cos(ta), cy - r_label * np.sin(ta) + 4,
+                          f"{tick:g}", 11, style["subtitle_color"], anchor="middle"))
+
+    delta = current_pe - sector_pe
+    delta_color = style["negative_color"] if delta > 0 else style["positive_color"]
+    body += [
+        _text(cx, height * 0.1, "P/E Ratio vs Sector", 14, style["subtitle_color"], anchor="middle"),
+        _text(cx, cy - 10, f"{current_pe:g}", 56, style["text_color"], anchor="middle"),
+        _text(cx, cy + 30, f"{'▲' if delta > 0 else '▼'}{abs(delta):.4g}", 20, delta_color, anchor="middle"),
+    ]
+    return _document(body, style, width, height)
+
+
+def bar_chart_svg(labels: List[str],
+                  values: List[float],
+                  colors: List[str],
+                  title: str,
+                  style: Dict,
+                  width: int,
+                  height: int,
+                  subtitle: Optional[str] = None,
+                  footer_left: Optional[str] = None,
+                  value_labels: Optional[List[str]] = None,
+                  tick_suffix: str = "") -> str:
+    """Vertical bar chart laid out like ChartGenerator._apply_fiscal_style."""
+    left, right, top, bottom = 60, 30, 75, 70
+    plot_w, plot_h = width - left - right, height - top - bottom
+
+    vals = np.asarray(values, dtype=np.float64)
+    ticks = _nice_ticks(min(0.0, float(vals.min())), float(vals.max()) * 1.1 if vals.max() > 0 else 1.0)
+    y_lo, y_hi = float(ticks[0]), float(ticks[-1])
+    scale = plot_h / ((y_hi - y_lo) or 1.0)
+
+    def y_px(v):
+        return top + plot_h - (np.asarray(v, dtype=np.float64) - y_lo) * scale
+
+    n = len(vals)
+    slot = plot_w / max(n, 1)
+    bar_w = slot * 0.65
+    centers = left + slot * (np.arange(n) + 0.5)
+    zero = y_px(0.0)
+    tops = y_px(vals)
+    bar_y = np.minimum(tops, zero)
+    bar_h = np.abs(zero - tops)
+
+    body = []
+    for tick, ty in zip(ticks, y_px(ticks)):
+        body.append(SVG_LINE.format(x0=left, y0=ty, x1=left + plot_w, y1=ty,
+                                    color=style["grid_color"], width=0.5,
+                                    dash=' stroke-dasharray="2,3"'))
+        body.append(_text(left - 8, ty + 3, f"{tick:,.6g}{tick_suffix}", 9,
+                          style["subtitle_color"], anchor="end"))
+
+    if value_labels is None:
+        value_labels = [f"{v:,.0f}" if v >= 100 else f"{v:.1f}" for v in values]
+
+    for i in range(n):
+        body.append(SVG_BAR.format(x=centers[i] - bar_w / 2, y=bar_y[i], w=bar_w, h=bar_h[i], color=colors[i]))
+        body.append(_text(centers[i], bar_y[i] - 5, value_labels[i], 8, style["text_color"], anchor="middle"))
+        body.append(_text(centers[i], top + plot_h + 16, labels[i], 9, style["subtitle_color"], anchor="middle"))
+
+    body.append(_text(width * 0.02, 28, title, 15, style["text_color"], bold=True))
+    if subtitle:
+        body.append(_text(width * 0.02, 46, subtitle, 11, style["subtitle_color"]))
+    if footer_left:
+        body.append(_text(width * 0.01 + left, height - 12, footer_left, 9, style["positive_color"]))
+    body.append(_text(width * 0.99 - right, height - 12, style["watermark"], 8,
+                      style["subtitle_color"], anchor="end"))
+
+    return _document(body, style, width, height)
@@ -1,6 +1,7 @@
 import logging
 import os
 import re
+import time
 from typing import Optional, List
 from datetime import datetime
 
@@ -9,6 +10,30 @@ from datetime import datetime
 
 logger = logging.getLogger("Guardrails")
 
+# Query tokenizer for single-word keyword lookups ("f&o" stays one token)
+_WORD_RE = re.compile(r"[\w&]+")
+
+# One literal regex token: a plain character or backslash-escaped punctuation
+_LITERAL_TOKEN_RE = re.compile(r"[^.^$*+?{}\[\]|()\\]|\\\W")
+
+
+def _required_literal(pattern: str) -> str:
+    """
+    Literal text every match of `pattern` must contain, lowercased ("" if unknown).
+    Used as a cheap substring prefilter before running the regex itself.
+    """
+    if "|" in re.sub(r"\\.", "", pattern):
+        return ""  # Alternation: no single required prefix
+    tokens = []
+    pos = 0
+    while (m := _LITERAL_TOKEN_RE.match(pattern, pos)):
+        tokens.append(m.group(0)[-1])
+        pos = m.end()
+    if pattern[pos:pos + 1] in ("?", "*", "{"):
+        tokens = tokens[:-1]  # Last token is optional
+    return "".join(tokens).lower()
+
+
 class ScopeGuardrail:
     """
     Hardened Guardrails for Inwezt Financial Interface.
@@ -17,7 +42,7 @@ class ScopeGuardrail:
     
     def __init__(self):
         # Layer 1: Fast Keyword Blocklist
-        self.blocked_keywords = [
+        self.blocked_keywords = (
             # Jailbreak / Prompt Injection
             "system prompt", "ignore previous", "ignore instructions", "disregard",
             "pretend you are", "roleplay", "act as", "jailbreak", "DAN",
@@ -36,7 +61,7 @@ class ScopeGuardrail:
             # General Off-Topic
             "write a poem", "tell me a joke", "story", "song lyrics",
             "homework", "essay", "translate", "summarize this article"
-        ]
+        )
         
         # Layer 2: Canary Patterns (Regex for sophisticated attacks)
         self.canary_patterns = [
@@ -49,16 +74,37 @@ class ScopeGuardrail:
             r"system\s*:\s*",
             r"<\|.*\|>",  # Token injection attempts
         ]
+        # Each canary is gated on its required literal ("ignore", "<|", ...):
+        # benign queries are cleared by substring checks without entering the regex engine
+        self._canaries = [
+            (_required_literal(p), re.compile(p, re.IGNORECASE)) for p in self.canary_patterns
+        ]
         
         # Layer 3: Allowed Topic Anchors (Positive Match)
-        self.allowed_topics = [
+        self.allowed_topics = (
             "stock", "share", "equity", "nifty", "sensex", "nse", "bse",
             "mutual fund", "etf", "ipo", "fpo", "portfolio", "investment",
             "sebi", "rbi", "dividend", "eps", "pe ratio", "market cap",
             "bull", "bear", "trading", "intraday", "delivery", "f&o", "futures", "options",
             "ltcg", "stcg", "capital gains", "tax", "demat", "broker",
             "reliance", "tcs", "infosys", "hdfc", "icici", "sbi"  # Common tickers
-        ]
+        )
+        
+        # Pre-partitioned lookups. Single words compile into one regex anchored at a word
+        # start only, so inflected forms ("jailbreaking", "bypassing") still match while
+        # "multiple" no longer trips "ipl". All-caps entries ("DAN") are acronyms: they match
+        # case-sensitively as whole words, so the name "Dan" is not blocked.
+        single = [k for k in self.blocked_keywords if " " not in k]
+        self._blocked_single = re.compile(
+            r"\b(?:" + "|".join(re.escape(k.lower()) for k in single if not k.isupper()) + ")"
+        )
+        self._blocked_acronyms = re.compile(
+            r"\b(?:" + "|".join(re.escape(k) for k in single if k.isupper()) + r")\b"
+        )
+        self._blocked_phrases = tuple(k.lower() for k in self.blocked_keywords if " " in k)
+        allowed = [t.lower() for t in self.allowed_topics]
+        self._allowed_single = frozenset(t for t in allowed if " " not in t)
+        self._allowed_phrases = tuple(t for t in allowed if " " in t)
         
         # System Prompt for LLM-based classification
         self.classifier_prompt = """
@@ -82,32 +128,40 @@ class ScopeGuardrail:
         - "BLOCK" if the query is off-topic or malicious
         """
     
-    def check_query(self, user_query: str) -> dict:
+    def check_query(self, user_query: str, query_lower: Optional[str] = None) -> dict:
         """
         Multi-layer query validation.
+        Pass query_lower if the caller has already lowercased the query.
         Returns: { 'is_safe': bool, 'refusal_message': str, 'block_reason': str }
         """
-        query_lower = user_query.lower().strip()
+        query_lower = (query_lower if query_lower is not None else user_query.lower()).strip()
+        words = set(_WORD_RE.findall(query_lower))
         
         # =========== LAYER 1: Fast Keyword Block ===========
-        for keyword in self.blocked_keywords:
-            if keyword in query_lower:
-                return self._block_response(
-                    reason=f"KEYWORD_BLOCK: '{keyword}'",
-                    message="I'm designed specifically for Indian financial markets. I cannot help with this request."
-                )
+        match = self._blocked_single.search(query_lower) or self._blocked_acronyms.search(user_query)
+        keyword = match.group(0) if match else next((k for k in self._blocked_phrases if k in query_lower), None)
+        if keyword:
+            return self._block_response(
+                reason=f"KEYWORD_BLOCK: '{keyword}'",
+                message="I'm designed specifically for Indian financial markets. I cannot help with this request."
+            )
         
         # =========== LAYER 2: Regex Canary Detection ===========
-        for pattern in self.canary_patterns:
-            if re.search(pattern, query_lower, re.IGNORECASE):
+        for literal, canary in self._canaries:
+            if literal in query_lower and canary.search(query_lower):
                 return self._block_response(
-                    reason=f"CANARY_PATTERN: {pattern}",
+                    reason=f"CANARY_PATTERN: {canary.pattern}",
                     message="I noticed an unusual pattern in your request. Please rephrase your financial question."
                 )
         
         # =========== LAYER 3: Positive Topic Anchoring ===========
         # If query contains clear financial terms, fast-approve
-        financial_confidence = sum(1 for t in self.allowed_topics if t in query_lower)
+        # Plural tokens ("stocks", "shares") count towards their singular topic
+        topic_words = words | {w[:-1] for w in words if w.endswith("s")}
+        financial_confidence = (
+            len(self._allowed_single & topic_words)
+            + sum(1 for t in self._allowed_phrases if t in query_lower)
+        )
         if financial_confidence >= 2:
             return self._allow_response()
         
@@ -177,17 +231,22 @@ class ResponseGuardrail:
             "invest": "Note: Please consult a SEBI-registered advisor before investing.",
         }
     
-    def sanitize_response(self, response: str, original_query: str) -> str:
+    def sanitize_response(self, response: str, original_query: str,
+                          query_lower: Optional[str] = None) -> str:
         """
         Cleans and enhances AI response for compliance.
+        Pass query_lower if the caller has already lowercased the query.
         """
+        if query_lower is None:
+            query_lower = original_query.lower()
+
         # Remove forbidden patterns
         for pattern in self.forbidden_response_patterns:
             response = re.sub(pattern, "", response, flags=re.IGNORECASE)
         
         # Add relevant disclaimers
         for trigger, disclaimer in self.disclaimer_triggers.items():
-            if trigger in original_query.lower() and disclaimer not in response:
+            if trigger in query_lower and disclaimer not in response:
                 response += f"\n\n{disclaimer}"
         
         return response.strip()
@@ -200,7 +259,28 @@ class ResponseFactChecker:
     """
     
     def __init__(self):
-        self.current_year = int(datetime.now().year)
+        # (hour bucket, ISO date) - refreshed at most hourly so the checker
+        # does not go stale across midnight / year boundaries in long-lived workers
+        self._today_cache = (None, None)
+        self.current_year = datetime.now().year
+        
+        # Year and a "future" label within 30 chars of each other (same sentence), either order.
+        # One linear regex pass instead of find() + slice + keyword scan per year.
+        # The trailing label is a lookahead so it can still anchor a following year.
+        self._temporal_re = re.compile(
+            r'\b(20[1-2][0-9])\b(?=[^.]{0,30}?(?:projected|estimated|forecast|future))'
+            r'|(?:projected|estimated|forecast|future)[^.]{0,30}?\b(20[1-2][0-9])\b',
+            re.IGNORECASE
+        )
+    
+    def _today(self) -> str:
+        """Today's ISO date, cached per hour; also keeps current_year fresh."""
+        hour = int(time.time()) // 3600
+        if self._today_cache[0] != hour:
+            now = datetime.now()
+            self._today_cache = (hour, now.strftime('%Y-%m-%d'))
+            self.current_year = now.year
+        return self._today_cache[1]
     
     def check(self, response: str, context_data: List[dict] = None) -> dict:
         """
@@ -208,23 +288,19 @@ class ResponseFactChecker:
         Returns: {'is_valid': bool, 'error': str, 'retry_prompt': str}
         """
         response_lower = response.lower()
+        today = self._today()
         
         # CHECK 1: Temporal Hallucination (e.g., "2024 (Projected)")
         # Find pattern: Year (4 digits) + "projected" or "estimated" or "forecast"
         # We look for years LESS than current year labeled as future
-        years_found = re.findall(r'\b(20[1-2][0-9])\b', response)
-        for year in years_found:
-            year_int = int(year)
-            if year_int < self.current_year:
-                # Check if this past year is labeled as projected nearby
-                # (Simple proximity check: look for "projected" near the year)
-                snippet = response[max(0, response.find(year)-30) : min(len(response), response.find(year)+30)].lower()
-                if any(w in snippet for w in ["projected", "estimated", "forecast", "future"]):
-                    return {
-                        "is_valid": False,
-                        "error": f"LABELED_PAST_AS_FUTURE: {year}",
-                        "retry_prompt": f"CRITICAL FACT ERROR: You labeled {year} as 'projected' or 'estimated'. {year} is in the past relative to Today ({datetime.now().strftime('%Y-%m-%d')}). Treat {year} data as FACTUAL HISTORY. Correct this immediately."
-                    }
+        for match in self._temporal_re.finditer(response):
+            year = match.group(1) or match.group(2)
+            if int(year) < self.current_year:
+                return {
+                    "is_valid": False,
+                    "error": f"LABELED_PAST_AS_FUTURE: {year}",
+                    "retry_prompt": f"CRITICAL FACT ERROR: You labeled {year} as 'projected' or 'estimated'. {year} is in the past relative to Today ({today}). Treat {year} data as FACTUAL HISTORY. Correct this immediately."
+                }
 
         # CHECK 2: False "Data Not Available"
         # If we provided price data but AI says it's unavailable
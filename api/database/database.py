@@ -3,15 +3,28 @@ Inwezt - Database Module
 PostgreSQL storage for comprehensive stock data (RAG foundation).
 """
 import os
+import io
+import json
+import time
 import logging
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import datetime, date
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Any, Union
+from dataclasses import dataclass, field
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
-from psycopg2.errors import UniqueViolation
+from psycopg2.errors import UniqueViolation, UndefinedFunction
+from psycopg2.pool import ThreadedConnectionPool, PoolError
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 load_dotenv(override=True)
 
 logging.basicConfig(level=logging.INFO)
@@ -19,21 +32,215 @@ logger = logging.getLogger("InweztDB")
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Connection pool sizing; idle connections older than the TTL are replaced on checkout
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "16"))
+DB_POOL_IDLE_TTL = float(os.getenv("DB_POOL_IDLE_TTL", "300"))
+# Server-side prepared statements; disable behind a transaction-mode pooler (pgbouncer)
+DB_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+
+
+def _json_dumps(obj: Any) -> str:
+    """JSON encoder for JSONB parameters: orjson when available, stdlib otherwise."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            # e.g. ints wider than 64 bits, which the stdlib handles
+            pass
+    return json.dumps(obj)
+
+
+def _json(obj: Any) -> psycopg2.extras.Json:
+    return psycopg2.extras.Json(obj, dumps=_json_dumps)
+
+
+if ORJSON_AVAILABLE:
+    # Decode json/jsonb columns (raw_data, key_metrics) with orjson too
+    psycopg2.extras.register_default_json(loads=orjson.loads, globally=True)
+    psycopg2.extras.register_default_jsonb(loads=orjson.loads, globally=True)
 
 
 def get_connection():
-    """Get a database connection."""
+    """Get a new, unpooled database connection (caller closes it)."""
     if not DATABASE_URL:
         raise ValueError("DATABASE_URL not configured")
     return psycopg2.connect(DATABASE_URL, connect_timeout=5)
 
 
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+_last_used: Dict[int, float] = {}
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    """Create the shared connection pool on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if not DATABASE_URL:
+                    raise ValueError("DATABASE_URL not configured")
+                _pool = ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX, DATABASE_URL, connect_timeout=5)
+    return _pool
+
+
+def _acquire(pool):
+    """A live pooled connection, or None if the pool is exhausted."""
+    try:
+        while True:
+            conn = pool.getconn()
+            # Replace connections that sat idle past the TTL (server may have dropped them);
+            # another thread may take the freed slot, so the next getconn can still fail
+            last_used = _last_used.pop(id(conn), None)
+            if not conn.closed and (last_used is None or time.monotonic() - last_used <= DB_POOL_IDLE_TTL):
+                return conn
+            pool.putconn(conn, close=True)
+    except PoolError:
+        return None
+
+
+@contextmanager
+def _conn():
+    """
+    Borrow a pooled connection for the duration of a block.
+    Open transactions are rolled back when the connection is returned; if the
+    pool is exhausted a one-off connection is used instead of failing.
+    """
+    pool = _get_pool()
+    conn = _acquire(pool)
+    
+    if conn is None:
+        conn = get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+    
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
+        if not conn.closed:
+            _last_used[id(conn)] = time.monotonic()
+
+
+# Append-only time-series tables, range-partitioned by month on their date column
+PARTITIONED_TABLES = {"price_history": "trade_date", "stock_snapshots": "snapshot_date"}
+PARTITION_START = date(2015, 1, 1)
+PARTITION_MONTHS_AHEAD = 3
+
 
-def init_database():
-    """Initialize all database tables."""
+def _month_start(day: date, offset: int = 0) -> date:
+    months = day.year * 12 + day.month - 1 + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def _create_monthly_partitions(cur, table: str, start: date, end: date) -> int:
+    """
+    Create any missing monthly partitions of `table` covering [start, end],
+    plus a DEFAULT partition for rows outside them. No-op for unpartitioned tables.
+    Rows that already landed in DEFAULT for a new month are moved into it.
+    """
+    cur.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", (table,))
+    if cur.fetchone() is None:
+        return 0
+    
+    cur.execute("""
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+    """, (table,))
+    existing = {r[0] for r in cur.fetchall()}
+    
+    created = 0
+    if f"{table}_default" not in existing:
+        cur.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        created += 1
+    
+    month = _month_start(start)
+    while month <= end:
+        next_month = _month_start(month, 1)
+        name = f"{table}_y{month.year}m{month.month:02d}"
+        if name not in existing:
+            _create_month_partition(cur, table, name, month, next_month)
+            created += 1
+        month = next_month
+    return created
+
+
+def _create_month_partition(cur, table: str, name: str, month: date, next_month: date) -> None:
+    column = PARTITIONED_TABLES[table]
+    default = f"{table}_default"
+    cur.execute(f"SELECT 1 FROM {default} WHERE {column} >= %s AND {column} < %s LIMIT 1",
+                (month, next_month))
+    # Postgres refuses a partition whose range DEFAULT already holds rows for:
+    # detach DEFAULT, create the month, move its rows across, reattach
+    stranded = cur.fetchone() is not None
+    if stranded:
+        cur.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+    
+    cur.execute(
+        f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+        (month, next_month)
+    )
+    
+    if stranded:
+        cur.execute(f"""
+            WITH moved AS (
+                DELETE FROM {default} WHERE {column} >= %s AND {column} < %s RETURNING *
+            )
+            INSERT INTO {table} SELECT * FROM moved
+        """, (month, next_month))
+        logger.warning(f"Moved {cur.rowcount} {table} rows from {default} into {name}")
+        cur.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+
+
+def ensure_partitions(months_ahead: int = PARTITION_MONTHS_AHEAD) -> int:
+    """
+    Create upcoming monthly partitions. Runs from init_database (also when the
+    schema is current) and at API startup; long-running deployments should also
+    run it daily, e.g. `python -m api.database.database` from cron.
+    """
+    end = _month_start(date.today(), months_ahead)
+    created = 0
+    try:
+        with _conn() as conn, conn.cursor() as cur:
+            for table in PARTITIONED_TABLES:
+                created += _create_monthly_partitions(cur, table, date.today(), end)
+            conn.commit()
+        return created
+    except Exception as e:
+        logger.error(f"Failed to create partitions: {e}")
+        return created
+
+
+# Bump whenever init_database's DDL changes so existing databases re-run it
+SCHEMA_VERSION = 3
+
+
+def init_database(force: bool = False):
+    """
+    Initialize all database tables.
+    Skipped when the stored schema version already matches SCHEMA_VERSION
+    (pass force=True to re-run the DDL anyway).
+    """
     conn = get_connection()
     cur = conn.cursor()
     
+    if not force:
+        cur.execute("SELECT to_regclass('_schema_meta') IS NOT NULL")
+        if cur.fetchone()[0]:
+            cur.execute("SELECT version FROM _schema_meta WHERE id = 1")
+            row = cur.fetchone()
+            if row and row[0] == SCHEMA_VERSION:
+                cur.close()
+                conn.close()
+                logger.info(f"Database schema v{SCHEMA_VERSION} already initialized")
+                # The DDL is skipped, but the partitions still have to keep up with the calendar
+                ensure_partitions()
+                return
+    
     # Stock Master - Basic company info
     cur.execute("""
         CREATE TABLE IF NOT EXISTS stock_master (
@@ -48,10 +255,10 @@ def init_database():
         )
     """)
     
-    # Daily Price History
+    # Daily Price History (partitioned by month)
     cur.execute("""
         CREATE TABLE IF NOT EXISTS price_history (
-            id SERIAL PRIMARY KEY,
+            id SERIAL,
             symbol VARCHAR(20) NOT NULL,
             trade_date DATE NOT NULL,
             open_price DECIMAL(12,2),
@@ -61,8 +268,9 @@ def init_database():
             volume BIGINT,
             delivery_pct DECIMAL(6,2),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, trade_date),
             UNIQUE(symbol, trade_date)
-        )
+        ) PARTITION BY RANGE (trade_date)
     """)
     
     # Create index for faster lookups
@@ -91,10 +299,10 @@ def init_database():
         )
     """)
     
-    # Stock Snapshots (daily metrics from IndianAPI)
+    # Stock Snapshots (daily metrics from IndianAPI, partitioned by month)
     cur.execute("""
         CREATE TABLE IF NOT EXISTS stock_snapshots (
-            id SERIAL PRIMARY KEY,
+            id SERIAL,
             symbol VARCHAR(20) NOT NULL,
             snapshot_date DATE NOT NULL,
             price DECIMAL(12,2),
@@ -111,8 +319,16 @@ def init_database():
             source VARCHAR(50) DEFAULT 'IndianAPI',
             raw_data JSONB,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, snapshot_date),
             UNIQUE(symbol, snapshot_date)
-        )
+        ) PARTITION BY RANGE (snapshot_date)
+    """)
+    
+    # Snapshots are appended daily, so a BRIN on the date serves cross-symbol
+    # date-range scans at a fraction of a btree's size
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_snapshots_date_brin 
+        ON stock_snapshots USING BRIN (snapshot_date) WITH (pages_per_range = 32)
     """)
     
     # News Articles
@@ -127,15 +343,40 @@ def init_database():
             published_at TIMESTAMP,
             sentiment_score DECIMAL(4,2),
             embedding_id VARCHAR(100),
+            embedding BYTEA,
+            content_hash CHAR(32) GENERATED ALWAYS AS (MD5(headline || COALESCE(summary, ''))) STORED,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
     
+    # Unit-norm, int8-quantized vector bytes (see embeddings._to_bytes)
+    cur.execute("""
+        ALTER TABLE news_articles 
+        ADD COLUMN IF NOT EXISTS embedding BYTEA
+    """)
+    
+    # Same headline+summary from another source reuses the stored embedding
+    cur.execute("""
+        ALTER TABLE news_articles 
+        ADD COLUMN IF NOT EXISTS content_hash CHAR(32) 
+        GENERATED ALWAYS AS (MD5(headline || COALESCE(summary, ''))) STORED
+    """)
+    
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_news_content_hash 
+        ON news_articles(content_hash) WHERE embedding IS NOT NULL
+    """)
+    
     cur.execute("""
         CREATE INDEX IF NOT EXISTS idx_news_symbol_date 
         ON news_articles(symbol, published_at DESC)
     """)
     
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_news_published_brin 
+        ON news_articles USING BRIN (published_at) WITH (pages_per_range = 32)
+    """)
+    
     # Query History (for learning patterns)
     cur.execute("""
         CREATE TABLE IF NOT EXISTS query_history (
@@ -247,6 +488,24 @@ def init_database():
         )
     """)
     
+    # Trigram indexes let get_knowledge's '%term%' ILIKE avoid a sequential scan.
+    # pg_trgm may be unavailable (or need superuser) on managed databases.
+    cur.execute("SAVEPOINT kb_trgm")
+    try:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_kb_question_trgm 
+            ON knowledge_base USING gin (question gin_trgm_ops)
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_kb_answer_trgm 
+            ON knowledge_base USING gin (answer gin_trgm_ops)
+        """)
+        cur.execute("RELEASE SAVEPOINT kb_trgm")
+    except psycopg2.Error as e:
+        cur.execute("ROLLBACK TO SAVEPOINT kb_trgm")
+        logger.warning(f"pg_trgm unavailable, knowledge search will scan: {e}")
+    
     # Waitlist Signups (for Agentic Assetz waitlist)
     cur.execute("""
         CREATE TABLE IF NOT EXISTS waitlist_signups (
@@ -272,6 +531,23 @@ def init_database():
         ON waitlist_signups(email)
     """)
     
+    # Monthly partitions (tables created before partitioning are left as-is,
+    # see migrate_partition_timeseries.py)
+    for table in PARTITIONED_TABLES:
+        _create_monthly_partitions(cur, table, PARTITION_START, _month_start(date.today(), PARTITION_MONTHS_AHEAD))
+    
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS _schema_meta (
+            id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("""
+        INSERT INTO _schema_meta (id, version) VALUES (1, %s)
+        ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version, updated_at = CURRENT_TIMESTAMP
+    """, (SCHEMA_VERSION,))
+    
     conn.commit()
     cur.close()
     conn.close()
@@ -281,72 +557,217 @@ def init_database():
 
 def _sanitize_text(text: Optional[str]) -> Optional[str]:
     """Remove NUL characters from text to prevent PostgreSQL errors."""
-    if isinstance(text, str):
+    # The membership test is a fast memchr scan; replace() is only paid when a NUL exists
+    if isinstance(text, str) and '\x00' in text:
         return text.replace('\x00', '')
     return text
 
 
-def save_stock_snapshot(data: Dict[str, Any]) -> bool:
-    """Save a stock snapshot from IndianAPI to database."""
+# Multi-row statements: "VALUES %s" takes one row tuple via cur.execute(sql, (row,))
+# or a whole batch via execute_values(cur, sql, rows)
+# (column, SQL type) in _snapshot_row order; the types drive the unnest() casts
+_SNAPSHOT_COLUMN_TYPES = (
+    ("symbol", "varchar"), ("snapshot_date", "date"),
+    ("price", "numeric"), ("change_pct", "numeric"), ("pe_ratio", "numeric"),
+    ("sector_pe", "numeric"), ("market_cap", "numeric"), ("eps_ttm", "numeric"),
+    ("high_52w", "numeric"), ("low_52w", "numeric"), ("beta", "numeric"),
+    ("analyst_score", "numeric"), ("ytd_change", "numeric"), ("book_value", "numeric"),
+    ("dividend_per_share", "numeric"), ("revenue_per_share", "numeric"),
+    ("revenue_growth", "numeric"), ("profit_growth", "numeric"),
+    ("net_margin", "numeric"), ("roe", "numeric"),
+    ("source", "varchar"), ("raw_data", "jsonb"),
+)
+_SNAPSHOT_COLUMNS = ", ".join(col for col, _ in _SNAPSHOT_COLUMN_TYPES)
+_SNAPSHOT_UPDATED = [col for col, _ in _SNAPSHOT_COLUMN_TYPES if col not in ("symbol", "snapshot_date", "source")]
+_SNAPSHOT_ON_CONFLICT = (
+    f"ON CONFLICT (symbol, snapshot_date) DO UPDATE SET ({', '.join(_SNAPSHOT_UPDATED)}) = "
+    f"ROW({', '.join('EXCLUDED.' + col for col in _SNAPSHOT_UPDATED)})"
+)
+
+_SNAPSHOT_UPSERT = f"INSERT INTO stock_snapshots ({_SNAPSHOT_COLUMNS}) VALUES %s {_SNAPSHOT_ON_CONFLICT}"
+
+# Column-wise variant: one array parameter per column, so a batch of any size is
+# a single short statement
+_SNAPSHOT_UNNEST_UPSERT = (
+    f"INSERT INTO stock_snapshots ({_SNAPSHOT_COLUMNS}) "
+    f"SELECT * FROM unnest({', '.join(f'%s::{sql_type}[]' for _, sql_type in _SNAPSHOT_COLUMN_TYPES)}) "
+    f"{_SNAPSHOT_ON_CONFLICT}"
+)
+
+_NEWS_INSERT = """
+    INSERT INTO news_articles 
+    (symbol, headline, summary, source, url, published_at)
+    VALUES %s
+    ON CONFLICT DO NOTHING
+"""
+
+_FILING_INSERT = """
+    INSERT INTO corporate_filings 
+    (symbol, title, doc_type, url, doc_date)
+    VALUES %s
+    ON CONFLICT (symbol, url) DO NOTHING
+"""
+
+
+# Historical reads (trade_date formatted in SQL; ORDER BY the column, not the text alias)
+_HISTORICAL_PRICES_SELECT = """
+    SELECT to_char(trade_date, 'YYYY-MM-DD') AS trade_date,
+           price, dma_50, dma_200, volume, delivery_pct
+    FROM historical_prices 
+    WHERE symbol = %s AND trade_date >= (CURRENT_DATE - make_interval(days := %s))
+    ORDER BY historical_prices.trade_date ASC
+"""
+
+_HISTORICAL_VALUATIONS_SELECT = """
+    SELECT to_char(trade_date, 'YYYY-MM-DD') AS trade_date,
+           pe_ratio, eps, sector_pe
+    FROM historical_valuations
+    WHERE symbol = %s AND trade_date >= (CURRENT_DATE - make_interval(days := %s))
+    ORDER BY historical_valuations.trade_date ASC
+"""
+
+
+# Hot single-row statements (plain %s placeholders), PREPAREd once per connection
+# and then run by name
+_PREPARED = {
+    "save_snapshot_stmt": _SNAPSHOT_UPSERT.replace("VALUES %s", "VALUES (" + ", ".join(["%s"] * len(_SNAPSHOT_COLUMN_TYPES)) + ")"),
+    "save_news_stmt": _NEWS_INSERT.replace("VALUES %s", "VALUES (%s, %s, %s, %s, %s, %s)"),
+    "concall_urls_stmt": "SELECT url FROM concalls WHERE url = ANY(%s)",
+    "historical_prices_stmt": _HISTORICAL_PRICES_SELECT,
+    "historical_valuations_stmt": _HISTORICAL_VALUATIONS_SELECT,
+}
+_prepared_by_conn: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _execute_prepared(cur, name: str, params: tuple):
+    """Run a statement from _PREPARED, preparing it first if this connection hasn't."""
+    sql = _PREPARED[name]
+    if not DB_PREPARED_STATEMENTS:
+        cur.execute(sql, params)
+        return
+    prepared = _prepared_by_conn.setdefault(cur.connection, set())
+    if name not in prepared:
+        parts = sql.split("%s")
+        cur.execute(f"PREPARE {name} AS " + parts[0] + "".join(f"${i}{part}" for i, part in enumerate(parts[1:], 1)))
+        prepared.add(name)
+    cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+
+def _snapshot_row(data: Dict[str, Any]) -> tuple:
+    return (
+        data.get("ticker"),
+        date.today(),
+        data.get("price"),
+        data.get("change_pct"),
+        data.get("pe_ratio"),
+        data.get("sector_pe"),
+        data.get("market_cap"),
+        data.get("eps_ttm"),
+        data.get("high_52w"),
+        data.get("low_52w"),
+        data.get("beta"),
+        data.get("analyst_score"),
+        data.get("ytd_change"),
+        data.get("book_value"),
+        data.get("dividend_per_share"),
+        data.get("revenue_per_share"),
+        data.get("revenue_growth"),
+        data.get("profit_growth"),
+        data.get("net_margin"),
+        data.get("roe"),
+        data.get("source", "IndianAPI"),
+        _json(data)
+    )
+
+
+def _news_row(symbol: str, article: Dict[str, Any]) -> tuple:
+    return (
+        symbol,
+        _sanitize_text(article.get("headline")),
+        _sanitize_text(article.get("summary")),
+        "LiveMint",  # IndianAPI sources from LiveMint
+        article.get("url"),
+        article.get("date")
+    )
+
+
+def _filing_row(symbol: str, filing: Dict[str, Any]) -> tuple:
+    return (
+        symbol,
+        _sanitize_text(filing.get("title")),
+        filing.get("type"),
+        filing.get("url"),
+        filing.get("date")
+    )
+
+
+def _dedupe_rows(rows: List[tuple], key_cols: tuple) -> List[tuple]:
+    """
+    Keep the last row per conflict key. A single multi-row upsert may not touch
+    the same row twice, and last-wins matches saving the rows one by one.
+    """
+    return list({tuple(row[i] for i in key_cols): row for row in rows}.values())
+
+
+def _save_bulk(sql: str, rows: List[tuple], label: str, page_size: int) -> int:
+    """
+    Send rows as multi-row INSERTs (page_size rows per statement) in one transaction.
+    Returns the number of rows written; rows skipped by ON CONFLICT DO NOTHING don't count.
+    """
+    if not rows:
+        return 0
     try:
-        conn = get_connection()
-        cur = conn.cursor()
+        with _conn() as conn, conn.cursor() as cur:
+            # cur.rowcount only covers the last page, so count the RETURNING rows instead
+            written = execute_values(cur, sql + " RETURNING 1", rows, page_size=page_size, fetch=True)
+            conn.commit()
+        return len(written)
         
-        cur.execute("""
-            INSERT INTO stock_snapshots 
-            (symbol, snapshot_date, price, change_pct, pe_ratio, sector_pe, 
-             market_cap, eps_ttm, high_52w, low_52w, beta, analyst_score, 
-             ytd_change, book_value, dividend_per_share, revenue_per_share,
-             revenue_growth, profit_growth, net_margin, roe, source, raw_data)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (symbol, snapshot_date) DO UPDATE SET
-                price = EXCLUDED.price,
-                change_pct = EXCLUDED.change_pct,
-                pe_ratio = EXCLUDED.pe_ratio,
-                sector_pe = EXCLUDED.sector_pe,
-                market_cap = EXCLUDED.market_cap,
-                eps_ttm = EXCLUDED.eps_ttm,
-                high_52w = EXCLUDED.high_52w,
-                low_52w = EXCLUDED.low_52w,
-                beta = EXCLUDED.beta,
-                analyst_score = EXCLUDED.analyst_score,
-                ytd_change = EXCLUDED.ytd_change,
-                book_value = EXCLUDED.book_value,
-                dividend_per_share = EXCLUDED.dividend_per_share,
-                revenue_per_share = EXCLUDED.revenue_per_share,
-                revenue_growth = EXCLUDED.revenue_growth,
-                profit_growth = EXCLUDED.profit_growth,
-                net_margin = EXCLUDED.net_margin,
-                roe = EXCLUDED.roe,
-                raw_data = EXCLUDED.raw_data
-        """, (
-            data.get("ticker"),
-            date.today(),
-            data.get("price"),
-            data.get("change_pct"),
-            data.get("pe_ratio"),
-            data.get("sector_pe"),
-            data.get("market_cap"),
-            data.get("eps_ttm"),
-            data.get("high_52w"),
-            data.get("low_52w"),
-            data.get("beta"),
-            data.get("analyst_score"),
-            data.get("ytd_change"),
-            data.get("book_value"),
-            data.get("dividend_per_share"),
-            data.get("revenue_per_share"),
-            data.get("revenue_growth"),
-            data.get("profit_growth"),
-            data.get("net_margin"),
-            data.get("roe"),
-            data.get("source", "IndianAPI"),
-            psycopg2.extras.Json(data)
-        ))
+    except Exception as e:
+        logger.error(f"Failed to bulk save {label}: {e}")
+        return 0
+
+
+def _csv_field(value: Any) -> str:
+    """One COPY CSV field: NULL stays unquoted-empty, everything else is quoted."""
+    if value is None:
+        return ""
+    if isinstance(value, psycopg2.extras.Json):
+        value = value.dumps(value.adapted)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_upsert(table: str, columns: str, on_conflict: str,
+                 rows: List[tuple], label: str) -> int:
+    """
+    COPY rows into a temp staging table, then upsert them into `table` with
+    INSERT ... SELECT. COPY skips per-row parse/plan; the INSERT keeps ON CONFLICT.
+    """
+    if not rows:
+        return 0
+    try:
+        with _conn() as conn, conn.cursor() as cur:
+            stage = f"{table}_stage"
+            cur.execute(f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA")
+            buf = io.StringIO()
+            buf.writelines(",".join(_csv_field(v) for v in row) + "\n" for row in rows)
+            buf.seek(0)
+            cur.copy_expert(f"COPY {stage} ({columns}) FROM STDIN WITH (FORMAT CSV)", buf)
+            cur.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage} {on_conflict}")
+            conn.commit()
+        return len(rows)
         
-        conn.commit()
-        cur.close()
-        conn.close()
+    except Exception as e:
+        logger.error(f"Failed to bulk copy {label}: {e}")
+        return 0
+
+
+def save_stock_snapshot(data: Dict[str, Any]) -> bool:
+    """Save a stock snapshot from IndianAPI to database."""
+    try:
+        with _conn() as conn, conn.cursor() as cur:
+            _execute_prepared(cur, "save_snapshot_stmt", _snapshot_row(data))
+            conn.commit()
         return True
         
     except Exception as e:
@@ -354,29 +775,33 @@ def save_stock_snapshot(data: Dict[str, Any]) -> bool:
         return False
 
 
+def save_stock_snapshots_bulk(snapshots: List[Dict[str, Any]], page_size: int = 500) -> int:
+    """
+    Save many stock snapshots, page_size rows per column-wise unnest() upsert.
+    Returns the number of rows sent.
+    """
+    rows = _dedupe_rows([_snapshot_row(data) for data in snapshots], (0, 1))
+    if not rows:
+        return 0
+    try:
+        with _conn() as conn, conn.cursor() as cur:
+            for start in range(0, len(rows), page_size):
+                columns = zip(*rows[start:start + page_size])
+                cur.execute(_SNAPSHOT_UNNEST_UPSERT, [list(column) for column in columns])
+            conn.commit()
+        return len(rows)
+        
+    except Exception as e:
+        logger.error(f"Failed to bulk save snapshots: {e}")
+        return 0
+
+
 def save_news_article(symbol: str, article: Dict[str, Any]) -> bool:
     """Save a news article to database."""
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            INSERT INTO news_articles 
-            (symbol, headline, summary, source, url, published_at)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT DO NOTHING
-        """, (
-            symbol,
-            _sanitize_text(article.get("headline")),
-            _sanitize_text(article.get("summary")),
-            "LiveMint",  # IndianAPI sources from LiveMint
-            article.get("url"),
-            article.get("date")
-        ))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+        with _conn() as conn, conn.cursor() as cur:
+            _execute_prepared(cur, "save_news_stmt", _news_row(symbol, article))
+            conn.commit()
         return True
         
     except Exception as e:
@@ -384,28 +809,18 @@ def save_news_article(symbol: str, article: Dict[str, Any]) -> bool:
         return False
 
 
+def save_news_articles_bulk(symbol: str, articles: List[Dict[str, Any]], page_size: int = 500) -> int:
+    """Save many news articles for a symbol in batched INSERTs. Returns the number of new rows inserted."""
+    rows = [_news_row(symbol, article) for article in articles]
+    return _save_bulk(_NEWS_INSERT, rows, "news", page_size)
+
+
 def save_corporate_filing(symbol: str, filing: Dict[str, Any]) -> bool:
     """Save a corporate filing to database."""
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            INSERT INTO corporate_filings 
-            (symbol, title, doc_type, url, doc_date)
-            VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (symbol, url) DO NOTHING
-        """, (
-            symbol,
-            _sanitize_text(filing.get("title")),
-            filing.get("type"),
-            filing.get("url"),
-            filing.get("date")
-        ))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute(_FILING_INSERT, (_filing_row(symbol, filing),))
+            conn.commit()
         return True
         
     except Exception as e:
@@ -413,22 +828,23 @@ def save_corporate_filing(symbol: str, filing: Dict[str, Any]) -> bool:
         return False
 
 
+def save_corporate_filings_bulk(symbol: str, filings: List[Dict[str, Any]], page_size: int = 500) -> int:
+    """Save many corporate filings for a symbol in batched INSERTs. Returns the number of new rows inserted."""
+    rows = [_filing_row(symbol, filing) for filing in filings]
+    return _save_bulk(_FILING_INSERT, rows, "filings", page_size)
+
+
 def save_query_history(query: str, symbols: List[str], intent: str, 
                        response: str, processing_time: int) -> bool:
     """Save query history for learning."""
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            INSERT INTO query_history 
-            (query, symbols, intent, response, processing_time_ms)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (query, symbols, intent, response, processing_time))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO query_history 
+                (query, symbols, intent, response, processing_time_ms)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (query, symbols, intent, response, processing_time))
+            conn.commit()
         return True
         
     except Exception as e:
@@ -439,20 +855,16 @@ def save_query_history(query: str, symbols: List[str], intent: str,
 def get_historical_snapshots(symbol: str, days: int = 30) -> List[Dict]:
     """Get historical snapshots for a symbol."""
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute("""
-            SELECT * FROM stock_snapshots 
-            WHERE symbol = %s 
-            ORDER BY snapshot_date DESC 
-            LIMIT %s
-        """, (symbol, days))
-        
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        return [dict(row) for row in rows]
+        with _conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT * FROM stock_snapshots 
+                WHERE symbol = %s 
+                ORDER BY snapshot_date DESC 
+                LIMIT %s
+            """, (symbol, days))
+            # RealDictRow is already a dict, so rows are returned without a per-row copy
+            rows = cur.fetchall()
+        return rows
         
     except Exception as e:
         logger.error(f"Failed to get snapshots: {e}")
@@ -462,21 +874,16 @@ def get_historical_snapshots(symbol: str, days: int = 30) -> List[Dict]:
 def get_recent_news(symbol: str, limit: int = 10) -> List[Dict]:
     """Get recent news for a symbol."""
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute("""
-            SELECT headline, summary, published_at, url 
-            FROM news_articles 
-            WHERE symbol = %s 
-            ORDER BY published_at DESC 
-            LIMIT %s
-        """, (symbol, limit))
-        
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        return [dict(row) for row in rows]
+        with _conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT headline, summary, published_at, url 
+                FROM news_articles 
+                WHERE symbol = %s 
+                ORDER BY published_at DESC 
+                LIMIT %s
+            """, (symbol, limit))
+            rows = cur.fetchall()
+        return rows
         
     except Exception as e:
         logger.error(f"Failed to get news: {e}")
@@ -486,157 +893,210 @@ def get_recent_news(symbol: str, limit: int = 10) -> List[Dict]:
 def get_corporate_filings(symbol: str, limit: int = 5) -> List[Dict]:
     """Get recent corporate filings for a symbol."""
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute("""
-            SELECT title, doc_type, url, doc_date 
-            FROM corporate_filings 
-            WHERE symbol = %s 
-            ORDER BY doc_date DESC 
-            LIMIT %s
-        """, (symbol, limit))
-        
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        
-        # Format dates
-        results = []
-        for row in rows:
-            r = dict(row)
-            if isinstance(r.get('doc_date'), (date, datetime)):
-                r['doc_date'] = str(r['doc_date'])
-            results.append(r)
-            
-        return results
+        with _conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT title, doc_type, url, to_char(doc_date, 'YYYY-MM-DD') AS doc_date 
+                FROM corporate_filings 
+                WHERE symbol = %s 
+                ORDER BY corporate_filings.doc_date DESC 
+                LIMIT %s
+            """, (symbol, limit))
+            # Dates come back formatted from to_char()
+            rows = cur.fetchall()
+        return rows
         
     except Exception as e:
         logger.error(f"Failed to get filings: {e}")
         return []
 
 
-def save_concall(symbol: str, concall: Dict[str, Any]) -> bool:
-    """Save an earnings call transcript to database."""
+@dataclass(slots=True)
+class AnnualReportRecord:
+    """One annual report to save; accepted wherever an annual report dict is."""
+    fiscal_year: str
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    key_metrics: Dict[str, Any] = field(default_factory=dict)
+    chairman_letter: Optional[str] = None
+    nuanced_summary: Optional[str] = None
+    url: Optional[str] = None
+    source: str = "Trendlyne"
+    report_date: Optional[date] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # dict-style access, so the row builders take records and dicts alike
+        return getattr(self, key, default)
+
+
+@dataclass(slots=True)
+class ConcallRecord:
+    """One earnings call document to save; accepted wherever a concall dict is."""
+    quarter: str
+    fiscal_year: str
+    title: Optional[str] = None
+    transcript: Optional[str] = None
+    key_highlights: Optional[str] = None
+    management_guidance: Optional[str] = None
+    nuanced_summary: Optional[str] = None
+    url: Optional[str] = None
+    source: str = "Trendlyne"
+    call_date: Optional[date] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+_CONCALL_COLUMNS = """symbol, quarter, fiscal_year, call_date, title, transcript, 
+     key_highlights, management_guidance, nuanced_summary, url, source"""
+
+_CONCALL_ON_CONFLICT = """
+    ON CONFLICT (url) DO UPDATE SET
+        transcript = EXCLUDED.transcript,
+        key_highlights = EXCLUDED.key_highlights,
+        management_guidance = EXCLUDED.management_guidance,
+        nuanced_summary = EXCLUDED.nuanced_summary,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_CONCALL_UPSERT = f"INSERT INTO concalls ({_CONCALL_COLUMNS}) VALUES %s {_CONCALL_ON_CONFLICT}"
+
+
+def _concall_row(symbol: str, concall: Union[Dict[str, Any], ConcallRecord]) -> tuple:
+    return (
+        symbol,
+        concall.get("quarter"),
+        concall.get("fiscal_year"),
+        concall.get("call_date"),
+        _sanitize_text(concall.get("title")),
+        _sanitize_text(concall.get("transcript")),
+        _sanitize_text(concall.get("key_highlights")),
+        _sanitize_text(concall.get("management_guidance")),
+        _sanitize_text(concall.get("nuanced_summary")),
+        concall.get("url"),
+        concall.get("source", "Trendlyne")
+    )
+
+
+def upsert_concall(symbol: str, concall: Union[Dict[str, Any], ConcallRecord]) -> Optional[bool]:
+    """
+    Save an earnings call transcript in one statement.
+    Returns True if a new row was inserted, False if an existing URL was updated,
+    None on failure, so write paths need no separate existence check.
+    """
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            INSERT INTO concalls (symbol, quarter, fiscal_year, call_date, title, transcript, 
-             key_highlights, management_guidance, nuanced_summary, url, source)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (url) DO UPDATE SET
-                transcript = EXCLUDED.transcript,
-                key_highlights = EXCLUDED.key_highlights,
-                management_guidance = EXCLUDED.management_guidance,
-                nuanced_summary = EXCLUDED.nuanced_summary,
-                updated_at = CURRENT_TIMESTAMP
-        """, (
-            symbol,
-            concall.get("quarter"),
-            concall.get("fiscal_year"),
-            concall.get("call_date"),
-            _sanitize_text(concall.get("title")),
-            _sanitize_text(concall.get("transcript")),
-            _sanitize_text(concall.get("key_highlights")),
-            _sanitize_text(concall.get("management_guidance")),
-            _sanitize_text(concall.get("nuanced_summary")),
-            concall.get("url"),
-            concall.get("source", "Trendlyne")
-        ))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
-        return True
+        with _conn() as conn, conn.cursor() as cur:
+            # xmax is 0 only for freshly inserted tuples
+            cur.execute(_CONCALL_UPSERT + " RETURNING (xmax = 0)", (_concall_row(symbol, concall),))
+            inserted = cur.fetchone()[0]
+            conn.commit()
+        return inserted
         
     except Exception as e:
         logger.error(f"Failed to save concall: {e}")
-        return False
+        return None
 
 
-def concall_exists(symbol: str, quarter: str, fiscal_year: str) -> bool:
-    """Check if a concall already exists in the database."""
+def save_concall(symbol: str, concall: Union[Dict[str, Any], ConcallRecord]) -> bool:
+    """Save an earnings call transcript to database."""
+    return upsert_concall(symbol, concall) is not None
+
+
+def save_concalls_bulk(symbol: str, concalls: List[Dict[str, Any]], page_size: int = 50) -> int:
+    """
+    Save many earnings call transcripts for a symbol in batched upserts.
+    Transcripts are large, so pages are kept small. Returns the number of rows inserted or updated.
+    """
+    rows = _dedupe_rows([_concall_row(symbol, concall) for concall in concalls], (9,))
+    return _save_bulk(_CONCALL_UPSERT, rows, "concalls", page_size)
+
+
+def bulk_copy_concalls(symbol: str, concalls: List[Dict[str, Any]]) -> int:
+    """
+    Load many transcripts for a symbol via COPY into a staging table, then upsert.
+    Faster than save_concalls_bulk for large transcript backfills. Returns the number of rows sent.
+    """
+    rows = _dedupe_rows([_concall_row(symbol, concall) for concall in concalls], (9,))
+    return _copy_upsert("concalls", _CONCALL_COLUMNS, _CONCALL_ON_CONFLICT, rows, "concalls")
+
+
+def concalls_existing(keys: List[tuple]) -> set:
+    """Return the subset of (symbol, quarter, fiscal_year) keys already stored, in one query."""
+    keys = list(keys)
+    if not keys:
+        return set()
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT 1 FROM concalls WHERE symbol = %s AND quarter = %s AND fiscal_year = %s",
-            (symbol, quarter, fiscal_year)
-        )
-        exists = cur.fetchone() is not None
-        cur.close()
-        conn.close()
-        return exists
+        with _conn() as conn, conn.cursor() as cur:
+            rows = execute_values(
+                cur,
+                "SELECT symbol, quarter, fiscal_year FROM concalls "
+                "WHERE (symbol, quarter, fiscal_year) IN (VALUES %s)",
+                keys, fetch=True
+            )
+        return {tuple(r) for r in rows}
     except Exception as e:
         logger.error(f"Error checking concall existence: {e}")
-        return False
+        return set()
 
 
-def concall_url_exists(url: str) -> bool:
-    """Check if a concall URL already exists in the database."""
+def concall_urls_existing(urls: List[str]) -> set:
+    """Return the subset of concall URLs already stored, in one query."""
+    urls = list(urls)
+    if not urls:
+        return set()
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT 1 FROM concalls WHERE url = %s", (url,))
-        exists = cur.fetchone() is not None
-        cur.close()
-        conn.close()
-        return exists
+        with _conn() as conn, conn.cursor() as cur:
+            _execute_prepared(cur, "concall_urls_stmt", (urls,))
+            return {r[0] for r in cur.fetchall()}
     except Exception as e:
         logger.error(f"Error checking concall URL existence: {e}")
-        return False
+        return set()
+
+
+def concall_exists(symbol: str, quarter: str, fiscal_year: str) -> bool:
+    """Check if a concall already exists in the database."""
+    return bool(concalls_existing([(symbol, quarter, fiscal_year)]))
+
+
+def concall_url_exists(url: str) -> bool:
+    """Check if a concall URL already exists in the database."""
+    return bool(concall_urls_existing([url]))
 
 
 def update_concall_metadata(url: str, quarter: str, fiscal_year: str) -> bool:
     """Update metadata for an existing concall if it is currently null."""
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        # Only update if currently null or 'None'
-        cur.execute("""
-            UPDATE concalls 
-            SET quarter = %s, fiscal_year = %s 
-            WHERE url = %s AND (fiscal_year IS NULL OR fiscal_year = 'None')
-        """, (quarter, fiscal_year, url))
-        
-        updated = cur.rowcount > 0
-        conn.commit()
-        cur.close()
-        conn.close()
+        with _conn() as conn, conn.cursor() as cur:
+            # Only update if currently null or 'None'
+            cur.execute("""
+                UPDATE concalls 
+                SET quarter = %s, fiscal_year = %s 
+                WHERE url = %s AND (fiscal_year IS NULL OR fiscal_year = 'None')
+            """, (quarter, fiscal_year, url))
+            updated = cur.rowcount > 0
+            conn.commit()
         return updated
         return updated
     except UniqueViolation:
         logger.warning(f"Unique constraint violation updating metadata for {url}. Skipping.")
-        conn.rollback() # Important to rollback the transaction
-        cur.close()
-        conn.close()
         return False
     except Exception as e:
         logger.error(f"Error updating concall metadata: {e}")
-        conn.rollback()
-        cur.close()
-        conn.close()
         return False
 
 
 def has_transcript_for_quarter(symbol: str, quarter: str, fiscal_year: str) -> bool:
     """Check if a full transcript (not ai_summary or ppt) already exists for this quarter."""
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        # Non-transcript docs have (ai_summary) or (ppt) in title or specific quarter labels
-        cur.execute("""
-            SELECT 1 FROM concalls 
-            WHERE symbol = %s AND quarter = %s AND fiscal_year = %s
-            AND title NOT LIKE '%%(ai_summary)%%' 
-            AND title NOT LIKE '%%(ppt)%%'
-            AND quarter NOT IN ('Announcement', 'Credit Rating')
-        """, (symbol, quarter, fiscal_year))
-        exists = cur.fetchone() is not None
-        cur.close()
-        conn.close()
+        with _conn() as conn, conn.cursor() as cur:
+            # Non-transcript docs have (ai_summary) or (ppt) in title or specific quarter labels
+            cur.execute("""
+                SELECT 1 FROM concalls 
+                WHERE symbol = %s AND quarter = %s AND fiscal_year = %s
+                AND title NOT LIKE '%%(ai_summary)%%' 
+                AND title NOT LIKE '%%(ppt)%%'
+                AND quarter NOT IN ('Announcement', 'Credit Rating')
+            """, (symbol, quarter, fiscal_year))
+            exists = cur.fetchone() is not None
         return exists
     except Exception as e:
         logger.error(f"Error checking transcript existence: {e}")
@@ -646,134 +1106,150 @@ def has_transcript_for_quarter(symbol: str, quarter: str, fiscal_year: str) -> b
 def get_concalls(symbol: str, limit: int = 8) -> List[Dict]:
     """Get recent earnings call transcripts for a symbol."""
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute("""
-            SELECT quarter, fiscal_year, call_date, title, transcript, 
-                   key_highlights, management_guidance, nuanced_summary, url
-            FROM concalls 
-            WHERE symbol = %s 
-            ORDER BY call_date DESC 
-            LIMIT %s
-        """, (symbol, limit))
-        
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        
-        results = []
-        for row in rows:
-            r = dict(row)
-            if isinstance(r.get('call_date'), (date, datetime)):
-                r['call_date'] = str(r['call_date'])
-            results.append(r)
-            
-        return results
+        with _conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT quarter, fiscal_year, to_char(call_date, 'YYYY-MM-DD') AS call_date, title, transcript, 
+                       key_highlights, management_guidance, nuanced_summary, url
+                FROM concalls 
+                WHERE symbol = %s 
+                ORDER BY concalls.call_date DESC 
+                LIMIT %s
+            """, (symbol, limit))
+            rows = cur.fetchall()
+        return rows
         
     except Exception as e:
         logger.error(f"Failed to get concalls: {e}")
         return []
 
 
-def save_annual_report(symbol: str, report: Dict[str, Any]) -> bool:
-    """Save an annual report to database."""
+_ANNUAL_REPORT_COLUMNS = """symbol, fiscal_year, report_date, title, summary, 
+     key_metrics, chairman_letter, nuanced_summary, url, source"""
+
+_ANNUAL_REPORT_ON_CONFLICT = """
+    ON CONFLICT (symbol, fiscal_year) DO UPDATE SET
+        summary = EXCLUDED.summary,
+        key_metrics = EXCLUDED.key_metrics,
+        chairman_letter = EXCLUDED.chairman_letter,
+        nuanced_summary = EXCLUDED.nuanced_summary
+"""
+
+_ANNUAL_REPORT_UPSERT = (
+    f"INSERT INTO annual_reports ({_ANNUAL_REPORT_COLUMNS}) VALUES %s {_ANNUAL_REPORT_ON_CONFLICT}"
+)
+
+
+def _annual_report_row(symbol: str, report: Union[Dict[str, Any], AnnualReportRecord]) -> tuple:
+    return (
+        symbol,
+        report.get("fiscal_year"),
+        report.get("report_date"),
+        _sanitize_text(report.get("title")),
+        _sanitize_text(report.get("summary")),
+        _json(report.get("key_metrics", {})),
+        _sanitize_text(report.get("chairman_letter")),
+        _sanitize_text(report.get("nuanced_summary")),
+        report.get("url"),
+        report.get("source", "Trendlyne")
+    )
+
+
+def upsert_annual_report(symbol: str, report: Union[Dict[str, Any], AnnualReportRecord]) -> Optional[bool]:
+    """
+    Save an annual report in one statement.
+    Returns True if inserted, False if an existing (symbol, fiscal_year) was updated,
+    None on failure.
+    """
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            INSERT INTO annual_reports (symbol, fiscal_year, report_date, title, summary, 
-             key_metrics, chairman_letter, nuanced_summary, url, source)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (symbol, fiscal_year) DO UPDATE SET
-                summary = EXCLUDED.summary,
-                key_metrics = EXCLUDED.key_metrics,
-                chairman_letter = EXCLUDED.chairman_letter,
-                nuanced_summary = EXCLUDED.nuanced_summary
-        """, (
-            symbol,
-            report.get("fiscal_year"),
-            report.get("report_date"),
-            _sanitize_text(report.get("title")),
-            _sanitize_text(report.get("summary")),
-            psycopg2.extras.Json(report.get("key_metrics", {})),
-            _sanitize_text(report.get("chairman_letter")),
-            _sanitize_text(report.get("nuanced_summary")),
-            report.get("url"),
-            report.get("source", "Trendlyne")
-        ))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
-        return True
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute(_ANNUAL_REPORT_UPSERT + " RETURNING (xmax = 0)", (_annual_report_row(symbol, report),))
+            inserted = cur.fetchone()[0]
+            conn.commit()
+        return inserted
         
     except Exception as e:
         logger.error(f"Failed to save annual report: {e}")
-        return False
+        return None
 
 
-def annual_report_exists(symbol: str, fiscal_year: str) -> bool:
-    """Check if an annual report already exists in the database."""
+def save_annual_report(symbol: str, report: Union[Dict[str, Any], AnnualReportRecord]) -> bool:
+    """Save an annual report to database."""
+    return upsert_annual_report(symbol, report) is not None
+
+
+def save_annual_reports_bulk(symbol: str, reports: List[Dict[str, Any]], page_size: int = 50) -> int:
+    """Save many annual reports for a symbol in batched upserts. Returns the number of rows inserted or updated."""
+    rows = _dedupe_rows([_annual_report_row(symbol, report) for report in reports], (0, 1))
+    return _save_bulk(_ANNUAL_REPORT_UPSERT, rows, "annual reports", page_size)
+
+
+def bulk_copy_annual_reports(symbol: str, reports: List[Dict[str, Any]]) -> int:
+    """
+    Load many annual reports for a symbol via COPY into a staging table, then upsert.
+    Returns the number of rows sent.
+    """
+    rows = _dedupe_rows([_annual_report_row(symbol, report) for report in reports], (0, 1))
+    return _copy_upsert("annual_reports", _ANNUAL_REPORT_COLUMNS, _ANNUAL_REPORT_ON_CONFLICT,
+                        rows, "annual reports")
+
+
+def annual_reports_existing(keys: List[tuple]) -> set:
+    """Return the subset of (symbol, fiscal_year) keys already stored, in one query."""
+    keys = list(keys)
+    if not keys:
+        return set()
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT 1 FROM annual_reports WHERE symbol = %s AND fiscal_year = %s",
-            (symbol, fiscal_year)
-        )
-        exists = cur.fetchone() is not None
-        cur.close()
-        conn.close()
-        return exists
+        with _conn() as conn, conn.cursor() as cur:
+            rows = execute_values(
+                cur,
+                "SELECT symbol, fiscal_year FROM annual_reports "
+                "WHERE (symbol, fiscal_year) IN (VALUES %s)",
+                keys, fetch=True
+            )
+        return {tuple(r) for r in rows}
     except Exception as e:
         logger.error(f"Error checking annual report existence: {e}")
-        return False
+        return set()
 
 
-def annual_report_url_exists(url: str) -> bool:
-    """Check if an annual report URL already exists in the database."""
+def annual_report_urls_existing(urls: List[str]) -> set:
+    """Return the subset of annual report URLs already stored, in one query."""
+    urls = list(urls)
+    if not urls:
+        return set()
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT 1 FROM annual_reports WHERE url = %s", (url,))
-        exists = cur.fetchone() is not None
-        cur.close()
-        conn.close()
-        return exists
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT url FROM annual_reports WHERE url = ANY(%s)", (urls,))
+            return {r[0] for r in cur.fetchall()}
     except Exception as e:
         logger.error(f"Error checking annual report URL existence: {e}")
-        return False
+        return set()
+
+
+def annual_report_exists(symbol: str, fiscal_year: str) -> bool:
+    """Check if an annual report already exists in the database."""
+    return bool(annual_reports_existing([(symbol, fiscal_year)]))
+
+
+def annual_report_url_exists(url: str) -> bool:
+    """Check if an annual report URL already exists in the database."""
+    return bool(annual_report_urls_existing([url]))
 
 
 def get_annual_reports(symbol: str, limit: int = 3) -> List[Dict]:
     """Get recent annual reports for a symbol."""
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute("""
-            SELECT fiscal_year, report_date, title, summary, 
-                   key_metrics, chairman_letter, nuanced_summary, url
-            FROM annual_reports 
-            WHERE symbol = %s 
-            ORDER BY fiscal_year DESC 
-            LIMIT %s
-        """, (symbol, limit))
-        
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        
-        results = []
-        for row in rows:
-            r = dict(row)
-            if isinstance(r.get('report_date'), (date, datetime)):
-                r['report_date'] = str(r['report_date'])
-            results.append(r)
-            
-        return results
+        with _conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT fiscal_year, to_char(report_date, 'YYYY-MM-DD') AS report_date, title, summary, 
+                       key_metrics, chairman_letter, nuanced_summary, url
+                FROM annual_reports 
+                WHERE symbol = %s 
+                ORDER BY fiscal_year DESC 
+                LIMIT %s
+            """, (symbol, limit))
+            rows = cur.fetchall()
+        return rows
         
     except Exception as e:
         logger.error(f"Failed to get annual reports: {e}")
@@ -786,17 +1262,13 @@ def get_stock_coverage(symbol: str) -> Dict[str, int]:
     Returns: {'annual_reports': int, 'concalls': int}
     """
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("SELECT COUNT(*) FROM annual_reports WHERE symbol = %s", (symbol,))
-        ar_count = cur.fetchone()[0]
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT (SELECT COUNT(*) FROM annual_reports WHERE symbol = %(symbol)s),
+                       (SELECT COUNT(*) FROM concalls WHERE symbol = %(symbol)s)
+            """, {"symbol": symbol})
+            ar_count, concall_count = cur.fetchone()
         
-        cur.execute("SELECT COUNT(*) FROM concalls WHERE symbol = %s", (symbol,))
-        concall_count = cur.fetchone()[0]
-        
-        cur.close()
-        conn.close()
         return {'annual_reports': ar_count, 'concalls': concall_count}
         
     except Exception as e:
@@ -804,99 +1276,147 @@ def get_stock_coverage(symbol: str) -> Dict[str, int]:
         return {'annual_reports': 0, 'concalls': 0}
 
 
-def save_knowledge(topic: str, question: str, answer: str) -> bool:
-    """Save a knowledge base item."""
+def get_stock_coverage_bulk(symbols: List[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Get coverage counts for many stocks in one query.
+    Returns: {symbol: {'annual_reports': int, 'concalls': int}}
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
     try:
-        conn = get_connection()
-        cur = conn.cursor()
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT s.symbol,
+                       (SELECT COUNT(*) FROM annual_reports a WHERE a.symbol = s.symbol),
+                       (SELECT COUNT(*) FROM concalls c WHERE c.symbol = s.symbol)
+                FROM unnest(%s::varchar[]) AS s(symbol)
+            """, (symbols,))
+            rows = cur.fetchall()
         
-        cur.execute("""
-            INSERT INTO knowledge_base (topic, question, answer)
-            VALUES (%s, %s, %s)
-        """, (topic, question, answer))
+        return {sym: {'annual_reports': ar, 'concalls': cc} for sym, ar, cc in rows}
         
-        conn.commit()
-        cur.close()
-        conn.close()
+    except Exception as e:
+        logger.error(f"Failed to get stock coverage: {e}")
+        return {sym: {'annual_reports': 0, 'concalls': 0} for sym in symbols}
+
+
+def save_knowledge(topic: str, question: str, answer: str) -> bool:
+    """Save a knowledge base item."""
+    try:
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO knowledge_base (topic, question, answer)
+                VALUES (%s, %s, %s)
+            """, (topic, question, answer))
+            conn.commit()
         return True
     except Exception as e:
         logger.error(f"Failed to save knowledge: {e}")
         return False
 
 
+# Cleared once similarity() turns out to be missing (pg_trgm not installed)
+_kb_similarity = True
+
+
 def get_knowledge(query: str, limit: int = 3) -> List[Dict]:
     """
     Get relevant knowledge items. 
     (Currently simple search, can be upgraded to vector search later)
     """
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Simple keyword search for now
-        cur.execute("""
-            SELECT topic, question, answer 
-            FROM knowledge_base 
-            WHERE question ILIKE %s OR answer ILIKE %s
-            LIMIT %s
-        """, (f'%{query}%', f'%{query}%', limit))
-        
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        return [dict(row) for row in rows]
+        with _conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # Keyword search served by the trigram indexes, best question match first
+            global _kb_similarity
+            pattern = f'%{query}%'
+            if _kb_similarity:
+                try:
+                    cur.execute("""
+                        SELECT topic, question, answer 
+                        FROM knowledge_base 
+                        WHERE question ILIKE %s OR answer ILIKE %s
+                        ORDER BY similarity(question, %s) DESC
+                        LIMIT %s
+                    """, (pattern, pattern, query, limit))
+                except UndefinedFunction:
+                    # pg_trgm not installed; stop asking for similarity()
+                    conn.rollback()
+                    _kb_similarity = False
+            if not _kb_similarity:
+                cur.execute("""
+                    SELECT topic, question, answer 
+                    FROM knowledge_base 
+                    WHERE question ILIKE %s OR answer ILIKE %s
+                    LIMIT %s
+                """, (pattern, pattern, limit))
+            rows = cur.fetchall()
+        return rows
     except Exception as e:
         logger.error(f"Failed to get knowledge: {e}")
         return []
 
 
+# Scalar subqueries shaping a symbol's price / valuation series as JSON arrays
+# (params: %(symbol)s, %(years)s). Zero is mapped to NULL; numeric scale is kept,
+# so values decode as floats.
+_PRICE_SERIES_JSON = """
+    (SELECT COALESCE(json_agg(json_build_object(
+                'date', to_char(trade_date, 'YYYY-MM-DD'),
+                'price', NULLIF(price, 0),
+                'dma50', NULLIF(dma_50, 0),
+                'dma200', NULLIF(dma_200, 0)
+            ) ORDER BY trade_date), '[]'::json)
+     FROM historical_prices 
+     WHERE symbol = %(symbol)s AND trade_date >= CURRENT_DATE - make_interval(years => %(years)s))
+"""
+
+_VALUATION_SERIES_JSON = """
+    (SELECT COALESCE(json_agg(json_build_object(
+                'date', to_char(trade_date, 'YYYY-MM-DD'),
+                'pe', NULLIF(pe_ratio, 0),
+                'eps', NULLIF(eps, 0)
+            ) ORDER BY trade_date), '[]'::json)
+     FROM historical_valuations 
+     WHERE symbol = %(symbol)s AND trade_date >= CURRENT_DATE - make_interval(years => %(years)s))
+"""
+
+
+# Long-term trend between the first and last price rows of the same window;
+# NULL unless both end prices are positive and the dates differ
+_LONG_TERM_TREND_JSON = """
+    (SELECT CASE WHEN f.price > 0 AND l.price > 0 AND l.trade_date > f.trade_date THEN
+            json_build_object(
+                'start_price', round(f.price, 2),
+                'start_date', to_char(f.trade_date, 'YYYY-MM-DD'),
+                'end_price', round(l.price, 2),
+                'end_date', to_char(l.trade_date, 'YYYY-MM-DD'),
+                'change_pct_total', round((l.price - f.price) / f.price * 100, 2),
+                'years', round((l.trade_date - f.trade_date) / 365.25, 1),
+                'cagr_10yr', round(((power(l.price::float8 / f.price::float8,
+                                           365.25 / (l.trade_date - f.trade_date)) - 1) * 100)::numeric, 2)
+            ) END
+     FROM (SELECT trade_date, price FROM historical_prices
+           WHERE symbol = %(symbol)s AND trade_date >= CURRENT_DATE - make_interval(years => %(years)s)
+           ORDER BY trade_date ASC LIMIT 1) f,
+          (SELECT trade_date, price FROM historical_prices
+           WHERE symbol = %(symbol)s AND trade_date >= CURRENT_DATE - make_interval(years => %(years)s)
+           ORDER BY trade_date DESC LIMIT 1) l)
+"""
+
+
 def get_stock_history(symbol: str, years: int = 5) -> Dict[str, List]:
     """
     Get long-term historical data for a symbol.
     Returns dictionaries of list of prices and valuations.
     """
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Get historical prices
-        cur.execute("""
-            SELECT trade_date, price, dma_50, dma_200, volume 
-            FROM historical_prices 
-            WHERE symbol = %s AND trade_date >= (CURRENT_DATE - INTERVAL '%s years')
-            ORDER BY trade_date ASC
-        """, (symbol, years))
-        price_rows = cur.fetchall()
-        
-        # Get historical valuations
-        cur.execute("""
-            SELECT trade_date, pe_ratio, eps 
-            FROM historical_valuations 
-            WHERE symbol = %s AND trade_date >= (CURRENT_DATE - INTERVAL '%s years')
-            ORDER BY trade_date ASC
-        """, (symbol, years))
-        valuation_rows = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        # Format for context
-        prices = []
-        for row in price_rows:
-            prices.append({
-                "date": str(row['trade_date']),
-                "price": float(row['price']) if row['price'] else None,
-                "dma50": float(row['dma_50']) if row['dma_50'] else None,
-                "dma200": float(row['dma_200']) if row['dma_200'] else None
-            })
-            
-        valuations = []
-        for row in valuation_rows:
-            valuations.append({
-                "date": str(row['trade_date']),
-                "pe": float(row['pe_ratio']) if row['pe_ratio'] else None,
-                "eps": float(row['eps']) if row['eps'] else None
-            })
+        with _conn() as conn, conn.cursor() as cur:
+            # Both series are shaped into JSON arrays server-side (one row, one
+            # roundtrip) and decoded straight into lists of dicts
+            cur.execute(f"SELECT {_PRICE_SERIES_JSON}, {_VALUATION_SERIES_JSON}",
+                        {"symbol": symbol, "years": years})
+            prices, valuations = cur.fetchone()
             
         return {
             "prices": prices,
@@ -919,8 +1439,29 @@ def get_stock_context_from_db(symbol: str) -> Dict[str, Any]:
         "trend": None
     }
     
+    # Snapshots, 10-year history (with its CAGR summary) and news as JSON in a
+    # single roundtrip
+    history = {"prices": [], "valuations": [], "years_requested": 10}
+    snapshots, news, long_term_trend = [], [], None
+    try:
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT
+                    (SELECT COALESCE(json_agg(s ORDER BY s.snapshot_date DESC), '[]'::json)
+                     FROM (SELECT * FROM stock_snapshots WHERE symbol = %(symbol)s
+                           ORDER BY snapshot_date DESC LIMIT 7) s),
+                    {_PRICE_SERIES_JSON},
+                    {_VALUATION_SERIES_JSON},
+                    {_LONG_TERM_TREND_JSON},
+                    (SELECT COALESCE(json_agg(n ORDER BY n.published_at DESC), '[]'::json)
+                     FROM (SELECT headline, summary, published_at, url FROM news_articles
+                           WHERE symbol = %(symbol)s ORDER BY published_at DESC LIMIT 5) n)
+            """, {"symbol": symbol, "years": 10})
+            snapshots, history["prices"], history["valuations"], long_term_trend, news = cur.fetchone()
+    except Exception as e:
+        logger.error(f"Failed to get stock context: {e}")
+    
     # Get recent snapshots
-    snapshots = get_historical_snapshots(symbol, 7)
     if snapshots:
         context["has_historical_data"] = True
         context["snapshots"] = snapshots
@@ -938,73 +1479,57 @@ def get_stock_context_from_db(symbol: str) -> Dict[str, Any]:
                 }
     
     # Get long-term history (10 years for accurate CAGR)
-    history = get_stock_history(symbol, years=10)
     if history["prices"]:
         context["history"] = history
         context["has_long_term_data"] = True
         
-        # Add long-term trend with 10-year CAGR
-        prices = history["prices"]
-        if len(prices) > 1:
-            start_price = prices[0]["price"]
-            end_price = prices[-1]["price"]
-            if start_price and end_price:
-                # Calculate actual years between dates
-                from datetime import datetime
-                start_date = datetime.strptime(prices[0]["date"], "%Y-%m-%d")
-                end_date = datetime.strptime(prices[-1]["date"], "%Y-%m-%d")
-                years_diff = (end_date - start_date).days / 365.25
-                
-                lt_change = ((end_price - start_price) / start_price) * 100
-                cagr_10yr = ((end_price / start_price) ** (1/years_diff) - 1) * 100 if years_diff > 0 else 0
-                
-                context["long_term_trend"] = {
-                    "start_price": round(start_price, 2),
-                    "start_date": prices[0]["date"],
-                    "end_price": round(end_price, 2), 
-                    "end_date": prices[-1]["date"],
-                    "change_pct_total": round(lt_change, 2),
-                    "years": round(years_diff, 1),
-                    "cagr_10yr": round(cagr_10yr, 2)
-                }
+        # Long-term trend with 10-year CAGR, computed in SQL
+        if long_term_trend:
+            context["long_term_trend"] = long_term_trend
     
     # Get recent news
-    context["news"] = get_recent_news(symbol, 5)
+    context["news"] = news
     
     return context
 
 
 
+def _iter_dated_rows(cursor_name: str, sql: str, params: tuple, itersize: int) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows through a server-side (named) cursor, `itersize` rows per fetch.
+    Queries format trade_date as text in SQL, so rows are yielded as fetched.
+    The pooled connection is held until the iterator is exhausted or closed.
+    """
+    with _conn() as conn, conn.cursor(name=cursor_name, cursor_factory=RealDictCursor) as cur:
+        cur.itersize = itersize
+        cur.execute(sql, params)
+        yield from cur
+
+
+def iter_historical_price_data(symbol: str, days: int = 365, itersize: int = 500) -> Iterator[Dict[str, Any]]:
+    """Stream historical price rows (oldest first) without materializing the full range."""
+    return _iter_dated_rows("historical_prices_cur", _HISTORICAL_PRICES_SELECT, (symbol, days), itersize)
+
+
+def iter_historical_valuation_data(symbol: str, days: int = 365, itersize: int = 500) -> Iterator[Dict[str, Any]]:
+    """Stream historical valuation rows (oldest first) without materializing the full range."""
+    return _iter_dated_rows("historical_valuations_cur", _HISTORICAL_VALUATIONS_SELECT, (symbol, days), itersize)
+
+
+def _fetch_prepared(name: str, params: tuple) -> List[Dict[str, Any]]:
+    with _conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+        _execute_prepared(cur, name, params)
+        return cur.fetchall()
+
+
 def get_historical_price_data(symbol: str, days: int = 365) -> List[Dict[str, Any]]:
     """
     Get historical price data for a specific number of days.
     Useful for analyzing trends, moving averages, and volume.
+    Runs as a per-connection prepared statement (use the iter_ variant to stream).
     """
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute("""
-            SELECT trade_date, price, dma_50, dma_200, volume, delivery_pct
-            FROM historical_prices 
-            WHERE symbol = %s AND trade_date >= (CURRENT_DATE - make_interval(days := %s))
-            ORDER BY trade_date ASC
-        """, (symbol, days))
-        
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        
-        # Convert dates to strings for JSON serialization
-        results = []
-        for row in rows:
-            row_dict = dict(row)
-            if isinstance(row_dict.get('trade_date'), (date, datetime)):
-                row_dict['trade_date'] = str(row_dict['trade_date'])
-            results.append(row_dict)
-            
-        return results
-        
+        return _fetch_prepared("historical_prices_stmt", (symbol, days))
     except Exception as e:
         logger.error(f"Failed to get historical prices: {e}")
         return []
@@ -1014,32 +1539,10 @@ def get_historical_valuation_data(symbol: str, days: int = 365) -> List[Dict[str
     """
     Get historical valuation data (PE, EPS) for a specific number of days.
     Useful for analyzing valuation trends and earnings growth.
+    Runs as a per-connection prepared statement (use the iter_ variant to stream).
     """
     try:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute("""
-            SELECT trade_date, pe_ratio, eps, sector_pe
-            FROM historical_valuations
-            WHERE symbol = %s AND trade_date >= (CURRENT_DATE - make_interval(days := %s))
-            ORDER BY trade_date ASC
-        """, (symbol, days))
-        
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        
-        # Convert dates to strings for JSON serialization
-        results = []
-        for row in rows:
-            row_dict = dict(row)
-            if isinstance(row_dict.get('trade_date'), (date, datetime)):
-                row_dict['trade_date'] = str(row_dict['trade_date'])
-            results.append(row_dict)
-            
-        return results
-        
+        return _fetch_prepared("historical_valuations_stmt", (symbol, days))
     except Exception as e:
         logger.error(f"Failed to get historical valuations: {e}")
         return []
@@ -1056,36 +1559,27 @@ def save_waitlist_signup(email: str, phone: Optional[str], market: str,
     Uses atomic position calculation to handle concurrent signups.
     """
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        # Get current max position for this market
-        # Start from position 77 (offset of 76) for marketing purposes
-        cur.execute("""
-            SELECT GREATEST(COALESCE(MAX(position), 0), 76) + 1 
-            FROM waitlist_signups 
-            WHERE market = %s
-        """, (market,))
-        position = cur.fetchone()[0]
-        
-        # Insert the signup
-        cur.execute("""
-            INSERT INTO waitlist_signups (email, phone, market, position, ip_address, user_agent)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            RETURNING id, position
-        """, (email.lower().strip(), phone, market, position, ip_address, user_agent))
-        
-        result = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
+        with _conn() as conn, conn.cursor() as cur:
+            # Get current max position for this market
+            # Start from position 77 (offset of 76) for marketing purposes
+            cur.execute("""
+                SELECT GREATEST(COALESCE(MAX(position), 0), 76) + 1 
+                FROM waitlist_signups 
+                WHERE market = %s
+            """, (market,))
+            position = cur.fetchone()[0]
+            # Insert the signup
+            cur.execute("""
+                INSERT INTO waitlist_signups (email, phone, market, position, ip_address, user_agent)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                RETURNING id, position
+            """, (email.lower().strip(), phone, market, position, ip_address, user_agent))
+            result = cur.fetchone()
+            conn.commit()
         
         return {"success": True, "position": result[1], "id": result[0]}
         
     except psycopg2.errors.UniqueViolation:
-        conn.rollback()
-        cur.close()
-        conn.close()
         # User already signed up, get their existing position
         return get_waitlist_position(email, market)
     except Exception as e:
@@ -1096,17 +1590,12 @@ def save_waitlist_signup(email: str, phone: Optional[str], market: str,
 def get_waitlist_position(email: str, market: str) -> Dict[str, Any]:
     """Get waitlist position for an email in a specific market."""
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT id, position FROM waitlist_signups 
-            WHERE email = %s AND market = %s
-        """, (email.lower().strip(), market))
-        
-        result = cur.fetchone()
-        cur.close()
-        conn.close()
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT id, position FROM waitlist_signups 
+                WHERE email = %s AND market = %s
+            """, (email.lower().strip(), market))
+            result = cur.fetchone()
         
         if result:
             return {"success": True, "position": result[1], "id": result[0], "already_registered": True}
@@ -1120,17 +1609,12 @@ def get_waitlist_position(email: str, market: str) -> Dict[str, Any]:
 def get_waitlist_count(market: Optional[str] = None) -> int:
     """Get total waitlist signup count. Optionally filter by market."""
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
-        if market:
-            cur.execute("SELECT COUNT(*) FROM waitlist_signups WHERE market = %s", (market,))
-        else:
-            cur.execute("SELECT COUNT(*) FROM waitlist_signups")
-        
-        count = cur.fetchone()[0]
-        cur.close()
-        conn.close()
+        with _conn() as conn, conn.cursor() as cur:
+            if market:
+                cur.execute("SELECT COUNT(*) FROM waitlist_signups WHERE market = %s", (market,))
+            else:
+                cur.execute("SELECT COUNT(*) FROM waitlist_signups")
+            count = cur.fetchone()[0]
         return count
         
     except Exception as e:
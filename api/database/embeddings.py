@@ -4,9 +4,24 @@ Uses OpenAI text-embedding-3-large (3072d) for maximum retrieval quality.
 Fallbacks: Mistral, Gemini.
 """
 import os
+import re
+import time
+import asyncio
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
+import numpy as np
 from dotenv import load_dotenv
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
 
 load_dotenv(override=True)
 
@@ -17,9 +32,25 @@ MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Max concurrent embedding requests in aget_embeddings_batch
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "8"))
+# Estimated-token budget per embedding request (OpenAI allows 300K per request)
+EMBEDDING_BATCH_TOKENS = int(os.getenv("EMBEDDING_BATCH_TOKENS", "50000"))
+# Token budget for a news article's "headline. summary" embedding text
+NEWS_EMBED_MAX_TOKENS = 512
+# Embeddings kept in the in-process LRU cache (~12KB each at 3072d float32)
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+
+# Semantic cache for build_semantic_context: a query whose embedding is at least
+# this similar to a recent one with the same numbers reuses that query's context
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_TTL = 600  # seconds
+SEMANTIC_CACHE_SIZE = 256  # entries per (symbol, top_k)
+
 # Initialize clients lazily
 _mistral_client = None
 _openai_client = None
+_async_openai_client = None
 _gemini_configured = False
 
 
@@ -41,6 +72,15 @@ def get_openai_client():
     return _openai_client
 
 
+def get_async_openai_client():
+    """Get or create async OpenAI client."""
+    global _async_openai_client
+    if _async_openai_client is None and OPENAI_API_KEY:
+        from openai import AsyncOpenAI
+        _async_openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _async_openai_client
+
+
 def configure_gemini():
     """Configure Gemini for embeddings."""
     global _gemini_configured
@@ -63,11 +103,47 @@ ACTIVE_MODEL = 'text-embedding-3-large'
 ACTIVE_DIMS = 3072
 
 
+def _pad(emb: List[float]) -> List[float]:
+    """Zero-pad a fallback provider's embedding to ACTIVE_DIMS for schema compatibility."""
+    return emb + [0.0] * (ACTIVE_DIMS - len(emb))
+
+
+_embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+
+def _cache_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _cache_get(text: str) -> Optional[List[float]]:
+    """Cached embedding for text (already truncated), refreshing its LRU position."""
+    key = _cache_key(text)
+    with _embedding_cache_lock:
+        emb = _embedding_cache.get(key)
+        if emb is None:
+            return None
+        _embedding_cache.move_to_end(key)
+    return emb.tolist()
+
+
+def _cache_put(text: str, emb: List[float]) -> None:
+    if not emb or EMBEDDING_CACHE_SIZE <= 0:
+        return
+    key = _cache_key(text)
+    with _embedding_cache_lock:
+        _embedding_cache[key] = np.asarray(emb, dtype=np.float32)
+        _embedding_cache.move_to_end(key)
+        while len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+            _embedding_cache.popitem(last=False)
+
+
 def get_embedding(text: str) -> List[float]:
     """
     Get embedding vector for text.
     Uses text-embedding-3-large (3072d, MTEB 64.6) for maximum quality.
     Fallback chain: OpenAI large → OpenAI small → Mistral → Gemini.
+    Results are cached in-process, keyed on a hash of the text.
     """
     if not text:
         return []
@@ -75,6 +151,15 @@ def get_embedding(text: str) -> List[float]:
     # Truncate to safe token limit (~16K chars ≈ 4K-8K tokens)
     text = text[:16000]
     
+    emb = _cache_get(text)
+    if emb is None:
+        emb = _fetch_embedding(text)
+        _cache_put(text, emb)
+    return emb
+
+
+def _fetch_embedding(text: str) -> List[float]:
+    """Call the embedding providers for get_embedding (text already truncated)."""
     # PRIMARY: OpenAI text-embedding-3-large (3072d, best quality)
     if OPENAI_API_KEY:
         try:
@@ -93,8 +178,7 @@ def get_embedding(text: str) -> List[float]:
                     model="text-embedding-3-small"
                 )
                 # Pad to 3072 dims for schema compatibility
-                emb = response.data[0].embedding
-                return emb + [0.0] * (3072 - len(emb))
+                return _pad(response.data[0].embedding)
             except Exception as e2:
                 logger.warning(f"OpenAI small fallback also failed: {e2}")
     
@@ -106,8 +190,7 @@ def get_embedding(text: str) -> List[float]:
                 model="mistral-embed",
                 inputs=[text[:16000]]
             )
-            emb = response.data[0].embedding
-            return emb + [0.0] * (3072 - len(emb))  # Pad for schema compat
+            return _pad(response.data[0].embedding)
         except Exception as e:
             logger.warning(f"Mistral embedding failed: {e}")
     
@@ -121,8 +204,7 @@ def get_embedding(text: str) -> List[float]:
                 content=text[:10000],
                 task_type="retrieval_document"
             )
-            emb = result['embedding']
-            return emb + [0.0] * (3072 - len(emb))  # Pad for schema compat
+            return _pad(result['embedding'])
         except Exception as e:
             logger.error(f"Gemini embedding also failed: {e}")
     
@@ -130,53 +212,240 @@ def get_embedding(text: str) -> List[float]:
     return []
 
 
-def get_embeddings_batch(texts: List[str], batch_size: int = 25) -> List[List[float]]:
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """cl100k_base, the tokenizer of the text-embedding-3 models (loaded once)."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
     """
-    Get embeddings for multiple texts using OpenAI batch API.
-    OpenAI supports up to 2048 texts per batch call.
-    We use batch_size=25 for reliability.
+    Cut text to at most max_tokens model tokens. Without tiktoken, falls back
+    to ~4 characters per token.
     """
-    if not texts:
-        return []
+    if not TIKTOKEN_AVAILABLE:
+        return text[:max_tokens * 4]
+    tokens = _get_encoding().encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else _get_encoding().decode(tokens[:max_tokens])
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token) for batch budgeting."""
+    return len(text) // 4 + 1
+
+
+def _prepare_batches(texts: List[str], batch_size: int):
+    """
+    Resolve cached embeddings and split the remaining non-empty texts into
+    provider batches (providers reject empty inputs). Texts are sorted by length
+    so each batch holds similarly sized inputs, and a batch closes at batch_size
+    texts or EMBEDDING_BATCH_TOKENS estimated tokens. Returns the partially
+    filled result list, the indices still to embed (in batch order) and the batches.
+    """
+    result = [[] for _ in texts]
+    indices = []
+    for i, text in enumerate(texts):
+        if text:
+            cached = _cache_get(text[:16000])
+            if cached is None:
+                indices.append(i)
+            else:
+                result[i] = cached
+    indices.sort(key=lambda i: len(texts[i][:16000]))
     
-    # Try OpenAI batch API (much faster than one-by-one)
-    if OPENAI_API_KEY:
+    batches, batch, budget = [], [], 0
+    for i in indices:
+        text = texts[i][:16000]
+        tokens = _estimate_tokens(text)
+        if batch and (len(batch) >= batch_size or budget + tokens > EMBEDDING_BATCH_TOKENS):
+            batches.append(batch)
+            batch, budget = [], 0
+        batch.append(text)
+        budget += tokens
+    if batch:
+        batches.append(batch)
+    return result, indices, batches
+
+
+def _align(texts: List[str], result: List[List[float]], indices: List[int],
+           embs: List[List[float]]) -> List[List[float]]:
+    """Place fetched embeddings at their text's position and cache them."""
+    for i, emb in zip(indices, embs):
+        result[i] = emb
+        _cache_put(texts[i][:16000], emb)
+    return result
+
+
+def _embed_batches_fallback(batches: List[List[str]]) -> Optional[List[List[float]]]:
+    """Embed batches with Mistral, then Gemini; None if neither is available."""
+    # SECONDARY: Mistral
+    if MISTRAL_API_KEY:
         try:
-            client = get_openai_client()
+            client = get_mistral_client()
             all_embeddings = []
-            
-            for i in range(0, len(texts), batch_size):
-                batch = [t[:16000] for t in texts[i:i + batch_size]]
-                response = client.embeddings.create(
-                    input=batch,
-                    model="text-embedding-3-large"
+            for batch in batches:
+                response = client.embeddings.create(model="mistral-embed", inputs=batch)
+                all_embeddings.extend(_pad(item.embedding) for item in response.data)
+            return all_embeddings
+        except Exception as e:
+            logger.warning(f"Mistral batch embedding failed: {e}")
+    
+    # FALLBACK: Gemini
+    if GEMINI_API_KEY:
+        try:
+            configure_gemini()
+            import google.generativeai as genai
+            all_embeddings = []
+            for batch in batches:
+                result = genai.embed_content(
+                    model="models/embedding-001",
+                    content=[t[:10000] for t in batch],
+                    task_type="retrieval_document"
                 )
-                batch_embs = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embs)
-            
+                all_embeddings.extend(_pad(emb) for emb in result['embedding'])
             return all_embeddings
         except Exception as e:
-            logger.warning(f"OpenAI batch embedding failed, falling back to sequential: {e}")
+            logger.error(f"Gemini batch embedding also failed: {e}")
+    
+    logger.error("No embedding provider available!")
+    return None
+
+
+def get_embeddings_batch(texts: List[str], batch_size: int = 100) -> List[List[float]]:
+    """
+    Get embeddings for multiple texts with one provider call per batch.
+    OpenAI supports up to 2048 texts per batch call; Mistral and Gemini also take
+    lists, so the fallbacks are batched too. Empty texts get an empty embedding.
+    """
+    if not texts:
+        return []
+    
+    result, indices, batches = _prepare_batches(texts, batch_size)
+    if not batches:
+        return result
+    
+    # PRIMARY: OpenAI batch API (much faster than one-by-one), small model padded as fallback
+    if OPENAI_API_KEY:
+        client = get_openai_client()
+        for model in ("text-embedding-3-large", "text-embedding-3-small"):
+            try:
+                all_embeddings = []
+                for batch in batches:
+                    response = client.embeddings.create(input=batch, model=model)
+                    all_embeddings.extend(_pad(item.embedding) for item in response.data)
+                return _align(texts, result, indices, all_embeddings)
+            except Exception as e:
+                logger.warning(f"OpenAI {model} batch embedding failed: {e}")
+    
+    return _align(texts, result, indices, _embed_batches_fallback(batches) or [])
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10), reraise=True)
+async def _aget_embedding_batch(client, batch: List[str], model: str) -> List[List[float]]:
+    """One OpenAI embeddings call, retried with backoff on transient failures."""
+    response = await client.embeddings.create(input=batch, model=model)
+    return [_pad(item.embedding) for item in response.data]
+
+
+async def aget_embeddings_batch(texts: List[str], batch_size: int = 100) -> List[List[float]]:
+    """
+    Async get_embeddings_batch: OpenAI batches are sent concurrently, at most
+    EMBEDDING_CONCURRENCY in flight. Mistral/Gemini fallbacks run in a worker thread.
+    """
+    if not texts:
+        return []
+    
+    result, indices, batches = _prepare_batches(texts, batch_size)
+    if not batches:
+        return result
     
-    # Fallback: sequential
-    return [get_embedding(text) for text in texts]
+    if OPENAI_API_KEY:
+        client = get_async_openai_client()
+        semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+        
+        async def bounded(batch, model):
+            async with semaphore:
+                return await _aget_embedding_batch(client, batch, model)
+        
+        for model in ("text-embedding-3-large", "text-embedding-3-small"):
+            try:
+                results = await asyncio.gather(*[bounded(batch, model) for batch in batches])
+                return _align(texts, result, indices, [emb for embs in results for emb in embs])
+            except Exception as e:
+                logger.warning(f"OpenAI {model} async batch embedding failed: {e}")
+    
+    embs = await asyncio.to_thread(_embed_batches_fallback, batches)
+    return _align(texts, result, indices, embs or [])
 
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     """Calculate cosine similarity between two vectors."""
-    import math
-    
-    if not vec1 or not vec2 or len(vec1) != len(vec2):
+    if vec1 is None or vec2 is None or len(vec1) == 0 or len(vec1) != len(vec2):
         return 0.0
     
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    norm1 = math.sqrt(sum(a * a for a in vec1))
-    norm2 = math.sqrt(sum(b * b for b in vec2))
-    
-    if norm1 == 0 or norm2 == 0:
+    v1 = np.asarray(vec1, dtype=np.float32)
+    v2 = np.asarray(vec2, dtype=np.float32)
+    denom = np.linalg.norm(v1) * np.linalg.norm(v2)
+    if denom == 0:
         return 0.0
     
-    return dot_product / (norm1 * norm2)
+    return float(v1 @ v2 / denom)
+
+
+def _normalize(vec: List[float]) -> np.ndarray:
+    """Return vec as a unit-norm float32 array (a zero vector stays zero)."""
+    v = np.asarray(vec, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm > 0 else v
+
+
+def _to_bytes(vec: List[float]) -> bytes:
+    """
+    Serialize an embedding unit-normalized and int8-quantized: a float32 scale
+    followed by one int8 per dimension (a quarter of the float32 size).
+    """
+    v = _normalize(vec)
+    peak = float(np.max(np.abs(v)))
+    scale = np.float32(peak / 127 if peak > 0 else 1.0)
+    return scale.tobytes() + np.round(v / scale).astype(np.int8).tobytes()
+
+
+def _from_bytes(buf) -> np.ndarray:
+    """Decode stored embedding bytes to a float32 array."""
+    if len(buf) == ACTIVE_DIMS * 4:
+        # Written before quantization: raw float32
+        return np.frombuffer(buf, dtype=np.float32)
+    scale = np.frombuffer(buf, dtype=np.float32, count=1)[0]
+    return np.frombuffer(buf, dtype=np.int8, offset=4).astype(np.float32) * scale
+
+
+def normalize_documents(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Replace each document's embedding with its unit-norm float32 vector, in place.
+    Call once when documents are loaded so search_similar can score with a plain dot product.
+    """
+    for doc in documents:
+        if doc.get("embedding") is not None and len(doc["embedding"]):
+            doc["embedding"] = _normalize(doc["embedding"])
+    return documents
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, in O(N + k log k).
+    Ties keep input order, matching a stable descending sort.
+    """
+    n = len(scores)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    kth = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    idx = np.concatenate([above, ties])
+    return idx[np.argsort(-scores[idx], kind="stable")]
 
 
 def search_similar(query: str, documents: List[Dict[str, Any]], 
@@ -186,7 +455,8 @@ def search_similar(query: str, documents: List[Dict[str, Any]],
     
     Args:
         query: Search query
-        documents: List of dicts with text and pre-computed embeddings
+        documents: List of dicts with text and pre-computed unit-norm embeddings
+                   (provider embeddings already are; otherwise see normalize_documents)
         text_key: Key for text field in documents
         top_k: Number of results to return
     
@@ -197,69 +467,80 @@ def search_similar(query: str, documents: List[Dict[str, Any]],
     if not query_embedding:
         return []
     
-    results = []
-    for doc in documents:
-        doc_embedding = doc.get("embedding")
-        if doc_embedding:
-            similarity = cosine_similarity(query_embedding, doc_embedding)
-            results.append({
-                **doc,
-                "similarity": similarity
-            })
+    candidates = [doc for doc in documents
+                  if doc.get("embedding") is not None and len(doc["embedding"])]
+    if not candidates:
+        return []
     
-    # Sort by similarity (descending)
-    results.sort(key=lambda x: x.get("similarity", 0), reverse=True)
+    # Stored vectors are unit-norm, so cosine similarity is a single matrix-vector
+    # product; embeddings whose dimension differs from the query score 0
+    dims = len(query_embedding)
+    matching = [i for i, doc in enumerate(candidates) if len(doc["embedding"]) == dims]
+    similarities = np.zeros(len(candidates), dtype=np.float32)
+    if matching:
+        emb = np.array([candidates[i]["embedding"] for i in matching], dtype=np.float32)
+        similarities[matching] = emb @ _normalize(query_embedding)
     
-    return results[:top_k]
+    return [{**candidates[i], "similarity": float(similarities[i])}
+            for i in _top_k_indices(similarities, top_k)]
 
 
 def embed_news_articles():
     """Embed all news articles that don't have embeddings yet."""
     try:
-        from api.database.database import get_connection
-        import json
-        
-        conn = get_connection()
-        cur = conn.cursor()
+        from api.database.database import _conn
+        import psycopg2
         
-        # Get articles without embeddings
-        cur.execute("""
-            SELECT id, headline, summary 
-            FROM news_articles 
-            WHERE embedding_id IS NULL
-            LIMIT 100
-        """)
+        # Get articles without embeddings, plus stored embeddings for the same content
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT id, headline, summary, content_hash 
+                FROM news_articles 
+                WHERE embedding_id IS NULL
+                LIMIT 100
+            """)
+            articles = cur.fetchall()
+            
+            hashes = list({article[3] for article in articles})
+            cur.execute("""
+                SELECT DISTINCT ON (content_hash) content_hash, embedding 
+                FROM news_articles 
+                WHERE embedding IS NOT NULL AND content_hash = ANY(%s)
+            """, (hashes,))
+            stored = {h: bytes(emb) for h, emb in cur.fetchall()}
         
-        articles = cur.fetchall()
         if not articles:
             logger.info("No articles to embed")
             return 0
         
-        logger.info(f"Embedding {len(articles)} articles...")
-        
-        # Prepare texts
-        texts = []
+        # Only content not seen before goes to the provider (once per hash)
+        novel = {}
         for article in articles:
-            text = f"{article[1]}. {article[2] or ''}"
-            texts.append(text[:500])  # Limit text length
+            if article[3] not in stored and article[3] not in novel:
+                text = f"{article[1]}. {article[2] or ''}"
+                novel[article[3]] = truncate_tokens(text, NEWS_EMBED_MAX_TOKENS)
         
-        # Get embeddings in batch
-        embeddings = get_embeddings_batch(texts)
+        logger.info(f"Embedding {len(articles)} articles ({len(novel)} unique new texts)...")
         
-        # Update database
-        for i, article in enumerate(articles):
-            if i < len(embeddings) and embeddings[i]:
-                # Store embedding as JSON string for simplicity
-                embedding_id = f"emb_{article[0]}"
-                cur.execute("""
-                    UPDATE news_articles 
-                    SET embedding_id = %s 
-                    WHERE id = %s
-                """, (embedding_id, article[0]))
+        if novel:
+            # Get embeddings in concurrent batches
+            embeddings = asyncio.run(aget_embeddings_batch(list(novel.values())))
+            for h, emb in zip(novel, embeddings):
+                if emb:
+                    # Store the vector normalized (search is a dot product) and int8-quantized
+                    stored[h] = _to_bytes(emb)
         
-        conn.commit()
-        cur.close()
-        conn.close()
+        # Update database (the connection is not held across the embedding calls)
+        with _conn() as conn, conn.cursor() as cur:
+            for article in articles:
+                if article[3] in stored:
+                    embedding_id = f"emb_{article[0]}"
+                    cur.execute("""
+                        UPDATE news_articles 
+                        SET embedding_id = %s, embedding = %s 
+                        WHERE id = %s
+                    """, (embedding_id, psycopg2.Binary(stored[article[3]]), article[0]))
+            conn.commit()
         
         logger.info(f"Embedded {len(articles)} articles successfully")
         return len(articles)
@@ -269,44 +550,112 @@ def embed_news_articles():
         return 0
 
 
+_semantic_cache: Dict[tuple, List[tuple]] = {}
+_semantic_cache_lock = threading.Lock()
+_QUERY_WORD_RE = re.compile(r"\w+")
+
+
+def _normalize_query(query: str) -> str:
+    """Lowercased words of a query, so case, spacing and punctuation don't matter."""
+    return " ".join(_QUERY_WORD_RE.findall(query.lower()))
+
+
+def _query_numbers(normalized: str) -> set:
+    """Words carrying a digit (Q3, FY24, 2025); queries that differ in these never share context."""
+    return {word for word in normalized.split() if any(c.isdigit() for c in word)}
+
+
+def _semantic_cache_get(key: tuple, query: str) -> Optional[str]:
+    """
+    Context of a recent query for the same key: the same normalised query, else
+    a paraphrase above SEMANTIC_CACHE_THRESHOLD with the same numbers.
+    Entries only exist for keys with embedded articles, so the query is only
+    embedded when there is something to compare against.
+    """
+    cutoff = time.monotonic() - SEMANTIC_CACHE_TTL
+    with _semantic_cache_lock:
+        entries = [e for e in _semantic_cache.get(key, []) if e[0] > cutoff]
+        _semantic_cache[key] = entries
+    if not entries:
+        return None
+    
+    normalized = _normalize_query(query)
+    for entry in entries:
+        if entry[1] == normalized:
+            return entry[3]
+    
+    numbers = _query_numbers(normalized)
+    entries = [e for e in entries if _query_numbers(e[1]) == numbers]
+    query_embedding = get_embedding(query) if entries else None
+    if not query_embedding:
+        return None
+    
+    similarities = np.stack([e[2] for e in entries]) @ _normalize(query_embedding)
+    best = int(np.argmax(similarities))
+    return entries[best][3] if similarities[best] >= SEMANTIC_CACHE_THRESHOLD else None
+
+
+def _semantic_cache_put(key: tuple, query: str, context: str) -> None:
+    # Already embedded (and cached) by search_similar, so this makes no request
+    query_embedding = get_embedding(query)
+    if not query_embedding:
+        return
+    entry = (time.monotonic(), _normalize_query(query), _normalize(query_embedding), context)
+    with _semantic_cache_lock:
+        entries = _semantic_cache.setdefault(key, [])
+        entries.append(entry)
+        del entries[:-SEMANTIC_CACHE_SIZE]
+
+
 def build_semantic_context(query: str, symbol: str = None, top_k: int = 3) -> str:
     """
     Build semantic context for a query using embedded news articles.
     This is what makes our RAG more powerful than ChatGPT.
+    Recent articles are ranked by similarity to the query; articles without a
+    stored embedding fill any remaining slots in recency order. Repeats and
+    paraphrases of a recent query (same symbol) reuse its context without
+    touching the database; without embedded articles nothing is embedded or cached.
     """
     try:
-        from api.database.database import get_connection
+        from api.database.database import _conn
         
-        conn = get_connection()
-        cur = conn.cursor()
+        cache_key = (symbol, top_k)
+        cached = _semantic_cache_get(cache_key, query)
+        if cached is not None:
+            return cached
         
         # Get recent news for the symbol (or all if no symbol)
-        if symbol:
-            cur.execute("""
-                SELECT headline, summary, published_at, source 
-                FROM news_articles 
-                WHERE symbol = %s 
-                ORDER BY published_at DESC 
-                LIMIT 10
-            """, (symbol,))
-        else:
-            cur.execute("""
-                SELECT headline, summary, published_at, source 
-                FROM news_articles 
-                ORDER BY published_at DESC 
-                LIMIT 20
-            """)
-        
-        articles = cur.fetchall()
-        cur.close()
-        conn.close()
+        with _conn() as conn, conn.cursor() as cur:
+            if symbol:
+                cur.execute("""
+                    SELECT headline, summary, published_at, source, embedding 
+                    FROM news_articles 
+                    WHERE symbol = %s 
+                    ORDER BY published_at DESC 
+                    LIMIT 10
+                """, (symbol,))
+            else:
+                cur.execute("""
+                    SELECT headline, summary, published_at, source, embedding 
+                    FROM news_articles 
+                    ORDER BY published_at DESC 
+                    LIMIT 20
+                """)
+            articles = cur.fetchall()
         
         if not articles:
             return ""
         
+        documents = [
+            {"article": article, "embedding": _from_bytes(article[4])}
+            for article in articles if article[4] is not None
+        ]
+        ranked = [doc["article"] for doc in search_similar(query, documents, top_k=top_k)] if documents else []
+        ranked += [article for article in articles if article[4] is None][:top_k - len(ranked)]
+        
         # Build context string
         context_parts = ["📰 RECENT NEWS CONTEXT:"]
-        for article in articles[:top_k]:
+        for article in ranked:
             headline = article[0]
             summary = article[1] or ""
             date = article[2]
@@ -314,7 +663,10 @@ def build_semantic_context(query: str, symbol: str = None, top_k: int = 3) -> st
             if summary:
                 context_parts.append(f"  {summary[:150]}...")
         
-        return "\n".join(context_parts)
+        context = "\n".join(context_parts)
+        if documents:
+            _semantic_cache_put(cache_key, query, context)
+        return context
         
     except Exception as e:
         logger.error(f"Failed to build semantic context: {e}")
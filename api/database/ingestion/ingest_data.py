@@ -6,6 +6,7 @@ import os
 import sys
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List
 from dotenv import load_dotenv
@@ -16,9 +17,10 @@ load_dotenv(override=True)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from utils.fetch_indian_data import fetch_indian_data
+from utils.rate_limiter import TokenBucket
 from api.database.database import (
-    init_database, save_stock_snapshot, save_news_article, 
-    get_connection, NIFTY_50
+    init_database, save_stock_snapshot, save_news_articles_bulk, 
+    _conn, NIFTY_50
 )
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -42,14 +44,12 @@ def ingest_stock(symbol: str) -> dict:
             result["success"] = True
             logger.info(f"[{symbol}] Snapshot saved: PE={data.get('pe_ratio')}, Price={data.get('price')}")
         
-        # Save news articles
+        # Save news articles (one multi-row INSERT)
         news_items = data.get("news", [])
-        for article in news_items:
-            if save_news_article(symbol, article):
-                result["news_count"] += 1
+        result["news_count"] = save_news_articles_bulk(symbol, news_items)
         
         if news_items:
-            logger.info(f"[{symbol}] Saved {result['news_count']} news articles")
+            logger.info(f"[{symbol}] Saved {result['news_count']} new news articles")
         
         return result
         
@@ -58,8 +58,13 @@ def ingest_stock(symbol: str) -> dict:
         return result
 
 
-def ingest_all_stocks(symbols: List[str] = None, delay_seconds: float = 1.0):
-    """Ingest data for all specified stocks."""
+def ingest_all_stocks(symbols: List[str] = None, delay_seconds: float = 1.0, max_workers: int = 8):
+    """
+    Ingest data for all specified stocks.
+    Stocks are fetched concurrently on max_workers threads; delay_seconds is the
+    minimum spacing between API calls (token bucket), so request latency overlaps
+    instead of adding to every stock.
+    """
     if symbols is None:
         symbols = NIFTY_50
     
@@ -73,21 +78,26 @@ def ingest_all_stocks(symbols: List[str] = None, delay_seconds: float = 1.0):
         "news_total": 0
     }
     
-    for i, symbol in enumerate(symbols, 1):
-        logger.info(f"[{i}/{len(symbols)}] Processing {symbol}...")
-        
-        result = ingest_stock(symbol)
-        
-        if result["success"]:
-            results["success"] += 1
-        else:
-            results["failed"] += 1
-        
-        results["news_total"] += result["news_count"]
-        
-        # Rate limiting
-        if i < len(symbols):
-            time.sleep(delay_seconds)
+    # Rate limiting
+    limiter = TokenBucket(rate=1.0 / delay_seconds, capacity=1) if delay_seconds > 0 else None
+    
+    def rate_limited_ingest(symbol: str) -> dict:
+        if limiter:
+            limiter.acquire(timeout=float("inf"))
+        return ingest_stock(symbol)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(rate_limited_ingest, symbol) for symbol in symbols]
+        for i, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            logger.info(f"[{i}/{len(symbols)}] Processed {result['symbol']}")
+            
+            if result["success"]:
+                results["success"] += 1
+            else:
+                results["failed"] += 1
+            
+            results["news_total"] += result["news_count"]
     
     elapsed = (datetime.now() - start_time).total_seconds()
     
@@ -103,34 +113,69 @@ def ingest_all_stocks(symbols: List[str] = None, delay_seconds: float = 1.0):
     return results
 
 
+# Planner row estimates (reltuples) summed over a table and its partitions;
+# reltuples < 0 means the relation was never vacuumed/analyzed
+_ROW_ESTIMATES = """
+    SELECT t.name,
+           COALESCE(SUM(c.reltuples) FILTER (WHERE c.reltuples >= 0), 0)::bigint,
+           COALESCE(bool_or(c.reltuples < 0), false)
+    FROM unnest(%s::text[]) AS t(name)
+    JOIN pg_class c ON c.relkind = 'r' AND (
+        c.oid = to_regclass(t.name)
+        OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(t.name))
+    )
+    GROUP BY t.name
+"""
+
+# Loose index scan over the (symbol, snapshot_date) key: one probe per symbol
+_DISTINCT_SNAPSHOT_SYMBOLS = """
+    WITH RECURSIVE s AS (
+        SELECT MIN(symbol) AS symbol FROM stock_snapshots
+        UNION ALL
+        SELECT (SELECT MIN(symbol) FROM stock_snapshots WHERE symbol > s.symbol)
+        FROM s WHERE s.symbol IS NOT NULL
+    )
+    SELECT COUNT(symbol) FROM s
+"""
+
+DB_STATS_TTL = 60  # seconds
+_db_stats_cache = (0.0, None)
+
+
 def get_db_stats():
-    """Get current database statistics."""
+    """
+    Get current database statistics.
+    Row counts are planner estimates (exact COUNT(*) only for tables not yet
+    analyzed), and results are reused for DB_STATS_TTL seconds.
+    """
+    global _db_stats_cache
+    cached_at, cached = _db_stats_cache
+    if cached is not None and time.monotonic() - cached_at < DB_STATS_TTL:
+        return dict(cached)
+    
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        
+        tables = {"snapshots": "stock_snapshots", "news_articles": "news_articles", "queries": "query_history"}
         stats = {}
         
-        # Count snapshots
-        cur.execute("SELECT COUNT(*) FROM stock_snapshots")
-        stats["snapshots"] = cur.fetchone()[0]
-        
-        # Count unique symbols
-        cur.execute("SELECT COUNT(DISTINCT symbol) FROM stock_snapshots")
-        stats["unique_stocks"] = cur.fetchone()[0]
-        
-        # Count news
-        cur.execute("SELECT COUNT(*) FROM news_articles")
-        stats["news_articles"] = cur.fetchone()[0]
-        
-        # Count queries
-        cur.execute("SELECT COUNT(*) FROM query_history")
-        stats["queries"] = cur.fetchone()[0]
-        
-        cur.close()
-        conn.close()
-        
-        return stats
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute(_ROW_ESTIMATES, (list(tables.values()),))
+            estimates = {name: (rows, unanalyzed) for name, rows, unanalyzed in cur.fetchall()}
+            
+            for key, table in tables.items():
+                rows, unanalyzed = estimates.get(table, (0, True))
+                if unanalyzed or rows == 0:
+                    # No usable estimate yet (new or tiny table): count exactly
+                    cur.execute(f"SELECT COUNT(*) FROM {table}")
+                    rows = cur.fetchone()[0]
+                stats[key] = rows
+            
+            cur.execute(_DISTINCT_SNAPSHOT_SYMBOLS)
+            stats["unique_stocks"] = cur.fetchone()[0]
+        
+        # Keep the original key order
+        stats = {k: stats[k] for k in ("snapshots", "unique_stocks", "news_articles", "queries")}
+        _db_stats_cache = (time.monotonic(), stats)
+        return dict(stats)
         
     except Exception as e:
         logger.error(f"Failed to get stats: {e}")
@@ -146,6 +191,7 @@ if __name__ == "__main__":
     parser.add_argument("--symbols", nargs="+", help="Specific symbols to ingest")
     parser.add_argument("--stats", action="store_true", help="Show database statistics")
     parser.add_argument("--delay", type=float, default=1.0, help="Delay between API calls (seconds)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent fetch threads")
     
     args = parser.parse_args()
     
@@ -162,7 +208,7 @@ if __name__ == "__main__":
     
     if args.ingest:
         symbols = args.symbols if args.symbols else NIFTY_50
-        ingest_all_stocks(symbols, args.delay)
+        ingest_all_stocks(symbols, args.delay, args.workers)
     
     if not any([args.init, args.ingest, args.stats]):
         # Default: show stats and ingest top 10
@@ -17,7 +17,7 @@ load_dotenv(override=True)
 # Add parent directory to path (3 levels up: data/ingestion -> data -> app -> root)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from api.database.database import get_connection
+from api.database.database import _conn
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("HistoricalIngestion")
@@ -112,52 +112,53 @@ NIFTY_500 = [
 
 def create_historical_tables():
     """Create tables for historical data."""
-    conn = get_connection()
-    cur = conn.cursor()
-    
-    # Historical price data (weekly)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS historical_prices (
-            id SERIAL PRIMARY KEY,
-            symbol VARCHAR(20) NOT NULL,
-            trade_date DATE NOT NULL,
-            price DECIMAL(12,2),
-            dma_50 DECIMAL(12,2),
-            dma_200 DECIMAL(12,2),
-            volume BIGINT,
-            delivery_pct DECIMAL(6,2),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(symbol, trade_date)
-        )
-    """)
-    
-    cur.execute("""
-        CREATE INDEX IF NOT EXISTS idx_historical_prices_symbol_date 
-        ON historical_prices(symbol, trade_date DESC)
-    """)
-    
-    # Historical valuation data (PE, EPS)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS historical_valuations (
-            id SERIAL PRIMARY KEY,
-            symbol VARCHAR(20) NOT NULL,
-            trade_date DATE NOT NULL,
-            pe_ratio DECIMAL(10,2),
-            eps DECIMAL(10,2),
-            sector_pe DECIMAL(10,2),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(symbol, trade_date)
-        )
-    """)
-    
-    cur.execute("""
-        CREATE INDEX IF NOT EXISTS idx_historical_valuations_symbol_date 
-        ON historical_valuations(symbol, trade_date DESC)
-    """)
-    
-    conn.commit()
-    cur.close()
-    conn.close()
+    with _conn() as conn, conn.cursor() as cur:
+        # Historical price data (weekly)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS historical_prices (
+                id SERIAL PRIMARY KEY,
+                symbol VARCHAR(20) NOT NULL,
+                trade_date DATE NOT NULL,
+                price DECIMAL(12,2),
+                dma_50 DECIMAL(12,2),
+                dma_200 DECIMAL(12,2),
+                volume BIGINT,
+                delivery_pct DECIMAL(6,2),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(symbol, trade_date)
+            )
+        """)
+        
+        # Covering index so get_stock_history's range reads are index-only scans.
+        # It replaces the plain (symbol, trade_date DESC) index; newest-first reads
+        # scan it backwards.
+        cur.execute("DROP INDEX IF EXISTS idx_historical_prices_symbol_date")
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_historical_prices_symbol_date_cov 
+            ON historical_prices(symbol, trade_date) INCLUDE (price, dma_50, dma_200)
+        """)
+        
+        # Historical valuation data (PE, EPS)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS historical_valuations (
+                id SERIAL PRIMARY KEY,
+                symbol VARCHAR(20) NOT NULL,
+                trade_date DATE NOT NULL,
+                pe_ratio DECIMAL(10,2),
+                eps DECIMAL(10,2),
+                sector_pe DECIMAL(10,2),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(symbol, trade_date)
+            )
+        """)
+        
+        cur.execute("DROP INDEX IF EXISTS idx_historical_valuations_symbol_date")
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_historical_valuations_symbol_date_cov 
+            ON historical_valuations(symbol, trade_date) INCLUDE (pe_ratio, eps)
+        """)
+        
+        conn.commit()
     logger.info("Historical tables created successfully")
 
 
@@ -208,9 +209,6 @@ def save_historical_prices(symbol: str, data: Dict[str, Any]) -> int:
     if not data or 'datasets' not in data:
         return 0
     
-    conn = get_connection()
-    cur = conn.cursor()
-    
     # Extract datasets
     prices = {}
     dma50 = {}
@@ -241,36 +239,35 @@ def save_historical_prices(symbol: str, data: Dict[str, Any]) -> int:
                         vol_data['delivery'] = v[2].get('delivery')
                     volumes[v[0]] = vol_data
     
-    # Insert data
-    count = 0
-    for date_str, price in prices.items():
-        try:
-            cur.execute("""
-                INSERT INTO historical_prices 
-                (symbol, trade_date, price, dma_50, dma_200, volume, delivery_pct)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (symbol, trade_date) DO UPDATE SET
-                    price = EXCLUDED.price,
-                    dma_50 = EXCLUDED.dma_50,
-                    dma_200 = EXCLUDED.dma_200,
-                    volume = EXCLUDED.volume,
-                    delivery_pct = EXCLUDED.delivery_pct
-            """, (
-                symbol,
-                date_str,
-                price,
-                dma50.get(date_str),
-                dma200.get(date_str),
-                volumes.get(date_str, {}).get('volume'),
-                volumes.get(date_str, {}).get('delivery')
-            ))
-            count += 1
-        except Exception as e:
-            logger.error(f"[{symbol}] Insert error for {date_str}: {e}")
-    
-    conn.commit()
-    cur.close()
-    conn.close()
+    with _conn() as conn, conn.cursor() as cur:
+        # Insert data
+        count = 0
+        for date_str, price in prices.items():
+            try:
+                cur.execute("""
+                    INSERT INTO historical_prices 
+                    (symbol, trade_date, price, dma_50, dma_200, volume, delivery_pct)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (symbol, trade_date) DO UPDATE SET
+                        price = EXCLUDED.price,
+                        dma_50 = EXCLUDED.dma_50,
+                        dma_200 = EXCLUDED.dma_200,
+                        volume = EXCLUDED.volume,
+                        delivery_pct = EXCLUDED.delivery_pct
+                """, (
+                    symbol,
+                    date_str,
+                    price,
+                    dma50.get(date_str),
+                    dma200.get(date_str),
+                    volumes.get(date_str, {}).get('volume'),
+                    volumes.get(date_str, {}).get('delivery')
+                ))
+                count += 1
+            except Exception as e:
+                logger.error(f"[{symbol}] Insert error for {date_str}: {e}")
+        
+        conn.commit()
     
     return count
 
@@ -280,9 +277,6 @@ def save_historical_valuations(symbol: str, data: Dict[str, Any]) -> int:
     if not data or 'datasets' not in data:
         return 0
     
-    conn = get_connection()
-    cur = conn.cursor()
-    
     # Extract datasets
     pe_data = {}
     eps_data = {}
@@ -306,30 +300,29 @@ def save_historical_valuations(symbol: str, data: Dict[str, Any]) -> int:
                     except (ValueError, TypeError):
                         pass
     
-    # Insert data
-    count = 0
-    for date_str, pe in pe_data.items():
-        try:
-            cur.execute("""
-                INSERT INTO historical_valuations 
-                (symbol, trade_date, pe_ratio, eps)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (symbol, trade_date) DO UPDATE SET
-                    pe_ratio = EXCLUDED.pe_ratio,
-                    eps = COALESCE(EXCLUDED.eps, historical_valuations.eps)
-            """, (
-                symbol,
-                date_str,
-                pe,
-                eps_data.get(date_str)
-            ))
-            count += 1
-        except Exception as e:
-            logger.error(f"[{symbol}] Valuation insert error for {date_str}: {e}")
-    
-    conn.commit()
-    cur.close()
-    conn.close()
+    with _conn() as conn, conn.cursor() as cur:
+        # Insert data
+        count = 0
+        for date_str, pe in pe_data.items():
+            try:
+                cur.execute("""
+                    INSERT INTO historical_valuations 
+                    (symbol, trade_date, pe_ratio, eps)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (symbol, trade_date) DO UPDATE SET
+                        pe_ratio = EXCLUDED.pe_ratio,
+                        eps = COALESCE(EXCLUDED.eps, historical_valuations.eps)
+                """, (
+                    symbol,
+                    date_str,
+                    pe,
+                    eps_data.get(date_str)
+                ))
+                count += 1
+            except Exception as e:
+                logger.error(f"[{symbol}] Valuation insert error for {date_str}: {e}")
+        
+        conn.commit()
     
     return count
 
@@ -406,47 +399,42 @@ def ingest_all_historical(symbols: List[str] = None, period: str = "10yr", delay
 
 def get_historical_stats():
     """Get statistics on historical data."""
-    conn = get_connection()
-    cur = conn.cursor()
-    
-    stats = {}
-    
-    # Price data stats
-    cur.execute("""
-        SELECT 
-            COUNT(*) as total_records,
-            COUNT(DISTINCT symbol) as unique_stocks,
-            MIN(trade_date) as earliest_date,
-            MAX(trade_date) as latest_date
-        FROM historical_prices
-    """)
-    row = cur.fetchone()
-    stats['prices'] = {
-        'total_records': row[0],
-        'unique_stocks': row[1],
-        'earliest_date': str(row[2]) if row[2] else None,
-        'latest_date': str(row[3]) if row[3] else None
-    }
-    
-    # Valuation data stats
-    cur.execute("""
-        SELECT 
-            COUNT(*) as total_records,
-            COUNT(DISTINCT symbol) as unique_stocks,
-            MIN(trade_date) as earliest_date,
-            MAX(trade_date) as latest_date
-        FROM historical_valuations
-    """)
-    row = cur.fetchone()
-    stats['valuations'] = {
-        'total_records': row[0],
-        'unique_stocks': row[1],
-        'earliest_date': str(row[2]) if row[2] else None,
-        'latest_date': str(row[3]) if row[3] else None
-    }
-    
-    cur.close()
-    conn.close()
+    with _conn() as conn, conn.cursor() as cur:
+        stats = {}
+        
+        # Price data stats
+        cur.execute("""
+            SELECT 
+                COUNT(*) as total_records,
+                COUNT(DISTINCT symbol) as unique_stocks,
+                MIN(trade_date) as earliest_date,
+                MAX(trade_date) as latest_date
+            FROM historical_prices
+        """)
+        row = cur.fetchone()
+        stats['prices'] = {
+            'total_records': row[0],
+            'unique_stocks': row[1],
+            'earliest_date': str(row[2]) if row[2] else None,
+            'latest_date': str(row[3]) if row[3] else None
+        }
+        
+        # Valuation data stats
+        cur.execute("""
+            SELECT 
+                COUNT(*) as total_records,
+                COUNT(DISTINCT symbol) as unique_stocks,
+                MIN(trade_date) as earliest_date,
+                MAX(trade_date) as latest_date
+            FROM historical_valuations
+        """)
+        row = cur.fetchone()
+        stats['valuations'] = {
+            'total_records': row[0],
+            'unique_stocks': row[1],
+            'earliest_date': str(row[2]) if row[2] else None,
+            'latest_date': str(row[3]) if row[3] else None
+        }
     
     return stats
 
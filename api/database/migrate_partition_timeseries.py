@@ -0,0 +1,109 @@
+"""
+Database Migration: Convert price_history / stock_snapshots to monthly range partitions
+
+Tables created before init_database declared them partitioned are rebuilt in place:
+- a partitioned copy is created with the same columns (LIKE, incl. later-added ones)
+- monthly partitions are created for the existing date range, plus a DEFAULT partition
+- rows are copied, the old table is dropped and the id sequence is handed over
+- init_database() then recreates the named indexes on the partitioned parent
+
+Everything runs in one transaction. Run ensure_partitions() periodically afterwards
+to keep creating upcoming months.
+"""
+
+import os
+import sys
+import logging
+from datetime import date
+from dotenv import load_dotenv
+import psycopg2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from api.database.database import (
+    PARTITIONED_TABLES, PARTITION_MONTHS_AHEAD,
+    _create_monthly_partitions, _month_start, init_database
+)
+
+load_dotenv(override=True)
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("DBMigration")
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+def _partition_table(cur, table: str, column: str):
+    """Rebuild one table as PARTITION BY RANGE (column)."""
+    old = f"{table}_unpartitioned"
+
+    cur.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    # Free the index/constraint names for the new table
+    cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", (old,))
+    for (index_name,) in cur.fetchall():
+        cur.execute(f"ALTER INDEX {index_name} RENAME TO {index_name[:55]}_old")
+
+    cur.execute(f"""
+        CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS)
+        PARTITION BY RANGE ({column})
+    """)
+    cur.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {column})")
+    cur.execute(f"ALTER TABLE {table} ADD UNIQUE (symbol, {column})")
+
+    cur.execute(f"SELECT MIN({column}) FROM {old}")
+    first = cur.fetchone()[0] or date.today()
+    created = _create_monthly_partitions(
+        cur, table, first, _month_start(date.today(), PARTITION_MONTHS_AHEAD)
+    )
+
+    cur.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    copied = cur.rowcount
+
+    cur.execute("SELECT pg_get_serial_sequence(%s, 'id')", (old,))
+    sequence = cur.fetchone()[0]
+    if sequence:
+        cur.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+    cur.execute(f"DROP TABLE {old}")
+
+    logger.info(f"Partitioned {table}: {created} partitions, {copied} rows copied")
+
+
+def migrate():
+    """Convert the time-series tables to monthly range partitions."""
+    if not DATABASE_URL:
+        logger.error("DATABASE_URL not configured")
+        return False
+
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+        cur = conn.cursor()
+
+        for table, column in PARTITIONED_TABLES.items():
+            cur.execute("""
+                SELECT c.relkind FROM pg_class c
+                WHERE c.oid = to_regclass(%s)
+            """, (table,))
+            row = cur.fetchone()
+            if row is None:
+                logger.info(f"{table} does not exist yet, init_database will create it partitioned")
+            elif row[0] == 'p':
+                logger.info(f"{table} already partitioned, skipping")
+            else:
+                _partition_table(cur, table, column)
+
+        conn.commit()
+        cur.close()
+        conn.close()
+
+        # Recreate named indexes on the partitioned parents
+        init_database(force=True)
+        logger.info("✓ Migration completed successfully")
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    exit(0 if success else 1)
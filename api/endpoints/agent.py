@@ -222,7 +222,7 @@ class InweztAgent:
             
             # ========== POST-CHECK: Response Sanitization ==========
             # Only sanitize at the end for performance, or we can sanitize chunks
-            response_text = self.response_guard.sanitize_response(response_text, query)
+            response_text = self.response_guard.sanitize_response(response_text, query, query_lower)
             
             # ========== POST-CHECK: Fact Verification ==========
             fact_result = self.fact_checker.check(response_text, final_result.get("data"))
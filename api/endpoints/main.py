@@ -3,6 +3,7 @@ Inwezt AI Interface - FastAPI Application
 Main entry point for the AI Interface API.
 Production-hardened with rate limiting, error tracking, and observability.
 """
+import asyncio
 import os
 import time
 from typing import Optional
@@ -36,6 +37,12 @@ try:
 except ImportError:
     PROMETHEUS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Import our modules
 from api.endpoints.config import config
 from api.endpoints.models import (
@@ -91,6 +98,17 @@ def sanitize_data(data):
         return float(data)
     return data
 
+
+def ndjson_line(data) -> bytes:
+    """Serialize one stream event as an NDJSON line (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    import json
+    return (json.dumps(data) + "\n").encode("utf-8")
+
 app = FastAPI(
     title=config.APP_NAME,
     description="AI-powered financial assistant for Indian Stock Market",
@@ -126,6 +144,15 @@ if PROMETHEUS_AVAILABLE:
 log.info(f"Inwezt AI {config.APP_VERSION} initialized (Rate Limit: {RATE_LIMIT_AVAILABLE}, Sentry: {SENTRY_AVAILABLE})")
 
 
+@app.on_event("startup")
+async def create_upcoming_partitions():
+    """Create the coming months' time-series partitions so new rows never land in DEFAULT."""
+    from api.database.database import ensure_partitions
+    created = await asyncio.to_thread(ensure_partitions)
+    if created:
+        log.info(f"Created {created} time-series partitions")
+
+
 # =============================================================================
 # API ENDPOINTS
 # =============================================================================
@@ -198,10 +225,9 @@ async def readiness_check():
     
     # Check database connection
     try:
-        from api.database.database import get_connection
-        conn = get_connection()
-        if conn:
-            conn.close()
+        from api.database.database import _conn
+        with _conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT 1")
             checks["database"] = True
     except Exception as e:
         log.warning(f"Database health check failed: {e}")
@@ -274,7 +300,6 @@ async def chat_stream(request: QueryRequest):
     Streaming endpoint: Process a user query and stream "thinking" steps and final response.
     """
     from fastapi.responses import StreamingResponse
-    import json
 
     def event_generator():
         """Synchronous generator that yields agent events as NDJSON."""
@@ -295,11 +320,11 @@ async def chat_stream(request: QueryRequest):
                 user_id=request.session_id,  # PERSONALIZATION: Pass user ID for learning
                 analysis_mode=request.analysis_mode.value  # Analysis depth mode
             ):
-                yield json.dumps(sanitize_data(event)) + "\n"
+                yield ndjson_line(sanitize_data(event))
         except Exception as e:
             import logging
             logging.getLogger("uvicorn.error").error(f"Streaming error: {str(e)}", exc_info=True)
-            yield json.dumps({"status": "error", "response": str(e)}) + "\n"
+            yield ndjson_line({"status": "error", "response": str(e)})
 
     return StreamingResponse(
         event_generator(), 
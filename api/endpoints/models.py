@@ -149,7 +149,8 @@ class StockData(BaseModel):
 
 class ChartData(BaseModel):
     """Chart data returned from visual RAG."""
-    base64: str = Field(..., description="Base64 encoded PNG image")
+    base64: str = Field(..., description="Base64 encoded PNG (or SVG, see format) image")
+    format: str = Field("png", description="Image format of base64: png or svg")
     type: str = Field(..., description="Chart type: revenue_trend, margin_trend, etc.")
     title: str = Field(..., description="Chart title")
     symbol: str = Field(..., description="Stock symbol")
@@ -0,0 +1,17 @@
+"""
+pytest setup for api/tests.
+
+Test modules import from the project root (api.*, data_platform.*) and from
+api/ itself (core.*, utils.*, database.*). Both directories are put on
+sys.path once here, before any test module is collected; the path lines in
+each test only matter when it is run as a script.
+"""
+import os
+import sys
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = os.path.dirname(API_DIR)
+
+for path in (PROJECT_ROOT, API_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
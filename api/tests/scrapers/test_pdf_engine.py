@@ -8,9 +8,35 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("TestPDFEngine")
 
 # Add paths
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
-from api.core.document.pdf_engine import PDFEngine
+from api.core.document.pdf_engine import PDFEngine, PDFIUM_AVAILABLE
+
+
+def _make_pdf(pages):
+    """Minimal PDF with one line of Helvetica text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = b"%PDF-1.4\n", []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
 
 def test_pdf_extraction_empty():
     engine = PDFEngine()
@@ -25,7 +51,33 @@ def test_pdf_extraction_invalid():
     assert result["full_text"] == ""
     logger.info("Test invalid PDF passed")
 
+def test_pdf_extraction_sections():
+    engine = PDFEngine()
+    pdf = _make_pdf(["Cover page", "Chairman's Message to shareholders", "Letter continues",
+                     "Management Discussion and Analysis", "Closing notes"])
+
+    # Bytes and a file object give the same result
+    for source in (pdf, io.BytesIO(pdf)):
+        result = engine.extract_content(source)
+        assert result["page_count"] == 5
+        assert result["full_text"].split("\n")[0] == "Cover page"
+        assert result["sections"]["chairman_letter"].startswith("Chairman")
+        assert "Letter continues" in result["sections"]["chairman_letter"]
+        assert result["sections"]["mda"] == "Management Discussion and Analysis\nClosing notes"
+        assert result["sections"]["risks"] == ""
+
+    # PDFium and the pdfplumber fallback read the same page text
+    if PDFIUM_AVAILABLE:
+        stripped = lambda texts: [t.strip() for t in texts]
+        assert stripped(engine._page_texts_pdfium(io.BytesIO(pdf))) == stripped(engine._page_texts_pdfplumber(io.BytesIO(pdf)))
+
+    # Two headers on one page both start a section
+    result = engine.extract_content(_make_pdf(["Key Risks and Future Outlook", "Details"]))
+    assert result["sections"]["risks"] == result["sections"]["outlook"] == "Key Risks and Future Outlook\nDetails"
+    logger.info("Test section extraction passed")
+
 if __name__ == "__main__":
     test_pdf_extraction_empty()
     test_pdf_extraction_invalid()
+    test_pdf_extraction_sections()
     print("All basic PDF engine tests passed!")
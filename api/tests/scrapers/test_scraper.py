@@ -2,8 +2,10 @@ import logging
 import sys
 import os
 
-# Add the inwezt_app directory to path
-sys.path.append("/Users/brainx/Desktop/Create/inwezt_app")
+# Add the project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 from data_platform.scrapers.orchestrator import ScraperOrchestrator
 from api.database.database import init_database
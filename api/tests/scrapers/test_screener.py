@@ -0,0 +1,232 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add paths
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from data_platform.scrapers import screener
+from data_platform.scrapers.screener import ScreenerScraper, AIOHTTP_AVAILABLE, SELECTOLAX_AVAILABLE
+
+# Trimmed copy of a Screener company page: everything the scraper reads lives in #documents
+COMPANY_PAGE = """
+<html><head><title>Example Ltd share price</title></head><body>
+<nav class="u-full-width"><a href="/login/">Login</a><a href="/annual-report-guide.html">Guide</a></nav>
+<section id="top" class="card card-large">
+  <h1>Example Ltd</h1>
+  <ul id="top-ratios"><li><span class="name">Market Cap</span><span class="number">1,234</span></li></ul>
+</section>
+<section id="peers" class="card card-large"><h2>Peer comparison</h2><table><tr><td>Peer Ltd</td></tr></table></section>
+<section id="documents" class="card card-large">
+  <div class="flex flex-space-between"><h2>Documents</h2></div>
+  <div class="flex flex-gap-small">
+    <div class="documents announcements flex-column">
+      <h3 class="margin-bottom-8">Announcements</h3>
+      <ul class="list-links">
+        <li><a href="https://www.bseindia.com/xml-data/corpfiling/AttachLive/a1.pdf" target="_blank">Board Meeting Outcome for Results</a>
+          <div class="ink-600 smaller fill-muted">12 Nov 2024 - outcome of board meeting</div></li>
+        <li><a href="/announcements/2/">Intimation of Record Date</a><div class="fill-muted">3 Jul 2023</div></li>
+        <li><a href="/x/">Tiny</a></li>
+      </ul>
+    </div>
+    <div class="documents annual-reports flex-column">
+      <h3 class="margin-bottom-8">Annual reports</h3>
+      <ul class="list-links">
+        <li><a href="https://www.bseindia.com/bseplus/AnnualReport/500001/74448500001.pdf" target="_blank">
+          Financial Year 2024 <div class="ink-600 smaller">from bse</div></a></li>
+        <li><a href="https://www.screener.in/AnnualReports/ar2023.pdf">Financial Year 2023</a></li>
+        <li><a href="/company/EXAMPLE/annual/">Older reports</a></li>
+      </ul>
+    </div>
+    <div class="documents credit-ratings flex-column">
+      <h3 class="margin-bottom-8">Credit ratings</h3>
+      <ul class="list-links">
+        <li><a href="https://www.icra.in/Rationale/r1.pdf">Rating update<div class="fill-muted">28 Oct 2020 from care</div></a></li>
+      </ul>
+    </div>
+    <div class="documents concalls flex-column">
+      <h3 class="margin-bottom-8">Concalls</h3>
+      <ul class="list-links">
+        <li class="flex flex-gap-8 flex-wrap">
+          <div class="ink-600 font-size-15 nowrap">Oct 2024</div>
+          <a class="concall-link" href="https://www.bseindia.com/t1.pdf" target="_blank">Transcript</a>
+          <button class="concall-link" data-url="/concalls/summary/1/">AI Summary</button>
+          <a class="concall-link" href="/ppt/oct24.pdf">PPT</a>
+          <a class="concall-link" href="https://youtu.be/rec1">REC</a>
+        </li>
+        <li class="flex flex-gap-8 flex-wrap">
+          <div class="ink-600 font-size-15 nowrap">Feb 2024</div>
+          <a class="concall-link" href="/concalls/summary/2/">AI Summary</a>
+          <a class="concall-link" href="/notes/feb24.pdf">Notes</a>
+        </li>
+        <li class="flex flex-gap-8 flex-wrap">
+          <div class="ink-600 font-size-15 nowrap">15/05/2023</div>
+          <a class="concall-link" href="/ppt/may23.pdf">Presentation</a>
+        </li>
+        <li class="flex flex-gap-8 flex-wrap"><div>Upcoming</div><a href="/t/upcoming.pdf">Transcript</a></li>
+      </ul>
+    </div>
+  </div>
+</section>
+<footer><a href="/annual-report-faq.pdf">Annual report FAQ</a></footer>
+</body></html>
+"""
+
+
+def _fetch(page=COMPANY_PAGE):
+    scraper = ScreenerScraper()
+    scraper.metadata_cache_ttl = 0
+    scraper._make_request = lambda url, **kwargs: type("Response", (), {"text": page})()
+    try:
+        return scraper.fetch_metadata("EXAMPLE")
+    finally:
+        scraper.close()
+
+
+def test_screener_metadata():
+    metadata = _fetch()
+    by_type = {}
+    for meta in metadata:
+        by_type.setdefault(meta["type"], []).append(meta)
+
+    reports = by_type["Annual Report"]
+    assert [(r["fiscal_year"], r["url"]) for r in reports] == [
+        ("2024", "https://www.bseindia.com/bseplus/AnnualReport/500001/74448500001.pdf"),
+        ("2023", "https://www.screener.in/AnnualReports/ar2023.pdf"),
+    ]
+    assert reports[0]["title"] == "Annual Report Financial Year 2024 from bse"
+
+    concalls = by_type["Concall"]
+    assert [(c["date_str"], c["fiscal_year"], c["quarter"]) for c in concalls] == [
+        ("Oct 2024", "2025", "Q3"), ("Feb 2024", "2024", "Q4"), ("15/05/2023", "2024", "Q1"),
+    ]
+    assert concalls[0]["links"] == {
+        "transcript": "https://www.bseindia.com/t1.pdf",
+        "ppt": "https://www.screener.in/ppt/oct24.pdf",
+        "recording": "https://youtu.be/rec1",
+    }
+    assert concalls[1]["links"] == {
+        "ai_summary": "https://www.screener.in/concalls/summary/2/",
+        "transcript": "https://www.screener.in/notes/feb24.pdf",
+    }
+    assert concalls[2]["links"] == {"ppt": "https://www.screener.in/ppt/may23.pdf"}
+
+    announcements = by_type["Announcement"]
+    assert [(a["title"], a["date_str"], a["fiscal_year"]) for a in announcements] == [
+        ("Board Meeting Outcome for Results", "Nov 2024", "2025"),
+        ("Intimation of Record Date", "Jul 2023", "2024"),
+    ]
+
+    ratings = by_type["Credit Rating"]
+    assert [(r["title"], r["date_str"], r["fiscal_year"]) for r in ratings] == [("Credit Rating (care)", "Oct 2020", "2021")]
+
+    # Links outside the documents section are not parsed
+    assert not any("faq" in m.get("url", "") for m in metadata)
+
+    assert all(m["fy_int"] == (int(m["fiscal_year"]) if m["fiscal_year"].isdigit() else None) for m in metadata)
+
+
+def test_screener_without_documents_section():
+    # Pages without #documents are parsed in full
+    page = COMPANY_PAGE.replace('<section id="documents"', '<section id="filings"')
+    assert [m["type"] for m in _fetch(page)].count("Concall") == 3
+
+
+def test_screener_parsers_agree():
+    if not SELECTOLAX_AVAILABLE:
+        return
+    # The lexbor and BeautifulSoup paths must extract the same documents
+    pages = [COMPANY_PAGE, COMPANY_PAGE.replace('<section id="documents"', '<section id="filings"'),
+             COMPANY_PAGE.replace("documents concalls flex-column", "flex-column")]
+    try:
+        for page in pages:
+            screener.SELECTOLAX_AVAILABLE = False
+            expected = _fetch(page)
+            screener.SELECTOLAX_AVAILABLE = True
+            assert _fetch(page) == expected
+    finally:
+        screener.SELECTOLAX_AVAILABLE = SELECTOLAX_AVAILABLE
+
+
+def test_screener_metadata_cache():
+    scraper = ScreenerScraper()
+    requests_made = []
+
+    def make_request(url, **kwargs):
+        requests_made.append(url)
+        if "BROKEN" in url:
+            raise ConnectionError("down")
+        return type("Response", (), {"text": COMPANY_PAGE})()
+    scraper._make_request = make_request
+
+    first = scraper.fetch_metadata("CACHED")
+    assert scraper.fetch_metadata("cached") == first
+    assert len(requests_made) == 1
+
+    # Failed fetches are not cached
+    assert scraper.fetch_metadata("BROKEN") == []
+    assert scraper.fetch_metadata("BROKEN") == []
+    assert len(requests_made) == 3
+    scraper.close()
+
+
+def test_screener_metadata_many():
+    if not AIOHTTP_AVAILABLE:
+        return
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(0.2)
+            body = COMPANY_PAGE.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    scraper = ScreenerScraper()
+    scraper.metadata_cache_ttl = 0
+    scraper.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}/company/"
+    try:
+        symbols = [f"MANY{i}" for i in range(8)]
+        start = time.monotonic()
+        results = asyncio.run(scraper.fetch_metadata_many(symbols, concurrency=8, rate=100))
+        # Pages are fetched concurrently, not one 0.2s request after another
+        assert time.monotonic() - start < 1.2
+        assert list(results) == symbols
+        assert all(len(r) == len(results["MANY0"]) > 0 for r in results.values())
+    finally:
+        server.shutdown()
+        scraper.close()
+
+
+def test_screener_fiscal_dates():
+    scraper = ScreenerScraper()
+    assert scraper._extract_fy_from_date("Mar 2024") == "2024"
+    assert scraper._extract_fy_from_date("Apr 2024") == "2025"
+    assert scraper._extract_fy_from_date("03/04/2023") == "2024"
+    assert scraper._extract_fy_from_date("filed in 2019") == "2019"
+    assert scraper._extract_fy_from_date("no date") == "Unknown"
+    assert scraper._extract_quarter_from_date("Aug 2023") == "Q2"
+    assert scraper._extract_quarter_from_date("10/01/2023") == "Q4"
+    assert scraper._extract_quarter_from_date("sometime") == "Unknown"
+    scraper.close()
+
+
+if __name__ == "__main__":
+    test_screener_metadata()
+    test_screener_without_documents_section()
+    test_screener_parsers_agree()
+    test_screener_metadata_cache()
+    test_screener_metadata_many()
+    test_screener_fiscal_dates()
+    print("✅ Screener parsing checks passed")
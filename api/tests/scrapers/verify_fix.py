@@ -7,7 +7,9 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("VerifyScraper")
 
 # Add paths
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 from data_platform.scrapers.bulk_ingest import run_bulk_ingest
 
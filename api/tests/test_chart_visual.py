@@ -1,32 +1,35 @@
-import base64
 import sys
 import os
+import base64
+import xml.etree.ElementTree as ET
 # Add project root to path
 # Add project root (the directory containing 'backend') to path for absolute imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from api.core.charting.generator import ChartGenerator, save_chart_image
+
+# Mock data mirroring 2020-2026 reports
+ANNUAL_DATA = (
+    {"fiscal_year": "2020", "revenue_cr": 150000, "net_profit_cr": 12000},
+    {"fiscal_year": "2021", "revenue_cr": 180000, "net_profit_cr": 15000},
+    {"fiscal_year": "2022", "revenue_cr": 210000, "net_profit_cr": 18000},
+    {"fiscal_year": "2023", "revenue_cr": 240000, "net_profit_cr": 22000},
+    {"fiscal_year": "2024", "revenue_cr": 280000, "net_profit_cr": 25000},
+    {"fiscal_year": "2025", "revenue_cr": 310000, "net_profit_cr": 28000},
+    {"fiscal_year": "2026", "revenue_cr": 290000, "net_profit_cr": 24000}, # Decline to test logic
+)
 
-from api.core.charting.generator import ChartGenerator
+# Format for revenue_trend as done in generate_relevant_chart
+CHART_DATA = tuple({"period": f"FY{str(a.get('fiscal_year', ''))[-2:]}",
+                    "value": a.get("revenue_cr", 0)} for a in ANNUAL_DATA)
 
 def test_annual_chart():
     cg = ChartGenerator()
     
-    # Mock data mirroring 2020-2026 reports
-    data = [
-        {"fiscal_year": "2020", "revenue_cr": 150000, "net_profit_cr": 12000},
-        {"fiscal_year": "2021", "revenue_cr": 180000, "net_profit_cr": 15000},
-        {"fiscal_year": "2022", "revenue_cr": 210000, "net_profit_cr": 18000},
-        {"fiscal_year": "2023", "revenue_cr": 240000, "net_profit_cr": 22000},
-        {"fiscal_year": "2024", "revenue_cr": 280000, "net_profit_cr": 25000},
-        {"fiscal_year": "2025", "revenue_cr": 310000, "net_profit_cr": 28000},
-        {"fiscal_year": "2026", "revenue_cr": 290000, "net_profit_cr": 24000}, # Decline to test logic
-    ]
-    
-    # Format for revenue_trend as done in generate_relevant_chart
-    chart_data = [{"period": f"FY{str(a.get('fiscal_year', ''))[-2:]}", 
-                 "value": a.get("revenue_cr", 0)} for a in data]
-    
     # Generate chart
-    chart = cg.revenue_trend(chart_data, "RELIANCE", title_prefix="Annual")
+    chart = cg.revenue_trend(CHART_DATA, "RELIANCE", title_prefix="Annual")
     
     print(f"Chart Type: {chart['type']}")
     print(f"Chart Title: {chart['title']}")
@@ -37,9 +40,39 @@ def test_annual_chart():
     os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, "annual_trend_test.png")
     
-    with open(output_path, "wb") as f:
-        f.write(base64.b64decode(chart["base64"]))
+    save_chart_image(chart["base64"], output_path)
     print(f"✅ Saved {output_path}")
 
+def _svg_root(chart):
+    assert chart["format"] == "svg"
+    return ET.fromstring(base64.b64decode(chart["base64"]))
+
+
+def test_svg_charts():
+    cg = ChartGenerator(output_format="svg")
+    svg_ns = "{http://www.w3.org/2000/svg}"
+
+    # Labels with XML special characters must come back as text, not break the document
+    data = [dict(row, period=f'{row["period"]} <"R&D">') for row in CHART_DATA]
+    root = _svg_root(cg.revenue_trend(data, "M&M", company_name="Mahindra & Mahindra", title_prefix="Annual"))
+    texts = [el.text for el in root.iter(f"{svg_ns}text")]
+    assert 'FY20 <"R&D">' in texts
+    assert any(t and "Mahindra & Mahindra (M&M)" in t for t in texts)
+
+    margins = [{"period": f"FY{y} <Q&A>", "net_margin": 8.0 + y / 10} for y in range(20, 26)]
+    root = _svg_root(cg.margin_trend(margins, "M&M", title_prefix="Annual"))
+    assert "FY20 <Q&A>" in [el.text for el in root.iter(f"{svg_ns}text")]
+
+    root = _svg_root(cg.valuation_gauge(24.5, 20.0, 12.0, 35.0, "M&M"))
+    assert root.tag == f"{svg_ns}svg"
+
+    # Charts without an SVG template say they fell back to PNG
+    card = cg.simple_metric_card(1234.5, "Revenue & Other Income", change=4.2, symbol="M&M")
+    assert card["format"] == "png"
+    assert base64.b64decode(card["base64"]).startswith(b"\x89PNG")
+
+
 if __name__ == "__main__":
     test_annual_chart()
+    test_svg_charts()
+    print("✅ SVG charts parse")
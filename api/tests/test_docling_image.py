@@ -7,7 +7,9 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.colors import red
 
 # Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if api_dir not in sys.path:
+    sys.path.append(api_dir)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,199 @@
+import sys
+import os
+from contextlib import contextmanager
+import numpy as np
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from api.database import embeddings
+from api.database.embeddings import cosine_similarity, normalize_documents, search_similar
+
+
+def test_cosine_similarity():
+    assert abs(cosine_similarity([1, 0], [1, 0]) - 1.0) < 1e-6
+    assert abs(cosine_similarity([1, 0], [0, 2])) < 1e-6
+    assert abs(cosine_similarity([3, 4], [6, 8]) - 1.0) < 1e-6
+
+    # Empty, mismatched and zero vectors score 0
+    assert cosine_similarity([], []) == 0.0
+    assert cosine_similarity([1, 0], [1, 0, 0]) == 0.0
+    assert cosine_similarity([1, 0], [0, 0]) == 0.0
+
+
+def test_search_similar_ranking():
+    docs = normalize_documents([
+        {"text": "a", "embedding": [0.0, 5.0, 0.0]},
+        {"text": "b", "embedding": [2.0, 0.0, 0.0]},
+        {"text": "c", "embedding": None},
+        {"text": "d", "embedding": [1.0, 1.0, 0.0]},
+        {"text": "e", "embedding": [1.0, 0.0]},
+        {"text": "f", "embedding": [0.0, 0.0, 0.0]},
+    ])
+    assert abs(np.linalg.norm(docs[0]["embedding"]) - 1.0) < 1e-6
+
+    original = embeddings.get_embedding
+    embeddings.get_embedding = lambda text: [3.0, 0.0, 0.0]
+    try:
+        results = search_similar("query", docs, top_k=3)
+    finally:
+        embeddings.get_embedding = original
+
+    # Docs without embeddings are skipped; mismatched/zero vectors score 0 and tie in input order
+    assert [r["text"] for r in results] == ["b", "d", "a"]
+    assert abs(results[0]["similarity"] - 1.0) < 1e-6
+    assert abs(results[1]["similarity"] - np.sqrt(0.5)) < 1e-6
+
+
+
+def test_top_k_indices():
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        # Few distinct values so ties straddle the top-k boundary
+        scores = rng.integers(0, 4, size=rng.integers(1, 30)).astype(np.float32)
+        k = int(rng.integers(0, 35))
+        expected = np.argsort(-scores, kind="stable")[:k]
+        assert embeddings._top_k_indices(scores, k).tolist() == expected.tolist()
+
+
+def test_quantized_storage():
+    rng = np.random.default_rng(3)
+    vec = rng.normal(size=embeddings.ACTIVE_DIMS).tolist()
+    buf = embeddings._to_bytes(vec)
+    assert len(buf) == 4 + embeddings.ACTIVE_DIMS
+
+    # int8 round trip keeps the cosine similarity within ~1e-3
+    decoded = embeddings._from_bytes(buf)
+    assert abs(cosine_similarity(vec, decoded) - 1.0) < 1e-3
+
+    # Vectors stored as raw float32 still decode
+    legacy = np.asarray(vec, dtype=np.float32).tobytes()
+    assert np.allclose(embeddings._from_bytes(legacy), vec, atol=1e-6)
+
+
+def test_truncate_tokens():
+    text = "Reliance Industries reported strong Q3 results. " * 100
+    short = embeddings.truncate_tokens(text, 20)
+    assert text.startswith(short) and 0 < len(short) < len(text)
+    assert embeddings.truncate_tokens("TCS wins deal", 20) == "TCS wins deal"
+
+
+def test_embedding_cache():
+    calls = []
+
+    def fetch(text):
+        calls.append(text)
+        return [float(len(text)), 1.0]
+
+    original = embeddings._fetch_embedding
+    embeddings._fetch_embedding = fetch
+    embeddings._embedding_cache.clear()
+    try:
+        assert embeddings.get_embedding("reliance q3") == [11.0, 1.0]
+        assert embeddings.get_embedding("reliance q3") == [11.0, 1.0]
+        assert calls == ["reliance q3"]
+
+        # Batches reuse cached vectors and only leave misses to embed
+        result, indices, batches = embeddings._prepare_batches(["reliance q3", "", "tcs"], batch_size=10)
+        assert result[0] == [11.0, 1.0] and indices == [2] and batches == [["tcs"]]
+    finally:
+        embeddings._fetch_embedding = original
+        embeddings._embedding_cache.clear()
+
+
+def _fake_news_db(rows, queries):
+    """Stand-in for database._conn that serves rows and counts queries."""
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, sql, params=None):
+            queries.append(params)
+
+        def fetchall(self):
+            return rows
+
+    class Conn:
+        def cursor(self):
+            return Cursor()
+
+    @contextmanager
+    def conn():
+        yield Conn()
+
+    return conn
+
+
+def _unit(*values):
+    vec = np.zeros(embeddings.ACTIVE_DIMS, dtype=np.float32)
+    vec[:len(values)] = values
+    return (vec / np.linalg.norm(vec)).tolist()
+
+
+def test_semantic_context_cache():
+    from api.database import database
+
+    vectors = {
+        "TCS Q3 results": _unit(1.0),
+        "TCS Q3 earnings update": _unit(1.0, 0.1),
+        "TCS Q4 results": _unit(1.0),
+        "TCS dividend": _unit(0.0, 1.0),
+    }
+    embedded = []
+
+    def embed(text):
+        embedded.append(text)
+        return vectors[text]
+
+    rows = [
+        ("TCS Q3 profit up 8%", "Margins improved", None, "ET", embeddings._to_bytes(_unit(1.0))),
+        ("TCS declares dividend", "Record date set", None, "ET", embeddings._to_bytes(_unit(0.0, 1.0))),
+    ]
+    queries = []
+    original_conn, original_embed = database._conn, embeddings.get_embedding
+    database._conn = _fake_news_db(rows, queries)
+    embeddings.get_embedding = embed
+    embeddings._semantic_cache.clear()
+    try:
+        context = embeddings.build_semantic_context("TCS Q3 results", symbol="TCS", top_k=1)
+        assert "TCS Q3 profit up 8%" in context and len(queries) == 1
+
+        # Same query after normalisation: served from the cache without embedding it
+        embedded.clear()
+        assert embeddings.build_semantic_context("tcs  q3 RESULTS?", symbol="TCS", top_k=1) == context
+        assert len(queries) == 1 and embedded == []
+
+        # Close paraphrase with the same numbers: served from the cache
+        assert embeddings.build_semantic_context("TCS Q3 earnings update", symbol="TCS", top_k=1) == context
+        assert len(queries) == 1
+
+        # Same embedding but a different quarter, or an unrelated query: misses
+        embeddings.build_semantic_context("TCS Q4 results", symbol="TCS", top_k=1)
+        assert len(queries) == 2
+        context = embeddings.build_semantic_context("TCS dividend", symbol="TCS", top_k=1)
+        assert "TCS declares dividend" in context and len(queries) == 3
+
+        # Without embedded articles nothing is embedded or cached
+        rows[:] = [(headline, summary, date, source, None) for headline, summary, date, source, _ in rows]
+        embedded.clear()
+        context = embeddings.build_semantic_context("INFY outlook", symbol="INFY", top_k=1)
+        assert "TCS Q3 profit up 8%" in context
+        assert embedded == [] and not embeddings._semantic_cache.get(("INFY", 1))
+    finally:
+        database._conn, embeddings.get_embedding = original_conn, original_embed
+        embeddings._semantic_cache.clear()
+
+
+if __name__ == "__main__":
+    test_cosine_similarity()
+    test_search_similar_ranking()
+    test_top_k_indices()
+    test_quantized_storage()
+    test_truncate_tokens()
+    test_embedding_cache()
+    test_semantic_context_cache()
+    print("✅ Embedding checks passed")
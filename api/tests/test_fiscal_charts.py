@@ -2,13 +2,16 @@
 """Test fiscal.ai-style chart generation"""
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if api_dir not in sys.path:
+    sys.path.insert(0, api_dir)
 
-from utils.visual_rag import ChartGenerator
-import base64
+from core.charting.generator import ChartGenerator, save_chart_image
 
 def test_fiscal_charts():
     gen = ChartGenerator()
+    output_dir = os.path.join(os.path.dirname(__file__), "artifacts")
+    os.makedirs(output_dir, exist_ok=True)
     
     # 1. Test Revenue Trend (fiscal.ai style)
     print("Testing Revenue Trend...")
@@ -22,8 +25,7 @@ def test_fiscal_charts():
     ]
     
     revenue_chart = gen.revenue_trend(revenue_data, "RELIANCE", "Reliance Industries")
-    with open("fiscal_revenue_chart.png", "wb") as f:
-        f.write(base64.b64decode(revenue_chart["base64"]))
+    save_chart_image(revenue_chart["base64"], os.path.join(output_dir, "fiscal_revenue_chart.png"))
     print(f"  ✅ Revenue chart: {len(revenue_chart['base64'])} chars")
     print(f"     CAGR: {revenue_chart['metrics']['cagr']:.1f}%")
     
@@ -37,8 +39,7 @@ def test_fiscal_charts():
     ]
     
     margin_chart = gen.margin_trend(margin_data, "RELIANCE")
-    with open("fiscal_margin_chart.png", "wb") as f:
-        f.write(base64.b64decode(margin_chart["base64"]))
+    save_chart_image(margin_chart["base64"], os.path.join(output_dir, "fiscal_margin_chart.png"))
     print(f"  ✅ Margin chart: {len(margin_chart['base64'])} chars")
     
     # 3. Test Valuation Gauge (fiscal.ai style)
@@ -50,12 +51,11 @@ def test_fiscal_charts():
         historical_high=35.0,
         symbol="RELIANCE"
     )
-    with open("fiscal_gauge_chart.png", "wb") as f:
-        f.write(base64.b64decode(gauge["base64"]))
+    save_chart_image(gauge["base64"], os.path.join(output_dir, "fiscal_gauge_chart.png"))
     print(f"  ✅ Gauge chart: {len(gauge['base64'])} chars")
     
     print("\n✅ All fiscal.ai-style charts generated!")
-    print("   Check: fiscal_revenue_chart.png, fiscal_margin_chart.png, fiscal_gauge_chart.png")
+    print(f"   Check: {output_dir}/ (fiscal_revenue_chart.png, fiscal_margin_chart.png, fiscal_gauge_chart.png)")
 
 if __name__ == "__main__":
     test_fiscal_charts()
@@ -1,8 +1,7 @@
-import base64
 import os
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from utils.visual_rag import ChartGenerator
+from core.charting.generator import ChartGenerator, save_chart_image
 from database.database import get_connection
 
 def generate_honest_chart():
@@ -52,8 +51,7 @@ def generate_honest_chart():
     
     # Save image
     out_path = "honest_annual_trend.png"
-    with open(out_path, "wb") as f:
-        f.write(base64.b64decode(chart["base64"]))
+    save_chart_image(chart["base64"], out_path)
     print(f"✅ Saved {out_path}")
 
 if __name__ == "__main__":
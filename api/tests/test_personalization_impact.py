@@ -6,7 +6,8 @@ Demonstrates ACTUAL response differences with vs without personalization.
 import os
 import sys
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.insert(0, project_root)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from dotenv import load_dotenv
 load_dotenv(os.path.join(project_root, '.env'))
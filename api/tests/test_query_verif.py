@@ -5,9 +5,12 @@ import json
 
 # Add project root to path
 # Add project root (the directory containing 'backend') to path for absolute imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 from api.agents.orchestrator import OrchestratorV2
+from api.core.charting.generator import save_chart_image
 
 async def main():
     print("Initializing OrchestratorV2...")
@@ -41,13 +44,11 @@ async def main():
                 print(f"Insight: {chart.get('insight')}")
                 
                 # Save image to artifacts folder
-                import base64
                 output_dir = os.path.join(os.path.dirname(__file__), "artifacts")
                 os.makedirs(output_dir, exist_ok=True)
                 output_path = os.path.join(output_dir, "latest_verification_chart.png")
                 
-                with open(output_path, "wb") as f:
-                    f.write(base64.b64decode(chart.get("base64")))
+                save_chart_image(chart.get("base64"), output_path)
                 print(f"✅ Chart saved to {output_path}")
                 
                 chart_info_printed = True
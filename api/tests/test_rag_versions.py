@@ -10,7 +10,8 @@ from datetime import datetime
 
 # Add parent (inwezt_app) to path so 'backend' module can be found
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, parent_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
 
 # Load environment
 from dotenv import load_dotenv
@@ -2,16 +2,18 @@
 """Test Visual RAG Integration - Generates response with chart"""
 import os
 import sys
-import base64
 
 # Add parent dir for backend module
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+api_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if api_dir not in sys.path:
+    sys.path.insert(0, api_dir)
 
 from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 os.environ['LLM_PROVIDER'] = 'mistral'
 
 from api.agents.orchestrator import OrchestratorV2
+from api.core.charting.generator import save_chart_image
 
 print("Testing Visual RAG (V3) - Query with chart intent...")
 orch = OrchestratorV2()
@@ -45,8 +47,7 @@ if chart_data:
     print(f"   Base64 Size: {len(chart_data.get('base64', ''))} chars")
     
     # Save chart as PNG for verification
-    with open("generated_chart.png", "wb") as f:
-        f.write(base64.b64decode(chart_data.get('base64', '')))
+    save_chart_image(chart_data.get('base64', ''), "generated_chart.png")
     print(f"   Saved to: generated_chart.png")
 else:
     print("❌ No chart generated (data may not support chart type)")
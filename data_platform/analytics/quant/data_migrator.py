@@ -1,4 +1,5 @@
 from sqlalchemy import text
+from psycopg2.extras import execute_values
 from db_utils import AWSResourceConnector
 from models import StockPrice
 from typing import List
@@ -37,26 +38,28 @@ class DataMigrator:
         """
         Saves a list of StockPrice objects to the database.
         Uses a transaction to ensure all-or-nothing (Atomicity).
+        Rows are sent as multi-row INSERTs (execute_values) rather than one statement per price.
         """
         if not prices:
             return
 
-        insert_sql = text("""
+        insert_sql = """
             INSERT INTO stock_prices (symbol, price, currency, daily_change, daily_change_percent, fetched_at)
-            VALUES (:symbol, :price, :currency, :daily_change, :daily_change_percent, :timestamp)
-        """)
+            VALUES %s
+        """
+        rows = [
+            (p.symbol, p.price, p.currency, p.daily_change, p.daily_change_percent, p.timestamp)
+            for p in prices
+        ]
 
         try:
             with self.engine.begin() as conn: # .begin() starts a transaction automatically
-                for p in prices:
-                    conn.execute(insert_sql, {
-                        "symbol": p.symbol,
-                        "price": p.price,
-                        "currency": p.currency,
-                        "daily_change": p.daily_change,
-                        "daily_change_percent": p.daily_change_percent,
-                        "timestamp": p.timestamp
-                    })
+                # Raw DBAPI cursor on the same connection, so it shares the transaction
+                cur = conn.connection.cursor()
+                try:
+                    execute_values(cur, insert_sql, rows, page_size=500)
+                finally:
+                    cur.close()
             print(f"✅ ATOMICITY SUCCESS: Successfully saved {len(prices)} records to DB.")
         except Exception as e:
             print(f"❌ Transaction Failed! Rolling back. No data was saved. Error: {e}")
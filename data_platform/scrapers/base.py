@@ -3,16 +3,98 @@ Base Scraper - Industry-standard with built-in resilience
 Optimized for long-running EC2 overnight jobs.
 """
 import requests
+import asyncio
 import random
+import threading
 import time
 import logging
 from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
 from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from fake_useragent import UserAgent
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 logger = logging.getLogger("BaseScraper")
 
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+UA_POOL_SIZE = 20
+
+# Wait after a 429 when the server sends no usable Retry-After
+RATE_LIMIT_COOLDOWN = 60
+
+# Seconds a symbol's parsed metadata is reused by fetch_metadata (0 disables)
+METADATA_CACHE_TTL = 3600
+
+# Keep-alive pool per session (default HTTPAdapter keeps 10 connections per host)
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
+
+def build_session() -> requests.Session:
+    """
+    requests.Session with a large keep-alive connection pool, so repeated requests
+    to the same host skip the TCP/TLS handshake. Gateway errors are retried briefly
+    at the connection level before the scraper's own backoff applies.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def parse_retry_after(value: Optional[str], default: float = RATE_LIMIT_COOLDOWN) -> float:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class AsyncTokenBucket:
+    """
+    asyncio token bucket (same semantics as api/utils/rate_limiter.TokenBucket).
+    Requests go out as fast as tokens allow; pause() holds everyone back after a 429.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.resume_at = 0.0
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+    
+    async def acquire(self):
+        while True:
+            wait = self.resume_at - time.monotonic()
+            if wait <= 0:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+    
+    def pause(self, seconds: float):
+        self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+
 
 class BaseScraper(ABC):
     """
@@ -20,32 +102,23 @@ class BaseScraper(ABC):
     Features:
     - Automatic retries with exponential backoff
     - Random user agents to avoid detection
-    - Request jittering to be respectful
+    - Request jittering to be respectful (minimum spacing between requests)
     - Configurable timeouts
+    - Pooled keep-alive session, optionally shared between scrapers
     """
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
+        # Draw a pool of user agents once; picking from it per request needs no I/O
+        self._ua_pool = []
         try:
-            self.ua = UserAgent()
+            ua = UserAgent()
+            self._ua_pool = [ua.random for _ in range(UA_POOL_SIZE)]
         except Exception:
-            self.ua = None
             logger.warning("UserAgent initialization failed, using default")
+        if not self._ua_pool:
+            self._ua_pool = [DEFAULT_USER_AGENT]
         
-        self.session = requests.Session()
-        self.timeout = 30  # Increased timeout for large PDFs
-        self.max_retries = 3
-        
-    def _get_headers(self) -> Dict[str, str]:
-        """Generate random headers to avoid detection."""
-        user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        if self.ua:
-            try:
-                user_agent = self.ua.random
-            except:
-                pass
-                
-        return {
-            "User-Agent": user_agent,
+        self._base_headers = {
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
             "Accept-Encoding": "gzip, deflate",
@@ -53,6 +126,19 @@ class BaseScraper(ABC):
             "Upgrade-Insecure-Requests": "1",
             "Cache-Control": "max-age=0"
         }
+        
+        # Headers are sent per request, so a shared session carries no scraper-specific defaults
+        self._owns_session = session is None
+        self.session = session or build_session()
+        self.timeout = 30  # Increased timeout for large PDFs
+        self.max_retries = 3
+        self._last_request_at = 0.0
+        self._pace_lock = threading.Lock()
+        self.metadata_cache_ttl = METADATA_CACHE_TTL
+        
+    def _get_headers(self) -> Dict[str, str]:
+        """Generate random headers to avoid detection."""
+        return {"User-Agent": random.choice(self._ua_pool), **self._base_headers}
 
     @retry(
         stop=stop_after_attempt(3),
@@ -82,9 +168,14 @@ class BaseScraper(ABC):
         """
         headers = self._get_headers()
         
-        # Add random jitter between requests (1.5 - 4 seconds)
-        jitter = random.uniform(1.5, 4.0)
-        time.sleep(jitter)
+        # Keep a random 1.5 - 4 second gap between requests; time already spent
+        # since the last one (parsing, downloads, retry backoff) counts toward it.
+        # The lock keeps the spacing when several threads share this scraper.
+        with self._pace_lock:
+            gap = random.uniform(1.5, 4.0) - (time.monotonic() - self._last_request_at)
+            if gap > 0:
+                time.sleep(gap)
+            self._last_request_at = time.monotonic()
         
         try:
             response = self.session.request(
@@ -103,9 +194,10 @@ class BaseScraper(ABC):
             
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
-                # Rate limited - wait longer
-                logger.warning(f"Rate limited on {url}, waiting 60s...")
-                time.sleep(60)
+                # Rate limited - wait as long as the server asks
+                wait = parse_retry_after(e.response.headers.get("Retry-After"))
+                logger.warning(f"Rate limited on {url}, waiting {wait:.0f}s...")
+                time.sleep(wait)
                 raise  # Will be retried
             elif e.response.status_code == 403:
                 logger.error(f"Access forbidden for {url}")
@@ -126,11 +218,14 @@ class BaseScraper(ABC):
             raise
 
     def close(self):
-        """Close the session."""
-        if self.session:
+        """Close the session (a shared session is left to its owner)."""
+        if self.session and self._owns_session:
             self.session.close()
 
     @abstractmethod
     def fetch_metadata(self, symbol: str) -> List[Dict[str, Any]]:
-        """Fetch report/concall metadata for a given symbol."""
+        """
+        Fetch report/concall metadata for a given symbol.
+        Each item carries 'fiscal_year' and 'fy_int' (the year as an int, None when unknown).
+        """
         pass
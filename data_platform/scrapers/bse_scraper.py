@@ -67,9 +67,9 @@ class BSEScraper:
     4. Returns structured data with full content
     """
 
-    def __init__(self, rate_limit_delay: float = 2.5):
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+    def __init__(self, rate_limit_delay: float = 2.5, session: Optional[requests.Session] = None):
+        # HEADERS go on each request so the session can be shared with other scrapers
+        self.session = session or requests.Session()
         self.base_delay = rate_limit_delay
         self.delay = rate_limit_delay
         self.max_delay = 30.0
@@ -87,7 +87,7 @@ class BSEScraper:
         if self._cookies_initialized:
             return
         try:
-            self.session.get("https://www.bseindia.com/", timeout=10)
+            self.session.get("https://www.bseindia.com/", headers=HEADERS, timeout=10)
             self._cookies_initialized = True
         except Exception:
             pass
@@ -124,7 +124,7 @@ class BSEScraper:
         self._init_cookies()
         self._jitter()
         url = f"{BASE_API}/{endpoint}"
-        resp = self.session.get(url, params=params, timeout=30)
+        resp = self.session.get(url, params=params, headers=HEADERS, timeout=30)
 
         # Adaptive throttle BEFORE raise_for_status
         self._adapt_throttle(resp.status_code)
@@ -159,7 +159,7 @@ class BSEScraper:
 
         try:
             self._jitter()
-            resp = self.session.get(url, timeout=60, stream=True)
+            resp = self.session.get(url, headers=HEADERS, timeout=60, stream=True)
             resp.raise_for_status()
 
             content = resp.content
@@ -199,7 +199,7 @@ class BSEScraper:
 
         try:
             self._jitter()
-            resp = self.session.get(url, timeout=60)
+            resp = self.session.get(url, headers=HEADERS, timeout=60)
             self._adapt_throttle(resp.status_code)
             resp.raise_for_status()
 
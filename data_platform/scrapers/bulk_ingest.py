@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 """
 Bulk Ingest Script - Optimized for EC2 c7i.large overnight runs
-Run with: python3 bulk_ingest.py --instance 1 --total 10
+Run with: python3 bulk_ingest.py --concurrency 12
 """
+import asyncio
 import logging
-import time
 import sys
 import os
 import argparse
@@ -16,7 +16,12 @@ from typing import List
 # Add parent directory to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from data_platform.scrapers.orchestrator import ScraperOrchestrator
+# libuv event loop: cheaper scheduling for the many concurrent downloads (not on Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = sys.platform != "win32"
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 # Default NIFTY 500 list (fallback)
 NIFTY_500 = [
@@ -28,12 +33,15 @@ NIFTY_500 = [
 ]
 
 def load_stock_list(custom_path: str = None) -> List[str]:
-    """Load stock list from JSON file or fallback to NIFTY_500."""
+    """
+    Load stock list from a JSON list or a text file (one symbol per line),
+    or fallback to NIFTY_500.
+    """
     json_path = custom_path if custom_path else os.path.abspath(os.path.join(os.path.dirname(__file__), "all_stocks.json"))
     if os.path.exists(json_path):
         try:
             with open(json_path, 'r') as f:
-                stocks = json.load(f)
+                stocks = json.load(f) if json_path.endswith(".json") else f.read().split()
                 # Filter out numeric IDs and duplicates
                 stocks = [s for s in stocks if not isinstance(s, str) or not s.isdigit()]
                 return sorted(list(set(stocks)))
@@ -42,7 +50,22 @@ def load_stock_list(custom_path: str = None) -> List[str]:
     
     return sorted(list(set(NIFTY_500)))
 
-STOCKS_LIST = load_stock_list()
+def drop_covered(symbols: List[str]) -> List[str]:
+    """Drop stocks that already have full coverage (one DB query for the whole list)."""
+    from data_platform.scrapers.orchestrator import MIN_ANNUAL_REPORTS, MIN_CONCALLS
+    from api.database.database import get_stock_coverage_bulk
+    
+    coverage = get_stock_coverage_bulk(symbols)
+    return [
+        s for s in symbols
+        if not (coverage[s]['annual_reports'] >= MIN_ANNUAL_REPORTS and coverage[s]['concalls'] >= MIN_CONCALLS)
+    ]
+
+# Stocks ingested at the same time by the single coordinator
+DEFAULT_CONCURRENCY = 12
+
+# Stocks whose Screener metadata is fetched per fetch_metadata_many call
+METADATA_PREFETCH_BATCH = 50
 
 
 # Graceful shutdown handling
@@ -50,19 +73,16 @@ shutdown_requested = False
 
 def signal_handler(signum, frame):
     global shutdown_requested
-    print(f"\n[SIGNAL] Shutdown requested. Finishing current stock...")
+    print(f"\n[SIGNAL] Shutdown requested. Finishing stocks in progress...")
     shutdown_requested = True
 
-signal.signal(signal.SIGTERM, signal_handler)
-signal.signal(signal.SIGINT, signal_handler)
-
 
-def setup_logging(instance_id: int):
-    """Setup logging with instance-specific log file."""
+def setup_logging():
+    """Setup logging to the bulk ingest log file and stdout."""
     log_dir = os.path.join(os.path.dirname(__file__), "logs")
     os.makedirs(log_dir, exist_ok=True)
     
-    log_file = os.path.join(log_dir, f"instance_{instance_id}.log")
+    log_file = os.path.join(log_dir, "bulk_ingest.log")
     
     # Clear existing handlers
     root_logger = logging.getLogger()
@@ -70,122 +90,143 @@ def setup_logging(instance_id: int):
     
     logging.basicConfig(
         level=logging.INFO,
-        format=f'%(asctime)s [I{instance_id}] %(name)s - %(levelname)s - %(message)s',
+        format='%(asctime)s %(name)s - %(levelname)s - %(message)s',
         handlers=[
             logging.FileHandler(log_file, mode='a'),
             logging.StreamHandler()
         ]
     )
-    return logging.getLogger(f"BulkIngest-{instance_id}")
-
-
-def run_bulk_ingest(symbols: List[str], instance_id: int, concalls_only: bool = False):
-    """Run bulk ingestion for a subset of stocks."""
-    global shutdown_requested
-    
-    logger = setup_logging(instance_id)
+    return logging.getLogger("BulkIngest")
+
+
+def run_bulk_ingest(symbols: List[str], concalls_only: bool = False, concurrency: int = DEFAULT_CONCURRENCY):
+    """Run bulk ingestion for a list of stocks."""
+    run = uvloop.run if UVLOOP_AVAILABLE else asyncio.run
+    run(run_bulk_ingest_async(symbols, concalls_only, concurrency))
+
+
+async def run_bulk_ingest_async(symbols: List[str], concalls_only: bool = False,
+                                concurrency: int = DEFAULT_CONCURRENCY):
+    """
+    Ingest stocks from one coordinator: up to `concurrency` stocks in flight, sharing
+    one orchestrator (one lock file, one HTTP session, one DB pool). Per-host download
+    limits live in the orchestrator's aiohttp connector. Screener metadata is
+    prefetched in batches with fetch_metadata_many, ahead of the stocks being ingested.
+    """
+    # Imported here rather than at module level: spawned PDF extraction workers
+    # re-import this script as __mp_main__ and don't need the scraper/database stack
+    from data_platform.scrapers.orchestrator import ScraperOrchestrator
     
-    # Use instance-specific orchestrator
-    orchestrator = ScraperOrchestrator(instance_id=instance_id, concalls_only=concalls_only)
+    logger = setup_logging()
+    orchestrator = ScraperOrchestrator(concalls_only=concalls_only)
     
     if not orchestrator._acquire_lock():
-        logger.error(f"Could not acquire lock for instance {instance_id}. Exiting.")
+        logger.error("Could not acquire scraper lock. Exiting.")
         return
 
     start_time = datetime.now()
     total = len(symbols)
-    processed = 0
-    total_ar = 0
-    total_concalls = 0
-    total_errors = 0
+    totals = {"processed": 0, "ar_saved": 0, "concall_saved": 0, "errors": 0}
+    sem = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    metadata = {symbol: loop.create_future() for symbol in symbols}
+    
+    async def prefetch_metadata():
+        for start in range(0, total, METADATA_PREFETCH_BATCH):
+            batch = symbols[start:start + METADATA_PREFETCH_BATCH]
+            results = {}
+            if not shutdown_requested:
+                try:
+                    results = await orchestrator.screener.fetch_metadata_many(batch)
+                except Exception as e:
+                    logger.error(f"Screener metadata prefetch failed for {batch[0]}..{batch[-1]}: {e}")
+            # None makes the stock fetch its own metadata
+            for symbol in batch:
+                if not metadata[symbol].done():
+                    metadata[symbol].set_result(results.get(symbol))
+    
+    async def ingest(symbol: str):
+        metadata_list = await metadata[symbol]
+        async with sem:
+            # Stocks not started yet are dropped on shutdown; running ones finish
+            if shutdown_requested:
+                return
+            try:
+                stats = await orchestrator.ingest_stock_data_async(symbol, metadata_list)
+                totals["ar_saved"] += stats.get("ar_saved", 0)
+                totals["concall_saved"] += stats.get("concall_saved", 0)
+                totals["errors"] += stats.get("errors", 0)
+            except Exception as e:
+                logger.error(f"Failed bulk ingest for {symbol}: {e}")
+                totals["errors"] += 1
+            totals["processed"] += 1
+            
+            # Progress update every 10 stocks
+            if totals["processed"] % 10 == 0:
+                elapsed = (datetime.now() - start_time).total_seconds() / 60
+                rate = totals["processed"] / elapsed if elapsed > 0 else 0
+                remaining = (total - totals["processed"]) / rate if rate > 0 else 0
+                logger.info(f"\n[PROGRESS] {totals['processed']}/{total} stocks | {totals['ar_saved']} ARs | {totals['concall_saved']} Concalls | ETA: {remaining:.0f} min\n")
     
     try:
         logger.info(f"=" * 60)
-        logger.info(f"Instance {instance_id}: Starting ingestion for {total} stocks")
+        logger.info(f"Starting ingestion for {total} stocks ({concurrency} concurrent)")
         logger.info(f"Start time: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         logger.info(f"=" * 60)
         
-        for i, symbol in enumerate(symbols):
-            if shutdown_requested:
-                logger.info(f"Shutdown requested. Stopping after {i} stocks.")
-                break
-                
-            try:
-                logger.info(f"\n{'='*40}")
-                logger.info(f"[{i+1}/{total}] Processing {symbol}")
-                logger.info(f"{'='*40}")
-                
-                stats = orchestrator.ingest_stock_data(symbol)
-                
-                total_ar += stats.get("ar_saved", 0)
-                total_concalls += stats.get("concall_saved", 0)
-                total_errors += stats.get("errors", 0)
-                processed += 1
-                
-                # Progress update every 10 stocks
-                if (i + 1) % 10 == 0:
-                    elapsed = (datetime.now() - start_time).total_seconds() / 60
-                    rate = processed / elapsed if elapsed > 0 else 0
-                    remaining = (total - processed) / rate if rate > 0 else 0
-                    logger.info(f"\n[PROGRESS] {processed}/{total} stocks | {total_ar} ARs | {total_concalls} Concalls | ETA: {remaining:.0f} min\n")
-                
-                # Brief pause between stocks to be respectful
-                time.sleep(1.0)
-                
-            except Exception as e:
-                logger.error(f"Failed bulk ingest for {symbol}: {e}")
-                total_errors += 1
-                continue
+        prefetch = asyncio.create_task(prefetch_metadata())
+        try:
+            await asyncio.gather(*[ingest(symbol) for symbol in symbols])
+        finally:
+            prefetch.cancel()
+        
+        if shutdown_requested:
+            logger.info(f"Shutdown requested. Stopped after {totals['processed']} stocks.")
                 
     finally:
+        await orchestrator.aclose()
         orchestrator._release_lock()
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds() / 60
         
         logger.info(f"\n{'='*60}")
-        logger.info(f"Instance {instance_id}: COMPLETED")
+        logger.info(f"COMPLETED")
         logger.info(f"Duration: {duration:.1f} minutes")
-        logger.info(f"Stocks processed: {processed}/{total}")
-        logger.info(f"Annual Reports saved: {total_ar}")
-        logger.info(f"Concalls saved: {total_concalls}")
-        logger.info(f"Errors: {total_errors}")
+        logger.info(f"Stocks processed: {totals['processed']}/{total}")
+        logger.info(f"Annual Reports saved: {totals['ar_saved']}")
+        logger.info(f"Concalls saved: {totals['concall_saved']}")
+        logger.info(f"Errors: {totals['errors']}")
         logger.info(f"{'='*60}\n")
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Parallel bulk ingestion script for EC2")
-    parser.add_argument("--instance", type=int, required=True, help="Instance number (1-10)")
-    parser.add_argument("--total", type=int, default=10, help="Total number of instances")
+    # Registered here, not at import, so spawned worker processes keep default handlers
+    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGINT, signal_handler)
+    
+    parser = argparse.ArgumentParser(description="Bulk ingestion script for EC2")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Stocks ingested at the same time")
     parser.add_argument("--concalls-only", action="store_true", help="Skip Annual Reports and only scrape Concalls")
-    parser.add_argument("--list-file", type=str, help="Path to custom stock list JSON")
+    parser.add_argument("--list-file", type=str, help="Path to custom stock list (JSON list, or text with one symbol per line)")
+    parser.add_argument("--skip-covered", action="store_true", help="Leave out stocks that already have full coverage")
     args = parser.parse_args()
     
     stocks_list = load_stock_list(args.list_file)
-    
-    if args.instance < 1 or args.instance > args.total:
-        print(f"Error: Instance must be between 1 and {args.total}")
-        sys.exit(1)
-    
-    total_stocks = len(stocks_list)
-    chunk_size = max(1, total_stocks // args.total)
-    
-    start_idx = (args.instance - 1) * chunk_size
-    # Last instance takes all remaining stocks
-    end_idx = start_idx + chunk_size if args.instance < args.total else total_stocks
-    
-    stock_slice = stocks_list[start_idx:end_idx]
+    if args.skip_covered:
+        total = len(stocks_list)
+        stocks_list = drop_covered(stocks_list)
+        print(f"Skipping {total - len(stocks_list)} fully covered stocks")
     
     print(f"\n{'='*50}")
-    print(f"INWEZT SCRAPER - Instance {args.instance}/{args.total}")
+    print(f"INWEZT SCRAPER")
     print(f"{'='*50}")
-    print(f"Total NIFTY 500 stocks: {total_stocks}")
-    print(f"This instance: stocks {start_idx+1} to {end_idx} ({len(stock_slice)} stocks)")
-    print(f"First 5: {stock_slice[:5]}")
-    print(f"Last 5: {stock_slice[-5:]}")
+    print(f"Total stocks: {len(stocks_list)} ({args.concurrency} concurrent)")
+    print(f"First 5: {stocks_list[:5]}")
+    print(f"Last 5: {stocks_list[-5:]}")
     print(f"{'='*50}\n")
     
-    run_bulk_ingest(stock_slice, args.instance, concalls_only=args.concalls_only)
+    run_bulk_ingest(stocks_list, concalls_only=args.concalls_only, concurrency=args.concurrency)
 
 
 if __name__ == "__main__":
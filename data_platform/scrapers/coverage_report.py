@@ -34,80 +34,75 @@ def get_coverage_stats():
     print("=" * 80)
 
     # Get total counts
-    cur.execute("SELECT COUNT(DISTINCT symbol) as count FROM annual_reports")
-    ar_symbols = cur.fetchone()['count']
-    
-    cur.execute("SELECT COUNT(*) as count FROM annual_reports")
-    total_ars = cur.fetchone()['count']
-    
-    cur.execute("SELECT COUNT(DISTINCT symbol) as count FROM concalls")
-    concall_symbols = cur.fetchone()['count']
-    
-    cur.execute("SELECT COUNT(*) as count FROM concalls")
-    total_concalls = cur.fetchone()['count']
+    cur.execute("""
+        SELECT
+            (SELECT COUNT(DISTINCT symbol) FROM annual_reports) as ar_symbols,
+            (SELECT COUNT(*) FROM annual_reports) as total_ars,
+            (SELECT COUNT(DISTINCT symbol) FROM concalls) as concall_symbols,
+            (SELECT COUNT(*) FROM concalls) as total_concalls
+    """)
+    totals = cur.fetchone()
     
     print(f"\n📊 SUMMARY")
-    print(f"   Stocks with Annual Reports: {ar_symbols}")
-    print(f"   Total Annual Reports: {total_ars}")
-    print(f"   Stocks with Concalls: {concall_symbols}")
-    print(f"   Total Concalls: {total_concalls}")
+    print(f"   Stocks with Annual Reports: {totals['ar_symbols']}")
+    print(f"   Total Annual Reports: {totals['total_ars']}")
+    print(f"   Stocks with Concalls: {totals['concall_symbols']}")
+    print(f"   Total Concalls: {totals['total_concalls']}")
     print()
+    cur.close()
 
-    # Get per-stock coverage with year ranges
-    cur.execute("""
-        SELECT 
-            symbol, 
-            COUNT(*) as ar_count, 
-            MIN(fiscal_year) as min_year,
-            MAX(fiscal_year) as max_year
-        FROM annual_reports
-        WHERE fiscal_year ~ '^[0-9]+$'
-        GROUP BY symbol
-        ORDER BY ar_count DESC, symbol
-    """)
-    ar_stats = {row['symbol']: row for row in cur.fetchall()}
-
+    # Per-stock coverage with year ranges, merged server-side and streamed in batches
+    cur = conn.cursor(name="coverage_report", cursor_factory=RealDictCursor)
+    cur.itersize = 1000
     cur.execute("""
-        SELECT 
-            symbol, 
-            COUNT(*) as concall_count, 
-            MIN(fiscal_year) as min_year,
-            MAX(fiscal_year) as max_year
-        FROM concalls
-        WHERE fiscal_year ~ '^[0-9]+$'
-        GROUP BY symbol
-        ORDER BY concall_count DESC, symbol
+        SELECT
+            symbol,
+            COALESCE(a.ar_count, 0) as ar_count,
+            a.min_year as ar_min_year,
+            a.max_year as ar_max_year,
+            COALESCE(c.concall_count, 0) as concall_count,
+            c.min_year as concall_min_year,
+            c.max_year as concall_max_year
+        FROM (
+            SELECT symbol, COUNT(*) as ar_count, MIN(fiscal_year) as min_year, MAX(fiscal_year) as max_year
+            FROM annual_reports
+            WHERE fiscal_year ~ '^[0-9]+$'
+            GROUP BY symbol
+        ) a
+        FULL OUTER JOIN (
+            SELECT symbol, COUNT(*) as concall_count, MIN(fiscal_year) as min_year, MAX(fiscal_year) as max_year
+            FROM concalls
+            WHERE fiscal_year ~ '^[0-9]+$'
+            GROUP BY symbol
+        ) c USING (symbol)
+        ORDER BY symbol
     """)
-    concall_stats = {row['symbol']: row for row in cur.fetchall()}
 
-    # Combine stats
-    symbols = sorted(set(list(ar_stats.keys()) + list(concall_stats.keys())))
-    
-    print(f"Total Stocks Scanned: {len(symbols)}")
-    print()
     print(f"{'Symbol':<15} | {'AR Count':<10} | {'AR Years':<22} | {'Concall Count':<15} | {'Concall Years':<22}")
     print("-" * 95)
     
-    for symbol in symbols:
-        ar = ar_stats.get(symbol, {'ar_count': 0, 'min_year': '-', 'max_year': '-'})
-        concall = concall_stats.get(symbol, {'concall_count': 0, 'min_year': '-', 'max_year': '-'})
+    total_symbols = 0
+    low_coverage = []
+    for row in cur:
+        total_symbols += 1
+        ar_years = f"{row['ar_min_year']} - {row['ar_max_year']}" if row['ar_count'] > 0 else "-"
+        concall_years = f"{row['concall_min_year']} - {row['concall_max_year']}" if row['concall_count'] > 0 else "-"
         
-        ar_years = f"{ar['min_year']} - {ar['max_year']}" if ar['ar_count'] > 0 else "-"
-        concall_years = f"{concall['min_year']} - {concall['max_year']}" if concall['concall_count'] > 0 else "-"
-        
-        print(f"{symbol:<15} | {ar['ar_count']:<10} | {ar_years:<22} | {concall['concall_count']:<15} | {concall_years:<22}")
+        print(f"{row['symbol']:<15} | {row['ar_count']:<10} | {ar_years:<22} | {row['concall_count']:<15} | {concall_years:<22}")
+        if row['ar_count'] < 3:
+            low_coverage.append(row)
+
+    print()
+    print(f"Total Stocks Scanned: {total_symbols}")
 
     # Show stocks needing attention (low coverage)
     print("\n" + "=" * 80)
     print("⚠️  STOCKS NEEDING ATTENTION (Less than 3 Annual Reports)")
     print("=" * 80)
     
-    low_coverage = [s for s in symbols if ar_stats.get(s, {}).get('ar_count', 0) < 3]
     if low_coverage:
-        for symbol in low_coverage[:20]:  # Show first 20
-            ar = ar_stats.get(symbol, {'ar_count': 0})
-            concall = concall_stats.get(symbol, {'concall_count': 0})
-            print(f"   {symbol}: {ar['ar_count']} ARs, {concall['concall_count']} Concalls")
+        for row in low_coverage[:20]:  # Show first 20
+            print(f"   {row['symbol']}: {row['ar_count']} ARs, {row['concall_count']} Concalls")
         if len(low_coverage) > 20:
             print(f"   ... and {len(low_coverage) - 20} more")
     else:
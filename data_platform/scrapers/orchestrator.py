@@ -2,18 +2,41 @@
 Inwezt Scraper Orchestrator - Optimized for EC2 overnight runs
 Extracts COMPLETE PDF content (text/JSON) for RAG systems.
 """
+import asyncio
+import fcntl
+import hashlib
 import logging
+import multiprocessing
 import os
 import json
-from typing import List, Dict, Any, Optional
+import shutil
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from tempfile import SpooledTemporaryFile
+from typing import List, Dict, Any, Optional, Callable, Tuple, BinaryIO
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from urllib.parse import urlparse
+from .base import build_session, parse_retry_after, AsyncTokenBucket, RATE_LIMIT_COOLDOWN
 from .screener import ScreenerScraper
-from api.core.document.pdf_engine import PDFEngine
+from api.core.document.pdf_engine import PDFEngine, extract_pdf_content
 from api.database.database import (
     save_annual_report, save_concall, 
+    AnnualReportRecord, ConcallRecord,
     annual_report_exists, concall_exists, 
-    get_stock_coverage
+    get_stock_coverage,
+    annual_reports_existing, annual_report_urls_existing,
+    concall_urls_existing
 )
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+    _DOWNLOAD_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    _DOWNLOAD_ERRORS = ()
+
 logger = logging.getLogger("ScraperOrchestrator")
 
 # Year range for scraping (2015-2026)
@@ -25,6 +48,39 @@ MAX_YEAR = 2026
 MIN_ANNUAL_REPORTS = 10
 MIN_CONCALLS = 30
 
+# Connection limits for the async download path (one aiohttp session per orchestrator)
+DOWNLOAD_CONNECTIONS = 64
+DOWNLOAD_CONNECTIONS_PER_HOST = 8
+
+# Requests per second (also the burst size) per host on the async download path
+HOST_RATE_LIMITS = {"www.screener.in": 5, "www.bseindia.com": 2}
+DEFAULT_HOST_RATE = 5
+
+# Downloads are written to a spooled file in chunks (kept in memory up to the
+# spool size, on disk beyond) rather than held as one bytes object
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+DOWNLOAD_SPOOL_SIZE = 16 * 1024 * 1024
+
+# PDF text extraction is CPU-bound Python, so the async path parses in worker
+# processes instead of threads (which the GIL would serialize). At most
+# EXTRACT_QUEUE_DEPTH documents per worker are read into memory and queued at once.
+EXTRACT_WORKERS = os.cpu_count() or 1
+EXTRACT_QUEUE_DEPTH = 2
+
+# Optional on-disk cache of downloaded documents, keyed by SHA-256 of the URL.
+# Reruns (e.g. after a failed save) then read from disk instead of re-downloading.
+DOWNLOAD_CACHE_DIR = os.getenv("SCRAPER_CACHE_DIR", "")
+
+# (label, url, save) - save(extraction) stores one extracted document
+DownloadJob = Tuple[str, str, Callable[[Dict[str, Any]], bool]]
+
+
+def _init_extract_worker():
+    # Spawned workers re-import the parent's __main__, which may install its own
+    # shutdown handlers; restore the defaults so Ctrl-C and SIGTERM stop workers
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
 
 class ScraperOrchestrator:
     """
@@ -35,9 +91,12 @@ class ScraperOrchestrator:
     def __init__(self, instance_id: int = 0, concalls_only: bool = False):
         self.instance_id = instance_id
         self.concalls_only = concalls_only
-        self.screener = ScreenerScraper()
+        # One pooled session for every scraper this orchestrator drives
+        self.session = build_session()
+        self.screener = ScreenerScraper(session=self.session)
         self.engine = PDFEngine()
         self.lock_file = f".scraper_{instance_id}.lock" if instance_id else ".scraper.lock"
+        self._lock_fd = None
         
         # Stats tracking
         self.stats = {
@@ -48,34 +107,91 @@ class ScraperOrchestrator:
             "skipped": 0
         }
 
+        # Existence lookups per stock being ingested, filled in one batch
+        # (keyed by symbol so concurrently ingested stocks don't clobber each other)
+        self._known: Dict[str, Dict[str, set]] = {}
+        
+        # aiohttp session for ingest_stock_data_async, opened on first use
+        self._aio_session = None
+        self._host_buckets: Dict[str, AsyncTokenBucket] = {}
+        self._extract_pool = None
+        self._extract_slots = None
+        # url -> extraction in progress, shared by every document that lists the url
+        self._inflight: Dict[str, asyncio.Future] = {}
+
     def _acquire_lock(self) -> bool:
-        if os.path.exists(self.lock_file):
-            try:
-                pid = open(self.lock_file).read().strip()
-                # Check if process is still running
-                if pid and os.path.exists(f"/proc/{pid}"):
-                    logger.warning(f"Scraper lock exists for PID {pid}. Still running.")
-                    return False
-                # Stale lock, remove it
-                os.remove(self.lock_file)
-            except:
-                pass
-        with open(self.lock_file, "w") as f:
-            f.write(str(os.getpid()))
+        # flock is atomic and released by the kernel if the process dies, so no stale locks
+        self._lock_fd = os.open(self.lock_file, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            pid = os.read(self._lock_fd, 32).decode().strip()
+            logger.warning(f"Scraper lock held by PID {pid or 'unknown'}. Still running.")
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            return False
+        os.ftruncate(self._lock_fd, 0)
+        os.write(self._lock_fd, str(os.getpid()).encode())
         return True
 
     def _release_lock(self):
-        if os.path.exists(self.lock_file):
-            try:
-                os.remove(self.lock_file)
-            except:
-                pass
+        if self._lock_fd is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+            self._lock_fd = None
 
     def _is_stock_fully_covered(self, symbol: str) -> bool:
         """Check if a stock already has sufficient coverage in the DB."""
         coverage = get_stock_coverage(symbol)
         return coverage['annual_reports'] >= MIN_ANNUAL_REPORTS and coverage['concalls'] >= MIN_CONCALLS
 
+    def _prefetch_existing(self, symbol: str, metadata: List[Dict[str, Any]]):
+        """Batch the per-document existence checks into one query per kind."""
+        ar_years, ar_urls, concall_urls = set(), set(), set()
+        for meta in metadata:
+            if meta.get('type') == 'Annual Report':
+                ar_years.add(meta.get('fiscal_year'))
+                if meta.get('url'):
+                    ar_urls.add(meta['url'])
+            else:
+                if meta.get('url'):
+                    concall_urls.add(meta['url'])
+                concall_urls.update(u for u in (meta.get('links') or {}).values() if u)
+
+        self._known[symbol] = {
+            "ar_years": {fy for _, fy in annual_reports_existing([(symbol, fy) for fy in ar_years])},
+            "ar_urls": annual_report_urls_existing(ar_urls),
+            "concall_urls": concall_urls_existing(concall_urls),
+            "checked_urls": ar_urls | concall_urls,
+        }
+
+    def _known_for(self, symbol: str) -> Dict[str, set]:
+        return self._known.setdefault(symbol, {"ar_years": set(), "ar_urls": set(), "concall_urls": set(), "checked_urls": set()})
+
+    def _ar_url_known(self, symbol: str, url: str) -> bool:
+        known = self._known_for(symbol)
+        if url in known["checked_urls"]:
+            return url in known["ar_urls"]
+        from api.database.database import annual_report_url_exists
+        return annual_report_url_exists(url)
+
+    def _concall_url_known(self, symbol: str, url: str) -> bool:
+        known = self._known_for(symbol)
+        if url in known["checked_urls"]:
+            return url in known["concall_urls"]
+        from api.database.database import concall_url_exists
+        return concall_url_exists(url)
+
+    def _filter_metadata(self, symbol: str, metadata_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep documents within MIN_YEAR-MAX_YEAR (and those with an unknown year)."""
+        filtered_metadata = [
+            meta for meta in metadata_list
+            if meta['fy_int'] is None or MIN_YEAR <= meta['fy_int'] <= MAX_YEAR
+        ]
+        if len(filtered_metadata) < len(metadata_list):
+            logger.debug(f"[{symbol}] Skipping {len(metadata_list) - len(filtered_metadata)} documents outside {MIN_YEAR}-{MAX_YEAR}")
+        return filtered_metadata
+
     def ingest_stock_data(self, symbol: str) -> Dict[str, int]:
         """
         Main entry point to fetch and process all documents for a stock.
@@ -104,26 +220,13 @@ class ScraperOrchestrator:
             return stock_stats
                 
         # 3. Filter by year range (2015-2026)
-        filtered_metadata = []
-        for meta in metadata_list:
-            fy = meta.get('fiscal_year', 'Unknown')
-            try:
-                if fy == 'Unknown':
-                    filtered_metadata.append(meta)
-                    continue
-                    
-                year_int = int(fy) if str(fy).isdigit() else 0
-                if MIN_YEAR <= year_int <= MAX_YEAR:
-                    filtered_metadata.append(meta)
-                else:
-                    logger.debug(f"[{symbol}] Skipping {meta.get('title', 'doc')} - year {fy} outside {MIN_YEAR}-{MAX_YEAR}")
-            except (ValueError, TypeError):
-                # Keep documents with unknown or malformed year
-                filtered_metadata.append(meta)
+        filtered_metadata = self._filter_metadata(symbol, metadata_list)
 
         total_docs = len(filtered_metadata)
         logger.info(f"[{symbol}] Processing {total_docs} documents ({MIN_YEAR}-{MAX_YEAR})")
 
+        self._prefetch_existing(symbol, filtered_metadata)
+
         # 4. Process documents sequentially (more reliable for long runs)
         for i, meta in enumerate(filtered_metadata):
             try:
@@ -136,253 +239,420 @@ class ScraperOrchestrator:
                 stock_stats["errors"] += 1
                 logger.error(f"[{symbol}] [{i+1}/{total_docs}] Failed: {e}")
         
+        self._known.pop(symbol, None)
         logger.info(f"[{symbol}] Completed: {stock_stats['ar_saved']} ARs, {stock_stats['concall_saved']} Concalls, {stock_stats['errors']} errors")
         return stock_stats
 
-    def _process_single_document(self, symbol: str, meta: Dict[str, Any], index: int, total: int) -> Optional[str]:
-        """Process a single document. Returns 'ar_saved', 'concall_saved', or None."""
+    async def ingest_stock_data_async(self, symbol: str,
+                                      metadata_list: Optional[List[Dict[str, Any]]] = None) -> Dict[str, int]:
+        """
+        Same as ingest_stock_data, but all document downloads for the stock overlap
+        on one aiohttp session. PDF extraction runs in a process pool and DB writes
+        in worker threads, so neither blocks the event loop. Falls back to the sync
+        path without aiohttp.
+        Pass metadata_list (e.g. from ScreenerScraper.fetch_metadata_many) to skip
+        the per-stock Screener fetch.
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(self.ingest_stock_data, symbol)
+
+        stock_stats = {"ar_saved": 0, "concall_saved": 0, "errors": 0}
+        logger.info(f"[{symbol}] Starting ingestion")
+
+        if metadata_list is None:
+            try:
+                metadata_list = await asyncio.to_thread(self.screener.fetch_metadata, symbol)
+            except Exception as e:
+                logger.error(f"[{symbol}] Screener fetch failed: {e}")
+        if metadata_list:
+            logger.info(f"[{symbol}] Found {len(metadata_list)} documents from Screener")
+
+        if not metadata_list:
+            logger.warning(f"[{symbol}] No documents found on Screener")
+            return stock_stats
+
+        filtered_metadata = self._filter_metadata(symbol, metadata_list)
+        total_docs = len(filtered_metadata)
+        logger.info(f"[{symbol}] Processing {total_docs} documents ({MIN_YEAR}-{MAX_YEAR})")
+
+        # Decide every download up front (DB lookups), then fetch them all concurrently
+        def plan():
+            self._prefetch_existing(symbol, filtered_metadata)
+            return [self._document_jobs(symbol, meta, i+1, total_docs) for i, meta in enumerate(filtered_metadata)]
+        plans = await asyncio.to_thread(plan)
+
+        # A URL listed under several documents is downloaded once, and so is one
+        # Annual Report per fiscal year (they upsert onto the same row)
+        seen_urls, seen_ar_years = set(), set()
+        for meta, (jobs, _) in zip(filtered_metadata, plans):
+            unique_jobs = []
+            for job in jobs:
+                if job[1] in seen_urls:
+                    continue
+                if job[0] == "AR":
+                    if meta.get('fiscal_year') in seen_ar_years:
+                        logger.debug(f"[{symbol}] Skipping duplicate AR FY{meta.get('fiscal_year')}: {job[1]}")
+                        continue
+                    seen_ar_years.add(meta.get('fiscal_year'))
+                seen_urls.add(job[1])
+                unique_jobs.append(job)
+            jobs[:] = unique_jobs
+
+        session = self._get_session()
+        results = await asyncio.gather(*[
+            self._process_single_document_async(session, symbol, meta, jobs, saved)
+            for meta, (jobs, saved) in zip(filtered_metadata, plans)
+        ], return_exceptions=True)
+
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                stock_stats["errors"] += 1
+                logger.error(f"[{symbol}] [{i+1}/{total_docs}] Failed: {result}")
+            elif result == "ar_saved":
+                stock_stats["ar_saved"] += 1
+            elif result == "concall_saved":
+                stock_stats["concall_saved"] += 1
+
+        self._known.pop(symbol, None)
+        logger.info(f"[{symbol}] Completed: {stock_stats['ar_saved']} ARs, {stock_stats['concall_saved']} Concalls, {stock_stats['errors']} errors")
+        return stock_stats
+
+    def _get_session(self):
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=DOWNLOAD_CONNECTIONS,
+                    limit_per_host=DOWNLOAD_CONNECTIONS_PER_HOST,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.screener.timeout, sock_read=self.screener.timeout)
+            )
+        return self._aio_session
+
+    async def aclose(self):
+        """Close the aiohttp session and extraction pool opened by ingest_stock_data_async."""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        if self._extract_pool is not None:
+            await asyncio.to_thread(self._extract_pool.shutdown)
+            self._extract_pool = None
+            self._extract_slots = None
+
+    async def _get_extraction(self, session, url: str) -> Dict[str, Any]:
+        """Download and extract a URL, or join the download already in flight for it."""
+        future = self._inflight.get(url)
+        if future is None:
+            future = self._inflight[url] = asyncio.ensure_future(self._download_and_extract(session, url))
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # One waiter being cancelled must not cancel the shared download
+        return await asyncio.shield(future)
+
+    async def _download_and_extract(self, session, url: str) -> Dict[str, Any]:
+        if not DOWNLOAD_CACHE_DIR:
+            with await self._fetch_async(session, url) as document:
+                return await self._extract_async(document)
+
+        path = os.path.join(DOWNLOAD_CACHE_DIR, hashlib.sha256(url.encode()).hexdigest() + ".pdf")
+        if not os.path.exists(path):
+            with await self._fetch_async(session, url) as document:
+                await asyncio.to_thread(self._write_cache, document, path)
+        else:
+            logger.debug(f"Using cached download for {url}")
+        with open(path, "rb") as document:
+            return await self._extract_async(document)
+
+    @staticmethod
+    def _write_cache(document: BinaryIO, path: str):
+        # Write under a temporary name so a crash never leaves a truncated cache entry
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            shutil.copyfileobj(document, f, DOWNLOAD_CHUNK_SIZE)
+        os.replace(tmp_path, path)
+
+    async def _extract_async(self, document: BinaryIO) -> Dict[str, Any]:
+        """Run PDF extraction for a downloaded document in the process pool."""
+        if self._extract_pool is None:
+            # spawn, not fork: the parent already runs aiohttp and DB worker threads
+            self._extract_pool = ProcessPoolExecutor(
+                max_workers=EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_extract_worker
+            )
+            self._extract_slots = asyncio.Semaphore(EXTRACT_WORKERS * EXTRACT_QUEUE_DEPTH)
+
+        async with self._extract_slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._extract_pool, extract_pdf_content, document.read())
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=2, min=3, max=30),
+        retry=retry_if_exception_type(_DOWNLOAD_ERRORS)
+    )
+    async def _fetch_async(self, session, url: str) -> BinaryIO:
+        host = urlparse(url).netloc
+        bucket = self._host_buckets.get(host)
+        if bucket is None:
+            rate = HOST_RATE_LIMITS.get(host, DEFAULT_HOST_RATE)
+            bucket = self._host_buckets[host] = AsyncTokenBucket(rate, rate)
+        
+        await bucket.acquire()
+        async with session.get(url, headers=self.screener._get_headers()) as resp:
+            if resp.status in (429, 503):
+                # Hold back every request to this host, not just this one (retried by tenacity);
+                # a 503 without Retry-After is left to the normal retry backoff
+                wait = parse_retry_after(resp.headers.get("Retry-After"), default=RATE_LIMIT_COOLDOWN if resp.status == 429 else 0)
+                if wait:
+                    logger.warning(f"Rate limited ({resp.status}) on {host}, pausing it for {wait:.0f}s")
+                    bucket.pause(wait)
+            resp.raise_for_status()
+            document = SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_SIZE)
+            try:
+                async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    document.write(chunk)
+            except BaseException:
+                document.close()
+                raise
+            document.seek(0)
+            return document
+
+    def _document_jobs(self, symbol: str, meta: Dict[str, Any], index: int, total: int) -> Tuple[List[DownloadJob], bool]:
+        """
+        Decide which links of a document still need downloading.
+        Returns the download jobs and whether the document already counts as saved.
+        """
         fy = meta.get('fiscal_year', 'Unknown')
         doc_type = meta.get('type', 'Document')
-        
+        jobs = []
+
         if doc_type == 'Annual Report':
             if self.concalls_only:
                 logger.debug(f"[{symbol}] [{index}/{total}] Skipping Annual Report (Concall-only mode)")
-                return None
-                
-            if not annual_report_exists(symbol, fy):
-                logger.info(f"[{symbol}] [{index}/{total}] Processing Annual Report FY{fy}")
-                if self._process_annual_report(symbol, meta):
-                    return "ar_saved"
-            else:
+                return jobs, False
+
+            if fy in self._known_for(symbol)["ar_years"]:
                 logger.debug(f"[{symbol}] [{index}/{total}] AR FY{fy} already exists")
-                
-        elif doc_type == 'Concall':
+                return jobs, False
+
+            logger.info(f"[{symbol}] [{index}/{total}] Processing Annual Report FY{fy}")
+            url = meta.get('url')
+            if not url:
+                logger.warning(f"[{symbol}] No URL for Annual Report")
+            elif self._ar_url_known(symbol, url):
+                logger.debug(f"[{symbol}] AR URL already exists: {url}")
+            else:
+                jobs.append(("AR", url, partial(self._save_annual_report, symbol, meta, url)))
+            return jobs, False
+
+        if doc_type == 'Concall':
             quarter = meta.get('quarter', 'Unknown')
             logger.info(f"[{symbol}] [{index}/{total}] Processing Concall {quarter} FY{fy}")
-            if self._process_concall(symbol, meta):
-                return "concall_saved"
-        
-        elif doc_type == 'Announcement':
+            return self._concall_jobs(symbol, meta)
+
+        if doc_type == 'Announcement':
             # Always process announcements if they don't exist by URL
-            if self._process_announcement(symbol, meta):
-                return "concall_saved" 
-        
+            url = meta.get('url')
+            if url and not self._concall_url_known(symbol, url):
+                jobs.append(("Announcement", url, partial(self._save_announcement, symbol, meta, url)))
+
         elif doc_type == 'Credit Rating':
             # Always process credit ratings if they don't exist by URL
-            if self._process_credit_rating(symbol, meta):
-                return "concall_saved"
-        
-        return None
+            url = meta.get('url')
+            if url and not self._concall_url_known(symbol, url):
+                jobs.append(("Credit Rating", url, partial(self._save_credit_rating, symbol, meta, url)))
 
-    def _process_annual_report(self, symbol: str, meta: Dict[str, Any]) -> bool:
-        """Download, extract COMPLETE content and save an annual report."""
-        url = meta.get('url')
-        if not url:
-            logger.warning(f"[{symbol}] No URL for Annual Report")
-            return False
+        return jobs, False
 
-        from api.database.database import annual_report_url_exists
-        if annual_report_url_exists(url):
-            logger.debug(f"[{symbol}] AR URL already exists: {url}")
-            return False
-
-        try:
-            logger.info(f"[{symbol}] Downloading AR: {url}")
-            response = self.screener._make_request(url)
-            
-            # Extract COMPLETE content from PDF
-            extraction = self.engine.extract_content(response.content)
-            
-            if not extraction['full_text']:
-                logger.warning(f"[{symbol}] Empty PDF extraction for {url}")
-                return False
-            
-            # Build comprehensive key_metrics with ALL sections
-            key_metrics = {}
-            for section_name, section_content in extraction['sections'].items():
-                if section_content:
-                    key_metrics[section_name] = section_content
-            
-            # Add page count for reference
-            key_metrics['_meta'] = {
-                'page_count': extraction.get('page_count', 0),
-                'text_length': len(extraction['full_text'])
-            }
-
-            report_data = {
-                "fiscal_year": meta['fiscal_year'],
-                "report_date": None,
-                "title": meta.get('title', f"Annual Report {meta['fiscal_year']}"),
-                "summary": extraction['full_text'],  # COMPLETE text content
-                "key_metrics": key_metrics,  # All extracted sections as JSON
-                "chairman_letter": extraction['sections'].get('chairman_letter', ''),
-                "nuanced_summary": "",  # Can be filled by AI later
-                "url": url,
-                "source": meta.get('source', 'Screener')
-            }
-            
-            save_annual_report(symbol, report_data)
-            logger.info(f"[{symbol}] Saved AR FY{meta['fiscal_year']} ({extraction.get('page_count', 0)} pages, {len(extraction['full_text'])} chars)")
-            return True
-            
-        except Exception as e:
-            logger.error(f"[{symbol}] AR processing failed for {url}: {e}")
-            return False
-
-    def _process_concall(self, symbol: str, meta: Dict[str, Any]) -> bool:
+    def _concall_jobs(self, symbol: str, meta: Dict[str, Any]) -> Tuple[List[DownloadJob], bool]:
         """
-        Download, extract and save concall documents.
+        Download jobs for a concall event.
         Logic: Transcript (Priority) OR AI Summary, PLUS PPT (Supplemental).
         """
         links = meta.get('links', {})
         quarter = meta.get('quarter', 'Unknown')
         fy = meta['fiscal_year']
+        jobs = []
         saved_any = False
-        
-        from api.database.database import concall_url_exists, has_transcript_for_quarter
-        
+
+        from api.database.database import has_transcript_for_quarter
+
         # 1. Transcript (Priority 1)
         transcript_url = links.get('transcript')
         if transcript_url:
-            if not concall_url_exists(transcript_url):
-                logger.info(f"[{symbol}] Downloading Transcript: {transcript_url}")
-                if self._process_individual_concall_link(symbol, meta, transcript_url, "transcript"):
-                    saved_any = True
+            if not self._concall_url_known(symbol, transcript_url):
+                jobs.append(("Transcript", transcript_url,
+                             partial(self._save_concall_link, symbol, meta, transcript_url, "transcript")))
             else:
                 saved_any = True # Already have it
-                
+
         # 2. AI Summary (Priority 2 - Only if no Transcript exists)
         summary_url = links.get('ai_summary')
         if summary_url and not transcript_url:
             # Only save AI summary if we don't already have a full transcript for this quarter
             if not has_transcript_for_quarter(symbol, quarter, fy):
-                if not concall_url_exists(summary_url):
-                    logger.info(f"[{symbol}] Downloading AI Summary: {summary_url}")
-                    if self._process_individual_concall_link(symbol, meta, summary_url, "ai_summary"):
-                        saved_any = True
-        
+                if not self._concall_url_known(symbol, summary_url):
+                    jobs.append(("AI Summary", summary_url,
+                                 partial(self._save_concall_link, symbol, meta, summary_url, "ai_summary")))
+
         # 3. PPT (Supplemental - Always capture)
         ppt_url = links.get('ppt')
         if ppt_url:
-            if not concall_url_exists(ppt_url):
-                logger.info(f"[{symbol}] Downloading PPT (supplemental): {ppt_url}")
-                if self._process_individual_concall_link(symbol, meta, ppt_url, "ppt"):
-                    saved_any = True
-        
-        return saved_any
+            if not self._concall_url_known(symbol, ppt_url):
+                jobs.append(("PPT (supplemental)", ppt_url,
+                             partial(self._save_concall_link, symbol, meta, ppt_url, "ppt")))
 
-    def _process_individual_concall_link(self, symbol: str, meta: Dict[str, Any], url: str, source_type: str) -> bool:
-        """Helper to download and save a single link from a concall event."""
-        try:
-            response = self.screener._make_request(url)
-            extraction = self.engine.extract_content(response.content)
-            
-            if not extraction['full_text']:
-                logger.warning(f"[{symbol}] No content extracted for {source_type} at {url}")
-                return False
+        return jobs, saved_any
 
-            extra_sections = {k: v for k, v in extraction['sections'].items() if v}
-            nuanced_json = json.dumps(extra_sections) if extra_sections else ""
-
-            concall_data = {
-                "quarter": meta.get('quarter', 'Unknown'),
-                "fiscal_year": meta['fiscal_year'],
-                "call_date": None,
-                "title": meta.get('title', f"Concall {meta['fiscal_year']}") + (f" ({source_type})" if source_type != "transcript" else ""),
-                "transcript": extraction['full_text'],
-                "key_highlights": extraction['sections'].get('highlights', ''),
-                "management_guidance": extraction['sections'].get('mda', ''),
-                "nuanced_summary": nuanced_json,
-                "url": url,
-                "source": meta.get('source', 'Screener')
-            }
-            
-            from api.database.database import save_concall
-            save_concall(symbol, concall_data)
-            return True
-            
-        except Exception as e:
-            logger.error(f"[{symbol}] Concall processing failed: {e}")
-            return False
+    @staticmethod
+    def _document_result(meta: Dict[str, Any]) -> str:
+        # Announcements and credit ratings are stored as concalls
+        return "ar_saved" if meta.get('type') == 'Annual Report' else "concall_saved"
 
-    def _process_announcement(self, symbol: str, meta: Dict[str, Any]) -> bool:
-        """Download and save a corporate announcement."""
-        url = meta.get('url')
-        if not url:
-            return False
-            
-        from api.database.database import concall_url_exists
-        if concall_url_exists(url):
-            return False
-            
-        try:
-            logger.info(f"[{symbol}] Downloading Announcement: {url}")
-            response = self.screener._make_request(url)
-            extraction = self.engine.extract_content(response.content)
-            
-            if not extraction['full_text']:
+    def _process_single_document(self, symbol: str, meta: Dict[str, Any], index: int, total: int) -> Optional[str]:
+        """Process a single document. Returns 'ar_saved', 'concall_saved', or None."""
+        jobs, saved = self._document_jobs(symbol, meta, index, total)
+        for label, url, save in jobs:
+            try:
+                logger.info(f"[{symbol}] Downloading {label}: {url}")
+                with self.screener._make_request(url, stream=True) as response, \
+                        SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_SIZE) as document:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        document.write(chunk)
+                    document.seek(0)
+                    saved = save(self.engine.extract_content(document)) or saved
+            except Exception as e:
+                logger.error(f"[{symbol}] {label} processing failed for {url}: {e}")
+        return self._document_result(meta) if saved else None
+
+    async def _process_single_document_async(self, session, symbol: str, meta: Dict[str, Any],
+                                             jobs: List[DownloadJob], saved: bool) -> Optional[str]:
+        """Async counterpart of _process_single_document for already planned jobs."""
+        async def run(label, url, save):
+            try:
+                logger.info(f"[{symbol}] Downloading {label}: {url}")
+                extraction = await self._get_extraction(session, url)
+                # The DB write is blocking
+                return await asyncio.to_thread(save, extraction)
+            except Exception as e:
+                logger.error(f"[{symbol}] {label} processing failed for {url}: {e}")
                 return False
-                
-            concall_data = {
-                "quarter": "Announcement",
-                "fiscal_year": meta['fiscal_year'],
-                "call_date": None,
-                "title": f"Corporate Announcement: {meta['title']}",
-                "transcript": extraction['full_text'],
-                "key_highlights": "",
-                "management_guidance": "",
-                "nuanced_summary": json.dumps({"is_announcement": True}),
-                "url": url,
-                "source": "Screener"
-            }
-            
-            save_concall(symbol, concall_data)
-            logger.info(f"[{symbol}] Saved Announcement FY{meta['fiscal_year']} ({len(extraction['full_text'])} chars)")
-            return True
-            
-        except Exception as e:
-            logger.error(f"[{symbol}] Announcement processing failed: {e}")
+
+        outcomes = await asyncio.gather(*[run(*job) for job in jobs])
+        return self._document_result(meta) if saved or any(outcomes) else None
+
+    def _save_annual_report(self, symbol: str, meta: Dict[str, Any], url: str, extraction: Dict[str, Any]) -> bool:
+        """Save the COMPLETE extracted content of a downloaded annual report."""
+
+        if not extraction['full_text']:
+            logger.warning(f"[{symbol}] Empty PDF extraction for {url}")
             return False
 
-    def _process_credit_rating(self, symbol: str, meta: Dict[str, Any]) -> bool:
-        """Download and save a credit rating report."""
-        url = meta.get('url')
-        if not url:
+        # Build comprehensive key_metrics with ALL sections
+        key_metrics = {}
+        for section_name, section_content in extraction['sections'].items():
+            if section_content:
+                key_metrics[section_name] = section_content
+
+        # Add page count for reference
+        key_metrics['_meta'] = {
+            'page_count': extraction.get('page_count', 0),
+            'text_length': len(extraction['full_text'])
+        }
+
+        report_data = AnnualReportRecord(
+            fiscal_year=meta['fiscal_year'],
+            report_date=None,
+            title=meta.get('title', f"Annual Report {meta['fiscal_year']}"),
+            summary=extraction['full_text'],  # COMPLETE text content
+            key_metrics=key_metrics,  # All extracted sections as JSON
+            chairman_letter=extraction['sections'].get('chairman_letter', ''),
+            nuanced_summary="",  # Can be filled by AI later
+            url=url,
+            source=meta.get('source', 'Screener')
+        )
+
+        save_annual_report(symbol, report_data)
+        self._known_for(symbol)["ar_years"].add(meta['fiscal_year'])
+        self._known_for(symbol)["ar_urls"].add(url)
+        logger.info(f"[{symbol}] Saved AR FY{meta['fiscal_year']} ({extraction.get('page_count', 0)} pages, {len(extraction['full_text'])} chars)")
+        return True
+
+    def _save_concall_link(self, symbol: str, meta: Dict[str, Any], url: str, source_type: str, extraction: Dict[str, Any]) -> bool:
+        """Save the extracted content of a single downloaded link from a concall event."""
+
+        if not extraction['full_text']:
+            logger.warning(f"[{symbol}] No content extracted for {source_type} at {url}")
             return False
-            
-        from api.database.database import concall_url_exists
-        if concall_url_exists(url):
+
+        extra_sections = {k: v for k, v in extraction['sections'].items() if v}
+        nuanced_json = json.dumps(extra_sections) if extra_sections else ""
+
+        concall_data = ConcallRecord(
+            quarter=meta.get('quarter', 'Unknown'),
+            fiscal_year=meta['fiscal_year'],
+            call_date=None,
+            title=meta.get('title', f"Concall {meta['fiscal_year']}") + (f" ({source_type})" if source_type != "transcript" else ""),
+            transcript=extraction['full_text'],
+            key_highlights=extraction['sections'].get('highlights', ''),
+            management_guidance=extraction['sections'].get('mda', ''),
+            nuanced_summary=nuanced_json,
+            url=url,
+            source=meta.get('source', 'Screener')
+        )
+
+        save_concall(symbol, concall_data)
+        self._known_for(symbol)["concall_urls"].add(url)
+        return True
+
+    def _save_announcement(self, symbol: str, meta: Dict[str, Any], url: str, extraction: Dict[str, Any]) -> bool:
+        """Save the extracted content of a downloaded corporate announcement."""
+
+        if not extraction['full_text']:
             return False
-            
-        try:
-            logger.info(f"[{symbol}] Downloading Credit Rating: {url}")
-            response = self.screener._make_request(url)
-            extraction = self.engine.extract_content(response.content)
-            
-            if not extraction['full_text']:
-                return False
-                
-            concall_data = {
-                "quarter": "Credit Rating",
-                "fiscal_year": meta['fiscal_year'],
-                "call_date": None,
-                "title": f"{meta['title']} ({meta.get('date_str', 'Unknown')})",
-                "transcript": extraction['full_text'],
-                "key_highlights": "",
-                "management_guidance": "",
-                "nuanced_summary": json.dumps({"is_credit_rating": True, "date": meta.get('date_str')}),
-                "url": url,
-                "source": "Screener"
-            }
-            
-            save_concall(symbol, concall_data)
-            logger.info(f"[{symbol}] Saved Credit Rating FY{meta['fiscal_year']} ({len(extraction['full_text'])} chars)")
-            return True
-            
-        except Exception as e:
-            logger.error(f"[{symbol}] Credit Rating processing failed: {e}")
+
+        concall_data = ConcallRecord(
+            quarter="Announcement",
+            fiscal_year=meta['fiscal_year'],
+            call_date=None,
+            title=f"Corporate Announcement: {meta['title']}",
+            transcript=extraction['full_text'],
+            key_highlights="",
+            management_guidance="",
+            nuanced_summary=json.dumps({"is_announcement": True}),
+            url=url,
+            source="Screener"
+        )
+
+        save_concall(symbol, concall_data)
+        self._known_for(symbol)["concall_urls"].add(url)
+        logger.info(f"[{symbol}] Saved Announcement FY{meta['fiscal_year']} ({len(extraction['full_text'])} chars)")
+        return True
+
+    def _save_credit_rating(self, symbol: str, meta: Dict[str, Any], url: str, extraction: Dict[str, Any]) -> bool:
+        """Save the extracted content of a downloaded credit rating report."""
+
+        if not extraction['full_text']:
             return False
 
+        concall_data = ConcallRecord(
+            quarter="Credit Rating",
+            fiscal_year=meta['fiscal_year'],
+            call_date=None,
+            title=f"{meta['title']} ({meta.get('date_str', 'Unknown')})",
+            transcript=extraction['full_text'],
+            key_highlights="",
+            management_guidance="",
+            nuanced_summary=json.dumps({"is_credit_rating": True, "date": meta.get('date_str')}),
+            url=url,
+            source="Screener"
+        )
+
+        save_concall(symbol, concall_data)
+        self._known_for(symbol)["concall_urls"].add(url)
+        logger.info(f"[{symbol}] Saved Credit Rating FY{meta['fiscal_year']} ({len(extraction['full_text'])} chars)")
+        return True
+
     def get_stats(self) -> Dict[str, int]:
         """Return current processing stats."""
         return self.stats.copy()
@@ -1,7 +1,7 @@
 #!/bin/bash
 # =============================================================================
-# ANALYEZ SCRAPER - Parallel Instance Launcher for EC2 c7i.large
-# Optimized for overnight runs - 10 parallel instances
+# ANALYEZ SCRAPER - Launcher for EC2 c7i.large
+# Optimized for overnight runs - one process ingesting stocks concurrently
 # =============================================================================
 
 set -e
@@ -18,7 +18,7 @@ echo "Time: $(date)"
 echo ""
 
 # Configuration
-NUM_INSTANCES=20  # Scaled up to 20 as requested
+CONCURRENCY=12  # Stocks in flight at once (asyncio coordinator in bulk_ingest.py)
 
 # Kill any existing scrapers
 echo "[1/5] Stopping any existing scrapers..."
@@ -27,14 +27,14 @@ sleep 2
 
 # Clean up stale lock files
 echo "[2/5] Cleaning up lock files..."
-rm -f .scraper_*.lock
+rm -f .scraper.lock .scraper_*.lock
 
 # Create logs directory
 echo "[3/5] Creating logs directory..."
 mkdir -p data_platform/scrapers/logs
 
 # Clear old logs (optional - comment out to keep history)
-# rm -f data_platform/scrapers/logs/instance_*.log
+# rm -f data_platform/scrapers/logs/bulk_ingest.log
 
 # Check for virtual environment
 if [ ! -d "venv" ]; then
@@ -53,6 +53,7 @@ fi
 # Check for arguments
 CONCALLS_ONLY_FLAG=""
 LIST_FILE_FLAG=""
+SKIP_COVERED_FLAG=""
 while [[ $# -gt 0 ]]; do
     case "$1" in
         --concalls-only)
@@ -66,24 +67,28 @@ while [[ $# -gt 0 ]]; do
             echo "  Custom List: $1"
             shift
             ;;
+        --skip-covered)
+            SKIP_COVERED_FLAG="--skip-covered"
+            echo "  Skipping fully covered stocks"
+            shift
+            ;;
         *)
             shift
             ;;
     esac
 done
 
-# Launch instances
-echo "[4/5] Launching $NUM_INSTANCES parallel instances..."
+# Launch the coordinator (it logs to data_platform/scrapers/logs/bulk_ingest.log itself;
+# stdout/stderr keep the banner and anything raised before logging is set up)
+echo "[4/5] Launching bulk ingest ($CONCURRENCY concurrent stocks)..."
 echo ""
 
-for i in $(seq 1 $NUM_INSTANCES); do
-    nohup ./venv/bin/python3 data_platform/scrapers/bulk_ingest.py --instance $i --total $NUM_INSTANCES $CONCALLS_ONLY_FLAG $LIST_FILE_FLAG >> data_platform/scrapers/logs/instance_$i.log 2>&1 &
-    PID=$!
-    echo "  ✓ Instance $i started (PID: $PID)"
-done
+nohup ./venv/bin/python3 data_platform/scrapers/bulk_ingest.py --concurrency $CONCURRENCY $CONCALLS_ONLY_FLAG $LIST_FILE_FLAG $SKIP_COVERED_FLAG >> data_platform/scrapers/logs/bulk_ingest.out 2>&1 &
+PID=$!
+echo "  ✓ Bulk ingest started (PID: $PID)"
 
 echo ""
-echo "[5/5] All instances launched!"
+echo "[5/5] Scraper launched!"
 echo ""
 echo "=================================================="
 echo "SCRAPER RUNNING - You can disconnect now"
@@ -91,11 +96,11 @@ echo "=================================================="
 echo ""
 echo "📊 MONITORING COMMANDS:"
 echo ""
-echo "  View all logs (live):"
-echo "    tail -f data_platform/scrapers/logs/instance_*.log"
+echo "  View logs (live):"
+echo "    tail -f data_platform/scrapers/logs/bulk_ingest.log"
 echo ""
-echo "  View single instance:"
-echo "    tail -f data_platform/scrapers/logs/instance_1.log"
+echo "  Startup errors and tracebacks:"
+echo "    tail data_platform/scrapers/logs/bulk_ingest.out"
 echo ""
 echo "  Check running processes:"
 echo "    ps aux | grep bulk_ingest"
@@ -2,14 +2,162 @@
 Screener.in Scraper - Optimized for complete document extraction
 Handles annual reports from any year available, plus concalls with fallbacks.
 """
+import asyncio
 import logging
 import re
-from typing import Dict, Any, List
-from bs4 import BeautifulSoup
-from .base import BaseScraper
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+from bs4 import BeautifulSoup, SoupStrainer, NavigableString
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from .base import BaseScraper, AsyncTokenBucket, parse_retry_after, RATE_LIMIT_COOLDOWN
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+    _FETCH_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    _FETCH_ERRORS = ()
+
+# Lexbor builds the DOM in C without a Python object per node; BeautifulSoup is the fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# lxml's C parser builds the tree several times faster than the pure-Python html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Every document list (announcements, annual reports, credit ratings, concalls) sits in
+# <section id="documents">; parsing only that subtree skips the ratios, charts and peer tables
+DOCUMENTS_STRAINER = SoupStrainer("section", id="documents")
+
+# Patterns used while walking the page, compiled once
+_RE_ANNUAL_CLS = re.compile(r'annual-reports', re.I)
+_RE_ANNUAL_HDR = re.compile(r'Annual\s+Report', re.I)
+_RE_ANNUAL_LINK = re.compile(r'annual|report|ar\d{4}', re.I)
+_RE_ANNUAL_PDF = re.compile(r'annual.*\.pdf|ar.*\.pdf', re.I)
+_RE_CONCALL_CLS = re.compile(r'concalls?', re.I)
+_RE_CONCALL_HDR = re.compile(r'Concall|Transcript|Earnings\s+Call', re.I)
+_RE_ANNOUNCEMENTS_CLS = re.compile(r'announcements', re.I)
+_RE_CREDIT_RATINGS_CLS = re.compile(r'credit-ratings', re.I)
+_RE_SECTION_CONTAINER = re.compile(r'documents|card|flex|sub-cnt')
+_RE_DOCUMENTS_CLS = re.compile(r'documents|filings')
+_RE_ROW_CLS = re.compile(r'row|item|entry')
+_RE_MUTED = re.compile(r'fill-muted')
+_RE_AGENCY = re.compile(r'from\s+(.+)', re.I)
+_RE_MONTH = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)')
+_RE_MONTH_YEAR = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(20\d{2})')
+_RE_NUMERIC_DATE = re.compile(r'\d{1,2}[-/](\d{1,2})[-/](20\d{2})')
+_RE_NUMERIC_MONTH = re.compile(r'[-/](\d{1,2})[-/]')
+_RE_ANY_YEAR = re.compile(r'20\d{2}|19\d{2}')
+_RE_YEAR_20XX = re.compile(r'20\d{2}')
+_RE_YEAR_19XX = re.compile(r'19\d{2}')
+
+# Month -> number and fiscal quarter (Indian FY: Apr-Jun is Q1)
+_MONTH_IDX = {m: i + 1 for i, m in enumerate(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])}
+_MONTH_NUM_Q = {n: f"Q{(n - 4) % 12 // 3 + 1}" for n in range(1, 13)}
+_MONTH_Q = {m: _MONTH_NUM_Q[n] for m, n in _MONTH_IDX.items()}
+
+# Defaults for fetch_metadata_many: company pages in flight, and page requests per second
+METADATA_CONCURRENCY = 8
+METADATA_REQUESTS_PER_SECOND = 2
 
 logger = logging.getLogger("ScreenerScraper")
 
+# Parsed metadata per symbol, shared by all ScreenerScraper instances:
+# symbol -> (expires_at, results), evicted least recently used first
+METADATA_CACHE_SIZE = 1024
+_metadata_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_metadata_cache_lock = threading.Lock()
+
+
+def _metadata_cache_get(key: str):
+    with _metadata_cache_lock:
+        entry = _metadata_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _metadata_cache[key]
+            return None
+        _metadata_cache.move_to_end(key)
+    return entry[1]
+
+
+def _metadata_cache_put(key: str, results: List[Dict[str, Any]], ttl: float) -> None:
+    with _metadata_cache_lock:
+        _metadata_cache[key] = (time.monotonic() + ttl, results)
+        _metadata_cache.move_to_end(key)
+        while len(_metadata_cache) > METADATA_CACHE_SIZE:
+            _metadata_cache.popitem(last=False)
+
+
+def _screener_url(href: str) -> str:
+    # Build full URL if relative
+    return href if href.startswith('http') else f"https://www.screener.in{href}"
+
+
+def _soup_section(soup: BeautifulSoup, class_pattern, header_matches, with_section: bool = True):
+    """A div whose class matches class_pattern, else the container of the first matching h2-h4 header."""
+    # Method 1: Look for section by class
+    section = soup.find('div', class_=class_pattern)
+    if section:
+        return section
+
+    # Method 2: Look for a matching header and climb to its container
+    for header in soup.find_all(['h2', 'h3', 'h4']):
+        if header_matches(header.get_text()):
+            section = header.find_parent('div', class_=_RE_SECTION_CONTAINER)
+            if not section and with_section:
+                section = header.find_parent('section')
+            return section or header.parent
+    return None
+
+
+def _lexbor_find_all(node, selector: str) -> list:
+    # css() also matches the node itself; BeautifulSoup's find_all() only looks below it
+    return [match for match in node.css(selector) if match.mem_id != node.mem_id]
+
+
+def _lexbor_find_parent(node, root, tag: str, class_pattern=None):
+    """Closest ancestor of node, up to and including root, with the tag and a matching class."""
+    while node.mem_id != root.mem_id:
+        node = node.parent
+        if node.tag == tag and (class_pattern is None or class_pattern.search(node.attributes.get('class') or '')):
+            return node
+    return None
+
+
+def _lexbor_section(page, class_selector: str, header_matches, with_section: bool = True):
+    """A div matching class_selector, else the container of the first matching h2-h4 header."""
+    section = page.css_first(class_selector)
+    if section is None:
+        for header in page.css('h2, h3, h4'):
+            if header_matches(header.text()):
+                section = _lexbor_find_parent(header, page, 'div', _RE_SECTION_CONTAINER)
+                if section is None and with_section:
+                    section = _lexbor_find_parent(header, page, 'section')
+                if section is None:
+                    section = header.parent
+                break
+    return section
+
+
+def _lexbor_muted(node):
+    """First fill-muted div under node, else the first such span."""
+    for selector in ('div[class*="fill-muted"]', 'span[class*="fill-muted"]'):
+        matches = _lexbor_find_all(node, selector)
+        if matches:
+            return matches[0]
+    return None
+
 
 class ScreenerScraper(BaseScraper):
     """
@@ -21,62 +169,155 @@ class ScreenerScraper(BaseScraper):
     
     def fetch_metadata(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch all document metadata for a symbol from Screener."""
+        cached = self._cached_metadata(symbol)
+        if cached is not None:
+            return cached
+        
         logger.info(f"[{symbol}] Fetching from Screener.in")
-        url = f"{self.BASE_URL}{symbol}/"
+        try:
+            response = self._make_request(f"{self.BASE_URL}{symbol}/")
+        except Exception as e:
+            logger.error(f"[{symbol}] Screener fetch failed: {e}")
+            return []
+        return self._parse_page(symbol, response.text)
+
+    async def fetch_metadata_many(self, symbols: List[str], concurrency: int = METADATA_CONCURRENCY,
+                                  rate: float = METADATA_REQUESTS_PER_SECOND) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch metadata for many symbols with up to `concurrency` company pages in flight
+        and at most `rate` page requests per second. Pages are parsed in worker threads.
+        Falls back to fetch_metadata one symbol at a time without aiohttp.
+        """
+        if not AIOHTTP_AVAILABLE:
+            return {symbol: await asyncio.to_thread(self.fetch_metadata, symbol) for symbol in symbols}
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        bucket = AsyncTokenBucket(rate, max(1, int(rate)))
+        
+        async def fetch_one(session, symbol):
+            cached = self._cached_metadata(symbol)
+            if cached is not None:
+                return cached
+            async with semaphore:
+                logger.info(f"[{symbol}] Fetching from Screener.in")
+                try:
+                    html = await self._get_page_async(session, bucket, f"{self.BASE_URL}{symbol}/")
+                except Exception as e:
+                    logger.error(f"[{symbol}] Screener fetch failed: {e}")
+                    return []
+            return await asyncio.to_thread(self._parse_page, symbol, html)
+        
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(sock_connect=self.timeout, sock_read=self.timeout)
+        ) as session:
+            results = await asyncio.gather(*[fetch_one(session, symbol) for symbol in symbols])
+        return dict(zip(symbols, results))
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=2, min=3, max=30),
+        retry=retry_if_exception_type(_FETCH_ERRORS)
+    )
+    async def _get_page_async(self, session, bucket: AsyncTokenBucket, url: str) -> str:
+        await bucket.acquire()
+        async with session.get(url, headers=self._get_headers()) as resp:
+            if resp.status == 429:
+                # Hold back every page request, then let tenacity retry this one
+                wait = parse_retry_after(resp.headers.get("Retry-After"), default=RATE_LIMIT_COOLDOWN)
+                logger.warning(f"Rate limited (429) on {url}, pausing for {wait:.0f}s")
+                bucket.pause(wait)
+            resp.raise_for_status()
+            return await resp.text()
+
+    def _cached_metadata(self, symbol: str):
+        if self.metadata_cache_ttl <= 0:
+            return None
+        cached = _metadata_cache_get(symbol.upper())
+        if cached is None:
+            return None
+        logger.info(f"[{symbol}] Using cached Screener metadata")
+        return list(cached)
+
+    def _parse_page(self, symbol: str, html: str) -> List[Dict[str, Any]]:
+        """Extract document metadata from a company page; complete results are cached."""
         results = []
+        complete = False
         
         try:
-            response = self._make_request(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            if SELECTOLAX_AVAILABLE:
+                page = self._lexbor_documents(symbol, html)
+                find_reports, find_concalls, find_announcements, find_ratings = (
+                    self._lexbor_annual_reports, self._lexbor_concalls,
+                    self._lexbor_announcements, self._lexbor_credit_ratings
+                )
+            else:
+                page = self._soup_documents(symbol, html)
+                find_reports, find_concalls, find_announcements, find_ratings = (
+                    self._extract_annual_reports, self._extract_concalls,
+                    self._extract_announcements, self._extract_credit_ratings
+                )
             
             # 1. Annual Reports - Find ALL available reports
-            ar_results = self._extract_annual_reports(soup, symbol)
+            ar_results = find_reports(page, symbol)
             results.extend(ar_results)
             # 2. Concalls - Find ALL available concalls
-            concall_results = self._extract_concalls(soup, symbol)
+            concall_results = find_concalls(page, symbol)
             results.extend(concall_results)
             logger.info(f"[{symbol}] Found {len(concall_results)} Concalls")
             
             # 3. Announcements - Final fallback
-            announcement_results = self._extract_announcements(soup, symbol)
+            announcement_results = find_announcements(page, symbol)
             results.extend(announcement_results)
             logger.info(f"[{symbol}] Found {len(announcement_results)} Announcements")
             
             # 4. Credit Ratings
-            rating_results = self._extract_credit_ratings(soup, symbol)
+            rating_results = find_ratings(page, symbol)
             results.extend(rating_results)
             logger.info(f"[{symbol}] Found {len(rating_results)} Credit Ratings")
+            complete = True
             
         except Exception as e:
-            logger.error(f"[{symbol}] Screener fetch failed: {e}")
+            logger.error(f"[{symbol}] Screener parse failed: {e}")
+        
+        # Numeric fiscal year for range filtering (None when unknown)
+        for meta in results:
+            fy = meta.get('fiscal_year')
+            meta['fy_int'] = int(fy) if str(fy).isdigit() else None
+        
+        # Failed or partial fetches are retried next time rather than cached
+        if complete and results and self.metadata_cache_ttl > 0:
+            _metadata_cache_put(symbol.upper(), results, self.metadata_cache_ttl)
             
-        return results
+        return list(results)
+
+    def _soup_documents(self, symbol: str, html: str) -> BeautifulSoup:
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=DOCUMENTS_STRAINER)
+        if not soup.find('section'):
+            # Layout without the documents section: fall back to the whole page
+            logger.debug(f"[{symbol}] No documents section, parsing full page")
+            soup = BeautifulSoup(html, HTML_PARSER)
+        return soup
+
+    def _lexbor_documents(self, symbol: str, html: str):
+        tree = LexborHTMLParser(html)
+        page = tree.css_first('section#documents')
+        if page is None:
+            # Layout without the documents section: fall back to the whole page
+            logger.debug(f"[{symbol}] No documents section, parsing full page")
+            page = tree.root
+        return page
 
     def _extract_annual_reports(self, soup: BeautifulSoup, symbol: str) -> List[Dict[str, Any]]:
         """Extract all annual report links from the page."""
-        reports = []
-        
-        # Try multiple selectors to find the AR section
-        ar_section = None
+        reports, seen = [], set()
         
-        # Method 1: Look for section by class
-        ar_section = soup.find('div', class_=re.compile(r'annual-reports', re.I))
-        
-        # Method 2: Look for header containing "Annual"
-        if not ar_section:
-            for header in soup.find_all(['h2', 'h3', 'h4']):
-                if re.search(r'Annual\s+Report', header.get_text(), re.I):
-                    # Find the parent container
-                    ar_section = header.find_parent('div', class_=re.compile(r'documents|card|flex|sub-cnt'))
-                    if not ar_section:
-                        ar_section = header.find_parent('section')
-                    if not ar_section:
-                        ar_section = header.parent
-                    break
-        
-        # Method 3: Look for any section with document links
+        # Find the AR section by class, else by a header containing "Annual Report"
+        ar_section = _soup_section(soup, _RE_ANNUAL_CLS, _RE_ANNUAL_HDR.search)
+
+        # Otherwise look for any section with document links
         if not ar_section:
-            for section in soup.find_all('div', class_=re.compile(r'documents|filings')):
+            for section in soup.find_all('div', class_=_RE_DOCUMENTS_CLS):
                 if 'annual' in section.get_text().lower():
                     ar_section = section
                     break
@@ -85,72 +326,80 @@ class ScreenerScraper(BaseScraper):
             # Find all links in the section
             for link in ar_section.find_all('a', href=True):
                 href = link.get('href', '')
-                text = " ".join(link.get_text().split())
-                
                 # Filter for PDF links or links with year mentions
-                if not href:
-                    continue
-                    
-                # Accept PDF links or links with year patterns
-                is_pdf = '.pdf' in href.lower()
-                has_year = bool(re.search(r'20\d{2}|19\d{2}', text + href))
-                is_annual = bool(re.search(r'annual|report|ar\d{4}', text + href, re.I))
-                
-                if is_pdf or (has_year and is_annual):
-                    fiscal_year = self._extract_year(text + " " + href)
-                    
-                    # Build full URL if relative
-                    full_url = href if href.startswith('http') else f"https://www.screener.in{href}"
-                    
-                    # Avoid duplicates
-                    if not any(r['url'] == full_url for r in reports):
-                        reports.append({
-                            "symbol": symbol,
-                            "fiscal_year": fiscal_year,
-                            "title": f"Annual Report {text}" if text else f"Annual Report {fiscal_year}",
-                            "url": full_url,
-                            "type": "Annual Report",
-                            "source": "Screener"
-                        })
+                if href:
+                    self._add_annual_report(reports, seen, symbol, href, " ".join(link.get_text().split()))
         
         # Also check for direct PDF links in the page header/downloads section
-        for link in soup.find_all('a', href=re.compile(r'annual.*\.pdf|ar.*\.pdf', re.I)):
-            href = link.get('href', '')
-            if href and not any(r['url'] == href for r in reports):
-                year = self._extract_year(href)
-                full_url = href if href.startswith('http') else f"https://www.screener.in{href}"
+        for link in soup.find_all('a', href=_RE_ANNUAL_PDF):
+            self._add_direct_pdf(reports, seen, symbol, link.get('href', ''))
+
+        return reports
+
+    def _lexbor_annual_reports(self, page, symbol: str) -> List[Dict[str, Any]]:
+        """Lexbor version of _extract_annual_reports."""
+        reports, seen = [], set()
+
+        ar_section = _lexbor_section(page, 'div[class*="annual-reports" i]', _RE_ANNUAL_HDR.search)
+        if ar_section is None:
+            for section in page.css('div[class*="documents"], div[class*="filings"]'):
+                if 'annual' in section.text().lower():
+                    ar_section = section
+                    break
+
+        if ar_section is not None:
+            for link in _lexbor_find_all(ar_section, 'a[href]'):
+                href = link.attributes['href']
+                if href:
+                    self._add_annual_report(reports, seen, symbol, href, " ".join(link.text().split()))
+
+        for link in page.css('a[href]'):
+            href = link.attributes['href']
+            if href and _RE_ANNUAL_PDF.search(href):
+                self._add_direct_pdf(reports, seen, symbol, href)
+
+        return reports
+
+    def _add_annual_report(self, reports: List[Dict[str, Any]], seen: set, symbol: str, href: str, text: str) -> None:
+        # Accept PDF links or links with year patterns; the regexes only run for non-PDF links
+        haystack = text + href
+        if '.pdf' in href.lower() or (_RE_ANY_YEAR.search(haystack) and _RE_ANNUAL_LINK.search(haystack)):
+            full_url = _screener_url(href)
+
+            # Avoid duplicates
+            if full_url not in seen:
+                seen.add(full_url)
+                fiscal_year = self._extract_year(text + " " + href)
                 reports.append({
                     "symbol": symbol,
-                    "fiscal_year": year,
-                    "title": f"Annual Report {year}",
+                    "fiscal_year": fiscal_year,
+                    "title": f"Annual Report {text}" if text else f"Annual Report {fiscal_year}",
                     "url": full_url,
                     "type": "Annual Report",
                     "source": "Screener"
                 })
         
-        return reports
+    def _add_direct_pdf(self, reports: List[Dict[str, Any]], seen: set, symbol: str, href: str) -> None:
+        if href and href not in seen:
+            full_url = _screener_url(href)
+            seen.add(full_url)
+            year = self._extract_year(href)
+            reports.append({
+                "symbol": symbol,
+                "fiscal_year": year,
+                "title": f"Annual Report {year}",
+                "url": full_url,
+                "type": "Annual Report",
+                "source": "Screener"
+            })
 
     def _extract_concalls(self, soup: BeautifulSoup, symbol: str) -> List[Dict[str, Any]]:
         """Extract all concall links with fallback support."""
         concalls = []
         
-        # Find concall section
-        concall_section = None
-        
-        # Method 1: Look for section by class
-        concall_section = soup.find('div', class_=re.compile(r'concalls?', re.I))
-        
-        # Method 2: Look for header containing "Concall" or "Transcript"
-        if not concall_section:
-            for header in soup.find_all(['h2', 'h3', 'h4']):
-                if re.search(r'Concall|Transcript|Earnings\s+Call', header.get_text(), re.I):
-                    concall_section = header.find_parent('div', class_=re.compile(r'documents|card|flex|sub-cnt'))
-                    if not concall_section:
-                        concall_section = header.find_parent('section')
-                    if not concall_section:
-                        concall_section = header.parent
-                    break
-        
+        # Find concall section by class, else by a header containing "Concall" or "Transcript"
+        concall_section = _soup_section(soup, _RE_CONCALL_CLS, _RE_CONCALL_HDR.search)
+
         if not concall_section:
             logger.debug(f"[{symbol}] No concall section found")
             return concalls
@@ -159,126 +408,142 @@ class ScreenerScraper(BaseScraper):
         items = concall_section.find_all('li')
         if not items:
             # Try finding div rows instead
-            items = concall_section.find_all('div', class_=re.compile(r'row|item|entry'))
+            items = concall_section.find_all('div', class_=_RE_ROW_CLS)
         
         for row in items:
-            text_content = row.get_text(separator=' ').strip()
+            # One walk over the row collects both its text and its links
+            parts, anchors = [], []
+            for node in row.descendants:
+                if type(node) is NavigableString:  # skips comments, as get_text() does
+                    parts.append(node)
+                elif node.name == 'a' and node.has_attr('href'):
+                    anchors.append(node)
             
-            # Extract date from the row
-            date_match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+20\d{2}', text_content)
-            if not date_match:
-                # Try other date formats
-                date_match = re.search(r'(\d{1,2}[-/]\d{1,2}[-/]20\d{2})', text_content)
+            # Link labels are usually a single string; only nested markup needs a walk
+            entry = self._concall_entry(symbol, ' '.join(parts).strip(), (
+                ((a.string if a.string is not None else a.get_text()).strip().lower(), a.get('href', ''))
+                for a in anchors
+            ))
+            if entry:
+                concalls.append(entry)
             
-            if not date_match:
+        return concalls
+
+    def _lexbor_concalls(self, page, symbol: str) -> List[Dict[str, Any]]:
+        """Lexbor version of _extract_concalls."""
+        concalls = []
+
+        concall_section = _lexbor_section(page, 'div[class*="concall" i]', _RE_CONCALL_HDR.search)
+        if concall_section is None:
+            logger.debug(f"[{symbol}] No concall section found")
+            return concalls
+
+        items = _lexbor_find_all(concall_section, 'li')
+        if not items:
+            items = [div for div in _lexbor_find_all(concall_section, 'div')
+                     if _RE_ROW_CLS.search(div.attributes.get('class') or '')]
+
+        for row in items:
+            entry = self._concall_entry(symbol, row.text(separator=' ').strip(), (
+                (a.text().strip().lower(), a.attributes['href']) for a in row.css('a[href]')
+            ))
+            if entry:
+                concalls.append(entry)
+
+        return concalls
+
+    def _concall_entry(self, symbol: str, text_content: str, anchors) -> Optional[Dict[str, Any]]:
+        """Build one concall from a row's text and its (lowercased link text, href) pairs."""
+        # Extract date from the row
+        date_match = _RE_MONTH_YEAR.search(text_content)
+        if not date_match:
+            # Try other date formats
+            date_match = _RE_NUMERIC_DATE.search(text_content)
+
+        if not date_match:
+            return None
+
+        date_str = date_match.group(0)
+        fiscal_year = self._extract_fy_from_date(date_str)
+        quarter = self._extract_quarter_from_date(date_str)
+
+        # Extract all links from this row
+        links = {}
+        for link_text, href in anchors:
+            if not href:
                 continue
             
-            date_str = date_match.group(0)
-            fiscal_year = self._extract_fy_from_date(date_str)
-            quarter = self._extract_quarter_from_date(date_str)
+            full_url = _screener_url(href)
             
-            # Extract all links from this row
-            links = {}
-            for a in row.find_all('a', href=True):
-                link_text = a.get_text().strip().lower()
-                href = a.get('href', '')
-                
-                if not href:
-                    continue
-                    
-                full_url = href if href.startswith('http') else f"https://www.screener.in{href}"
-                
-                # Categorize the link
-                if any(k in link_text for k in ['transcript', 'call', 'earning']):
+            # Categorize the link
+            if any(k in link_text for k in ['transcript', 'call', 'earning']):
+                links['transcript'] = full_url
+            elif 'summary' in link_text:
+                links['ai_summary'] = full_url
+            elif 'ppt' in link_text or 'presentation' in link_text:
+                links['ppt'] = full_url
+            elif any(k in link_text for k in ['rec', 'audio', 'video']):
+                links['recording'] = full_url
+            elif '.pdf' in href.lower():
+                # Generic PDF - assume transcript if no other
+                if 'transcript' not in links:
                     links['transcript'] = full_url
-                elif 'summary' in link_text:
-                    links['ai_summary'] = full_url
-                elif 'ppt' in link_text or 'presentation' in link_text:
-                    links['ppt'] = full_url
-                elif any(k in link_text for k in ['rec', 'audio', 'video']):
-                    links['recording'] = full_url
-                elif '.pdf' in href.lower():
-                    # Generic PDF - assume transcript if no other
-                    if 'transcript' not in links:
-                        links['transcript'] = full_url
-
-            if links:
-                concalls.append({
-                    "symbol": symbol,
-                    "fiscal_year": fiscal_year,
-                    "quarter": quarter,
-                    "title": f"Concall {date_str}",
-                    "date_str": date_str,
-                    "links": links,
-                    "type": "Concall",
-                    "source": "Screener"
-                })
-        
-        return concalls
+                
+        if not links:
+            return None
+        return {
+            "symbol": symbol,
+            "fiscal_year": fiscal_year,
+            "quarter": quarter,
+            "title": f"Concall {date_str}",
+            "date_str": date_str,
+            "links": links,
+            "type": "Concall",
+            "source": "Screener"
+        }
 
     def _extract_fy_from_date(self, date_str: str) -> str:
         """Convert 'Nov 2025' to FY '2026'."""
-        try:
-            # Handle "Mon YYYY" format
-            match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(20\d{2})', date_str)
-            if match:
-                month_str, year_str = match.groups()
-                year = int(year_str)
-                months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                month_idx = months.index(month_str) + 1
-                # If Apr-Dec, FY is year + 1
-                if month_idx >= 4:
-                    return str(year + 1)
-                else:
-                    return str(year)
-            
-            # Handle "DD/MM/YYYY" format
-            match = re.search(r'\d{1,2}[-/](\d{1,2})[-/](20\d{2})', date_str)
-            if match:
-                month, year = int(match.group(1)), int(match.group(2))
-                if month >= 4:
-                    return str(year + 1)
-                return str(year)
-                
-        except Exception as e:
-            logger.debug(f"FY extraction failed for '{date_str}': {e}")
+        # Handle "Mon YYYY" format
+        match = _RE_MONTH_YEAR.search(date_str)
+        if match:
+            month_str, year_str = match.groups()
+            year = int(year_str)
+            # If Apr-Dec, FY is year + 1
+            return str(year + 1) if _MONTH_IDX[month_str] >= 4 else str(year)
+        
+        # Handle "DD/MM/YYYY" format
+        match = _RE_NUMERIC_DATE.search(date_str)
+        if match:
+            month, year = int(match.group(1)), int(match.group(2))
+            if month >= 4:
+                return str(year + 1)
+            return str(year)
         
         return self._extract_year(date_str)
 
     def _extract_quarter_from_date(self, date_str: str) -> str:
         """Convert 'Nov 2025' to Quarter."""
-        try:
-            match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', date_str)
-            if match:
-                month_str = match.group(1)
-                if month_str in ['Apr', 'May', 'Jun']: return 'Q1'
-                if month_str in ['Jul', 'Aug', 'Sep']: return 'Q2'
-                if month_str in ['Oct', 'Nov', 'Dec']: return 'Q3'
-                if month_str in ['Jan', 'Feb', 'Mar']: return 'Q4'
-            
-            # Handle numeric month
-            match = re.search(r'[-/](\d{1,2})[-/]', date_str)
-            if match:
-                month = int(match.group(1))
-                if 4 <= month <= 6: return 'Q1'
-                if 7 <= month <= 9: return 'Q2'
-                if 10 <= month <= 12: return 'Q3'
-                if 1 <= month <= 3: return 'Q4'
-                
-        except Exception as e:
-            logger.debug(f"Quarter extraction failed for '{date_str}': {e}")
+        match = _RE_MONTH.search(date_str)
+        if match:
+            return _MONTH_Q[match.group(1)]
+        
+        # Handle numeric month
+        match = _RE_NUMERIC_MONTH.search(date_str)
+        if match:
+            return _MONTH_NUM_Q.get(int(match.group(1)), "Unknown")
         
         return "Unknown"
 
     def _extract_year(self, text: str) -> str:
         """Extract fiscal year from text."""
         # Look for 4-digit year (prefer 20XX)
-        match = re.search(r'20\d{2}', text)
+        match = _RE_YEAR_20XX.search(text)
         if match:
             return match.group(0)
         
         # Fallback to any 4-digit year
-        match = re.search(r'19\d{2}', text)
+        match = _RE_YEAR_19XX.search(text)
         if match:
             return match.group(0)
             
@@ -291,22 +556,15 @@ class ScreenerScraper(BaseScraper):
         if 'Q3' in text.upper(): return 'Q3'
         if 'Q4' in text.upper(): return 'Q4'
         return "Unknown"
+
     def _extract_announcements(self, soup: BeautifulSoup, symbol: str) -> List[Dict[str, Any]]:
         """Extract all corporate announcements from the page."""
         announcements = []
         
-        # Find announcements section
-        announcement_section = soup.find('div', class_=re.compile(r'announcements', re.I))
-        
-        if not announcement_section:
-            # Look for header
-            for header in soup.find_all(['h2', 'h3', 'h4']):
-                if 'Announcements' in header.get_text():
-                    announcement_section = header.find_parent('div', class_=re.compile(r'documents|card|flex|sub-cnt'))
-                    if not announcement_section:
-                        announcement_section = header.parent
-                    break
-        
+        # Find announcements section by class, else by its header
+        announcement_section = _soup_section(soup, _RE_ANNOUNCEMENTS_CLS,
+                                             lambda text: 'Announcements' in text, with_section=False)
+
         if not announcement_section:
             return announcements
             
@@ -318,54 +576,71 @@ class ScreenerScraper(BaseScraper):
             if not href or len(text) < 5:
                 continue
                 
-            full_url = href if href.startswith('http') else f"https://www.screener.in{href}"
-            
             # Extract date if possible (often in a sibling div or near the link)
-            date_str = ""
             parent = link.parent
             # Typical Screener structure for announcements has date in a sibling div
-            date_el = parent.find('div', class_=re.compile(r'fill-muted')) or parent.find('span', class_=re.compile(r'fill-muted'))
+            date_el = parent.find('div', class_=_RE_MUTED) or parent.find('span', class_=_RE_MUTED)
             if not date_el:
                 # Try grandparent if parent doesn't have it
                 gp = parent.parent
-                date_el = gp.find('div', class_=re.compile(r'fill-muted')) or gp.find('span', class_=re.compile(r'fill-muted'))
+                date_el = gp.find('div', class_=_RE_MUTED) or gp.find('span', class_=_RE_MUTED)
                 
-            if date_el:
-                date_str = date_el.get_text().strip()
-                # Clean up if it has extra text
-                date_match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+20\d{2}', date_str)
-                if date_match:
-                    date_str = date_match.group(0)
-            
-            fiscal_year = self._extract_fy_from_date(date_str) if date_str else "Unknown"
-            
-            announcements.append({
-                "symbol": symbol,
-                "fiscal_year": fiscal_year,
-                "title": text,
-                "url": full_url,
-                "type": "Announcement",
-                "source": "Screener",
-                "date_str": date_str
-            })
+            announcements.append(self._announcement_entry(symbol, href, text, date_el.get_text() if date_el else ""))
             
         return announcements
+
+    def _lexbor_announcements(self, page, symbol: str) -> List[Dict[str, Any]]:
+        """Lexbor version of _extract_announcements."""
+        announcements = []
+
+        announcement_section = _lexbor_section(page, 'div[class*="announcements" i]',
+                                               lambda text: 'Announcements' in text, with_section=False)
+        if announcement_section is None:
+            return announcements
+
+        for link in _lexbor_find_all(announcement_section, 'a[href]'):
+            href = link.attributes['href']
+            text = " ".join(link.text().split())
+
+            if not href or len(text) < 5:
+                continue
+
+            date_el = _lexbor_muted(link.parent)
+            if date_el is None:
+                date_el = _lexbor_muted(link.parent.parent)
+
+            announcements.append(self._announcement_entry(symbol, href, text, date_el.text() if date_el is not None else ""))
+
+        return announcements
+
+    def _announcement_entry(self, symbol: str, href: str, text: str, date_text: str) -> Dict[str, Any]:
+        date_str = date_text.strip()
+        if date_str:
+            # Clean up if it has extra text
+            date_match = _RE_MONTH_YEAR.search(date_str)
+            if date_match:
+                date_str = date_match.group(0)
+
+        fiscal_year = self._extract_fy_from_date(date_str) if date_str else "Unknown"
+
+        return {
+            "symbol": symbol,
+            "fiscal_year": fiscal_year,
+            "title": text,
+            "url": _screener_url(href),
+            "type": "Announcement",
+            "source": "Screener",
+            "date_str": date_str
+        }
+
     def _extract_credit_ratings(self, soup: BeautifulSoup, symbol: str) -> List[Dict[str, Any]]:
         """Extract all credit rating documents from the page."""
         ratings = []
         
-        # Find credit rating section
-        rating_section = soup.find('div', class_=re.compile(r'credit-ratings', re.I))
-        
-        if not rating_section:
-            # Look for header
-            for header in soup.find_all(['h2', 'h3', 'h4']):
-                if 'Credit rating' in header.get_text():
-                    rating_section = header.find_parent('div', class_=re.compile(r'documents|card|flex|sub-cnt'))
-                    if not rating_section:
-                        rating_section = header.parent
-                    break
-        
+        # Find credit rating section by class, else by its header
+        rating_section = _soup_section(soup, _RE_CREDIT_RATINGS_CLS,
+                                       lambda text: 'Credit rating' in text, with_section=False)
+
         if not rating_section:
             return ratings
             
@@ -377,35 +652,59 @@ class ScreenerScraper(BaseScraper):
             if not href or len(text) < 5:
                 continue
                 
-            full_url = href if href.startswith('http') else f"https://www.screener.in{href}"
-            
-            # Extract date and agency
-            date_str = ""
-            agency = ""
             parent = link.parent
             # Typically structure: <div><a>Rating update</a><div class="fill-muted">28 Oct 2020 from care</div></div>
-            info_el = parent.find('div', class_=re.compile(r'fill-muted')) or parent.find('span', class_=re.compile(r'fill-muted'))
-            if info_el:
-                info_text = info_el.get_text().strip()
-                # Parse "28 Oct 2020 from care"
-                date_match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+20\d{2}', info_text)
-                if date_match:
-                    date_str = date_match.group(0)
+            info_el = parent.find('div', class_=_RE_MUTED) or parent.find('span', class_=_RE_MUTED)
                 
-                agency_match = re.search(r'from\s+(.+)', info_text, re.I)
-                if agency_match:
-                    agency = agency_match.group(1).strip()
-            
-            fiscal_year = self._extract_fy_from_date(date_str) if date_str else "Unknown"
-            
-            ratings.append({
-                "symbol": symbol,
-                "fiscal_year": fiscal_year,
-                "title": f"Credit Rating ({agency})" if agency else text,
-                "url": full_url,
-                "type": "Credit Rating",
-                "source": "Screener",
-                "date_str": date_str
-            })
+            ratings.append(self._credit_rating_entry(symbol, href, text, info_el.get_text() if info_el else ""))
             
         return ratings
+
+    def _lexbor_credit_ratings(self, page, symbol: str) -> List[Dict[str, Any]]:
+        """Lexbor version of _extract_credit_ratings."""
+        ratings = []
+
+        rating_section = _lexbor_section(page, 'div[class*="credit-ratings" i]',
+                                         lambda text: 'Credit rating' in text, with_section=False)
+        if rating_section is None:
+            return ratings
+
+        for link in _lexbor_find_all(rating_section, 'a[href]'):
+            href = link.attributes['href']
+            text = " ".join(link.text().split())
+
+            if not href or len(text) < 5:
+                continue
+
+            info_el = _lexbor_muted(link.parent)
+
+            ratings.append(self._credit_rating_entry(symbol, href, text, info_el.text() if info_el is not None else ""))
+
+        return ratings
+
+    def _credit_rating_entry(self, symbol: str, href: str, text: str, info_text: str) -> Dict[str, Any]:
+        # Extract date and agency
+        date_str = ""
+        agency = ""
+        info_text = info_text.strip()
+        if info_text:
+            # Parse "28 Oct 2020 from care"
+            date_match = _RE_MONTH_YEAR.search(info_text)
+            if date_match:
+                date_str = date_match.group(0)
+
+            agency_match = _RE_AGENCY.search(info_text)
+            if agency_match:
+                agency = agency_match.group(1).strip()
+
+        fiscal_year = self._extract_fy_from_date(date_str) if date_str else "Unknown"
+
+        return {
+            "symbol": symbol,
+            "fiscal_year": fiscal_year,
+            "title": f"Credit Rating ({agency})" if agency else text,
+            "url": _screener_url(href),
+            "type": "Credit Rating",
+            "source": "Screener",
+            "date_str": date_str
+        }